@@ -202,12 +202,28 @@ function setupEventListeners() {
     }
 }
 
-// Load initial dashboard data
+// Load initial dashboard data (stats and employees in one round trip)
 async function loadDashboardData() {
-    await Promise.all([
-        loadDashboardStats(),
-        loadAllEmployees()
-    ]);
+    try {
+        showLoading();
+        const response = await fetch(`${BASE_URL}/dashboard/bootstrap`, {
+            headers: getHeaders()
+        });
+
+        if (!response.ok) throw new Error('Failed to fetch dashboard');
+
+        const data = await response.json();
+        updateDashboardStats(data.stats);
+        updateRecentTransfers(data.stats.recent_transfers);
+        allEmployees = data.employees;
+        displayEmployees(allEmployees);
+
+    } catch (error) {
+        showToast('Failed to load dashboard data', 'error');
+        console.error('Error loading dashboard data:', error);
+    } finally {
+        hideLoading();
+    }
 }
 
 // Load dashboard statistics
@@ -427,16 +443,52 @@ function displayHierarchy(hierarchy) {
     container.innerHTML = html;
 }
 
-// Search employee by ID
+const EMP_ID_PATTERN = /^(M|B|FM|HT)-[a-z0-9]{7}$/i;
+
+// Employee IDs are used as typed. Anything else goes through /search_employees:
+// a single match is used directly, several are listed in container to pick from.
+async function resolveEmployeeId(query, container, onPick) {
+    if (EMP_ID_PATTERN.test(query)) return query;
+
+    const response = await fetch(`${BASE_URL}/search_employees?q=${encodeURIComponent(query)}&limit=10`, {
+        headers: getHeaders()
+    });
+    if (!response.ok) throw new Error('Failed to search employees');
+
+    const matches = (await response.json()).detail.employees;
+    if (matches.length === 1) return matches[0].id;
+
+    container.innerHTML = matches.length === 0
+        ? '<h4><i class="fas fa-user-slash"></i> No matching employees</h4>'
+        : `<h4><i class="fas fa-users"></i> Select an employee</h4>` + matches.map(emp => `
+            <p class="search-match" data-emp-id="${emp.id}">
+                <span>${emp.name} (${emp.id})</span>
+                <span>${emp.role}${emp.city ? ', ' + emp.city : ''}</span>
+            </p>`).join('');
+    container.style.display = 'block';
+    container.querySelectorAll('[data-emp-id]').forEach(match => {
+        match.addEventListener('click', () => onPick(match.dataset.empId));
+    });
+    return null;
+}
+
+// Search employee by ID, name, email or phone
 async function searchEmployee() {
-    const empId = document.getElementById('emp-id-search').value.trim();
-    if (!empId) {
-        showToast('Please enter an employee ID', 'warning');
+    const input = document.getElementById('emp-id-search');
+    const query = input.value.trim();
+    if (!query) {
+        showToast('Please enter an employee ID, name, email or phone', 'warning');
         return;
     }
 
     try {
         showLoading();
+        const empId = await resolveEmployeeId(query, document.getElementById('employee-details'), id => {
+            input.value = id;
+            searchEmployee();
+        });
+        if (!empId) return;
+
         const response = await fetch(`${BASE_URL}/get_emp_details/${empId}`, {
             headers: getHeaders()
         });
@@ -489,14 +541,20 @@ function displayEmployeeDetails(employee) {
 
 // Search employee for commission report
 async function searchEmployeeCommission() {
-    const empId = document.getElementById('commission-emp-search').value.trim();
-    if (!empId) {
-        showToast('Please enter an employee ID', 'warning');
+    const input = document.getElementById('commission-emp-search');
+    const query = input.value.trim();
+    if (!query) {
+        showToast('Please enter an employee ID, name, email or phone', 'warning');
         return;
     }
 
     try {
         showLoading();
+        const empId = await resolveEmployeeId(query, document.getElementById('commission-employee-details'), id => {
+            input.value = id;
+            searchEmployeeCommission();
+        });
+        if (!empId) return;
 
         // First get employee details
         const empResponse = await fetch(`${BASE_URL}/get_emp_details/${empId}`, {
@@ -1040,11 +1098,37 @@ function handleNetworkError(error) {
     }
 }
 
-// Auto-refresh data every 5 minutes
-setInterval(() => {
+// Sections affected by each live event, only the visible one is refetched
+const LIVE_EVENT_SECTIONS = {
+    employee_created: ['dashboard', 'employees', 'hierarchy'],
+    funds_added: ['dashboard', 'employees', 'hierarchy', 'funds'],
+    commission_earned: ['dashboard'],
+    resync: ['dashboard', 'employees', 'hierarchy', 'funds']
+};
+
+let pendingRefresh = null;
+let fallbackRefresh = null;
+
+function refreshActiveSection(sections) {
     const activeSection = document.querySelector('.nav-link.active').dataset.section;
-    loadSectionData(activeSection);
-}, 300000); // 5 minutes
+    if (sections && !sections.includes(activeSection)) return;
+
+    // a burst of events becomes one refetch
+    clearTimeout(pendingRefresh);
+    pendingRefresh = setTimeout(() => loadSectionData(activeSection), 500);
+}
+
+// Refetch on server events instead of polling; the 5 minute refresh only runs while the stream is down
+subscribeLiveUpdates(BASE_URL, token, (type) => refreshActiveSection(LIVE_EVENT_SECTIONS[type] || []), {
+    onReconnect: () => {
+        clearInterval(fallbackRefresh);
+        fallbackRefresh = null;
+        refreshActiveSection();
+    },
+    onDisconnect: () => {
+        if (!fallbackRefresh) fallbackRefresh = setInterval(() => refreshActiveSection(), 300000);
+    }
+});
 
 // Export functions for global access
 window.searchEmployee = searchEmployee;
@@ -8,6 +8,10 @@ let managerInfo = null;
 
 let employmentDate = null;
 
+// object URL of the salary slip PDF on screen
+let salarySlipUrl = null;
+let salarySlipFileName = null;
+
 // Initialize dashboard when DOM loads
 document.addEventListener('DOMContentLoaded', function() {
     checkAuthentication();
@@ -399,7 +403,7 @@ function generateCurrentSalarySlip() {
     }, 300);
 }
 
-function generateSalarySlip() {
+async function generateSalarySlip() {
     const month = parseInt(document.getElementById('salary-month').value, 10);
     const year = parseInt(document.getElementById('salary-year').value, 10);
     const monthNames = [
@@ -438,97 +442,68 @@ function generateSalarySlip() {
     const slipContainer = document.getElementById('salary-slip-container');
     const slipContent = document.getElementById('salary-slip');
 
-    const employeeName = currentUser.emp_name || 'Home Teacher';
-    const employeeId = currentUser.emp_id || 'HT001';
-    const currentDate = new Date();
-
-    const salarySlipHTML = `
-        <div class="slip-header">
-            <div class="organization-name">SBC Educational</div>
-            <div class="slip-title">Salary Slip</div>
-            <div class="slip-period">For the month of ${monthNames[month - 1]} ${year}</div>
-        </div>
-
-        <div class="employee-info">
-            <div class="info-row">
-                <span class="info-label">Employee Name:</span>
-                <span class="info-value">${employeeName}</span>
-            </div>
-            <div class="info-row">
-                <span class="info-label">Employee ID:</span>
-                <span class="info-value">${employeeId}</span>
-            </div>
-            <div class="info-row">
-                <span class="info-label">Designation:</span>
-                <span class="info-value">Home Teacher</span>
-            </div>
-            <div class="info-row">
-                <span class="info-label">Department:</span>
-                <span class="info-value">Education</span>
-            </div>
-            <div class="info-row">
-                <span class="info-label">Pay Period:</span>
-                <span class="info-value">${monthNames[month - 1]} ${year}</span>
-            </div>
-            <div class="info-row">
-                <span class="info-label">Generated On:</span>
-                <span class="info-value">${currentDate.toLocaleDateString('en-IN')}</span>
-            </div>
-        </div>
-
-        <div class="salary-details">
-            <div class="salary-breakdown">
-                <div class="info-row">
-                    <span class="info-label">Basic Salary:</span>
-                    <span class="info-value">₹1,000</span>
-                </div>
-                <div class="info-row">
-                    <span class="info-label">Allowances:</span>
-                    <span class="info-value">₹50</span>
-                </div>
-                <div class="info-row">
-                    <span class="info-label">Deductions:</span>
-                    <span class="info-value">₹0</span>
-                </div>
-                <div class="info-row total-row">
-                    <span class="info-label">Net Salary:</span>
-                    <span class="info-value">₹1,050</span>
-                </div>
-            </div>
-        </div>
+    showLoading(true);
+    try {
+        // served from the month-end batch, the server renders it only when missing
+        const token = getCookie('access_token');
+        const response = await fetch(`${API_BASE_URL}/salary_slip_pdf/${year}/${month}`, {
+            headers: { 'Authorization': `Bearer ${token}` }
+        });
+
+        if (response.status === 401) {
+            showToast('Session expired. Please login again.', 'error');
+            logout();
+            return;
+        }
 
-        <div class="signature-section">
-            <div class="signature-box">
-                <div class="signature-line"></div>
-                <p>Employee Signature</p>
-            </div>
-            <div class="signature-box">
-                <div class="signature-line"></div>
-                <p>Authorized Signatory</p>
-            </div>
-        </div>
+        if (!response.ok) {
+            const error = await response.json();
+            throw new Error(error.detail?.message || `HTTP error! status: ${response.status}`);
+        }
 
-        <div class="slip-footer">
-            <p>This is a computer generated salary slip and does not require a signature.</p>
-            <p>SBC Educational - Empowering Communities Through Education</p>
-            <p>Generated on ${currentDate.toLocaleDateString('en-IN')} at ${currentDate.toLocaleTimeString('en-IN')}</p>
-        </div>
-    `;
+        if (salarySlipUrl) {
+            URL.revokeObjectURL(salarySlipUrl);
+        }
+        salarySlipUrl = URL.createObjectURL(await response.blob());
+        salarySlipFileName = `salary-slip-${year}-${String(month).padStart(2, '0')}.pdf`;
 
-    slipContent.innerHTML = salarySlipHTML;
-    slipContainer.style.display = 'block';
+        slipContent.innerHTML = `
+            <iframe id="salary-slip-frame" class="salary-slip-frame" src="${salarySlipUrl}"
+                    title="Salary slip for ${monthNames[month - 1]} ${year}"></iframe>
+        `;
+        slipContainer.style.display = 'block';
 
-    showToast('Salary slip generated successfully', 'success');
+        showToast('Salary slip generated successfully', 'success');
+    } catch (error) {
+        console.error('Failed to load salary slip:', error);
+        showToast(error.message || 'Failed to load salary slip', 'error');
+    } finally {
+        showLoading(false);
+    }
 }
 
 
 function printSalarySlip() {
-    window.print();
+    const frame = document.getElementById('salary-slip-frame');
+    if (!frame) {
+        showToast('Generate a salary slip first', 'info');
+        return;
+    }
+    frame.contentWindow.focus();
+    frame.contentWindow.print();
 }
 
 function downloadSalarySlip() {
-    // For download functionality, you might want to use a library like jsPDF
-    showToast('Download feature will be available soon', 'info');
+    if (!salarySlipUrl) {
+        showToast('Generate a salary slip first', 'info');
+        return;
+    }
+    const link = document.createElement('a');
+    link.href = salarySlipUrl;
+    link.download = salarySlipFileName;
+    document.body.appendChild(link);
+    link.click();
+    link.remove();
 }
 
 // Quick action functions
@@ -628,11 +603,15 @@ window.addEventListener('offline', function() {
     showToast('Connection lost', 'warning');
 });
 
-// Auto-refresh manager data every 30 minutes
-setInterval(async function() {
+// Refetch manager data when the server reports a change, instead of polling every 30 minutes
+async function refreshManagerInfo() {
     try {
         await loadManagerInfo();
     } catch (error) {
         console.error('Auto-refresh failed:', error);
     }
-}, 30 * 60 * 1000);
\ No newline at end of file
+}
+
+subscribeLiveUpdates(API_BASE_URL, getCookie('access_token'), refreshManagerInfo, {
+    onReconnect: refreshManagerInfo
+});
\ No newline at end of file
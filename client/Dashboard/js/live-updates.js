@@ -0,0 +1,88 @@
+// live-updates.js
+// Subscribes to the server's /events/stream. fetch is used instead of EventSource
+// so the bearer token goes in the Authorization header, not the URL.
+
+function subscribeLiveUpdates(baseUrl, token, onEvent, options = {}) {
+    const { onReconnect = () => {}, onDisconnect = () => {} } = options;
+    let lastEventId = null;
+    let retryDelay = 1000;
+    let stopped = false;
+    let controller = null;
+    let hasConnected = false;
+
+    function dispatch(block) {
+        let id = null;
+        let type = 'message';
+        const data = [];
+
+        for (const line of block.split('\n')) {
+            if (line.startsWith(':')) continue; // heartbeat
+            const [field, ...rest] = line.split(':');
+            const value = rest.join(':').replace(/^ /, '');
+            if (field === 'id') id = value;
+            else if (field === 'event') type = value;
+            else if (field === 'data') data.push(value);
+        }
+
+        if (id) lastEventId = id;
+        if (data.length) onEvent(type, JSON.parse(data.join('\n')));
+    }
+
+    async function connect() {
+        controller = new AbortController();
+        const headers = { 'Authorization': `Bearer ${token}` };
+        if (lastEventId) headers['Last-Event-ID'] = lastEventId;
+
+        const response = await fetch(`${baseUrl}/events/stream`, { headers, signal: controller.signal });
+        if (response.status === 401 || response.status === 403) {
+            stopped = true;
+            throw new Error('Unauthorized');
+        }
+        if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
+
+        retryDelay = 1000;
+        // events may have been purged while we were away, let the page refetch
+        if (hasConnected) onReconnect();
+        hasConnected = true;
+
+        const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+        let buffer = '';
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += value;
+
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                dispatch(buffer.slice(0, boundary));
+                buffer = buffer.slice(boundary + 2);
+            }
+        }
+    }
+
+    async function run() {
+        while (!stopped) {
+            try {
+                await connect();
+            } catch (error) {
+                if (stopped) break;
+                console.error('Live updates disconnected:', error);
+            }
+            onDisconnect();
+            await new Promise(resolve => setTimeout(resolve, retryDelay));
+            retryDelay = Math.min(retryDelay * 2, 60000);
+        }
+    }
+
+    run();
+
+    return {
+        close() {
+            stopped = true;
+            if (controller) controller.abort();
+        }
+    };
+}
+
+window.subscribeLiveUpdates = subscribeLiveUpdates;
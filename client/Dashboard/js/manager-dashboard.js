@@ -146,14 +146,31 @@ function showSection(sectionName) {
     }
 }
 
-// Load dashboard data
+// Load dashboard data (funds, employees and commissions in one round trip)
 async function loadDashboardData() {
     showLoading(true);
     
     try {
-        await loadManagerFunds();
-        await loadEmployeeStats();
-        await loadCommissions();
+        const response = await fetch(`${API_BASE_URL}/dashboard/bootstrap`, {
+            headers: {
+                'Authorization': `Bearer ${getCookie('access_token')}`
+            }
+        });
+        
+        const data = await response.json();
+        if (data.status === 'success') {
+            const funds = data.funds || 0;
+            document.getElementById('manager-funds').textContent = `₹${funds}`;
+            document.getElementById('available-funds').textContent = `₹${funds}`;
+            
+            allEmployees = data.employees;
+            fieldManagers = data.employees.filter(emp => emp.role === 'field-manager');
+            homeTeachers = data.employees.filter(emp => emp.role === 'home-teacher');
+            document.getElementById('total-field-managers').textContent = fieldManagers.length;
+            document.getElementById('total-home-teachers').textContent = homeTeachers.length;
+            
+            document.getElementById('total-commissions').textContent = `₹${data.total_commission}`;
+        }
     } catch (error) {
         console.error('Error loading dashboard:', error);
         showToast('Error loading dashboard data', 'error');
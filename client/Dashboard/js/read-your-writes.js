@@ -0,0 +1,27 @@
+// read-your-writes.js
+// The API answers writes with an X-Last-Write header. Echoing it on the following requests
+// keeps this tab's reads on the primary database until the replicas have caught up, whichever
+// server worker takes them. A header instead of a cookie: the dashboards call the API
+// cross-origin without credentials, so a cookie would never be sent back.
+
+(function () {
+    const HEADER = 'X-Last-Write';
+    const STORAGE_KEY = 'sbc_last_write';
+    const originalFetch = window.fetch.bind(window);
+
+    window.fetch = async function (input, init = {}) {
+        const headers = new Headers(init.headers || {});
+        const lastWrite = sessionStorage.getItem(STORAGE_KEY);
+
+        // only API calls carry the bearer token; CDN and other requests are left alone
+        if (lastWrite && headers.has('Authorization')) {
+            headers.set(HEADER, lastWrite);
+            init = { ...init, headers };
+        }
+
+        const response = await originalFetch(input, init);
+        const wroteAt = response.headers.get(HEADER);
+        if (wroteAt) sessionStorage.setItem(STORAGE_KEY, wroteAt);
+        return response;
+    };
+})();
@@ -1,6 +1,7 @@
-from pydantic import BaseModel, EmailStr, Field, validator
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 from datetime import date, datetime
 from typing import Optional, List
+from utils.clock import today_ist
 
 class Admin_login_request(BaseModel):
     username: str
@@ -53,6 +54,17 @@ class HistoryRequest(BaseModel):
     start_date: Optional[date] = None
     end_date: Optional[date] = None
 
+class Compensation_rule_request(BaseModel):
+    role: str
+    region: str = ""
+    effective_from: date
+    cost: int = Field(0, ge=0)
+    manager_commission: int = Field(0, ge=0)
+    field_manager_commission: int = Field(0, ge=0)
+    basic_salary: int = Field(0, ge=0)
+    allowances: int = Field(0, ge=0)
+    deductions: int = Field(0, ge=0)
+
 class User_querry_request(BaseModel):
     name: str
     email: EmailStr
@@ -64,15 +76,17 @@ class SalarySlipRequest(BaseModel):
     month: int = Field(..., ge=1, le=12, description="Month (1-12)")
     year: int = Field(..., ge=2020, le=2030, description="Year (2020-2030)")
     
-    @validator('month')
+    @field_validator('month')
+    @classmethod
     def validate_month(cls, v):
         if not 1 <= v <= 12:
             raise ValueError('Month must be between 1 and 12')
         return v
     
-    @validator('year')
+    @field_validator('year')
+    @classmethod
     def validate_year(cls, v):
-        current_year = datetime.now().year
+        current_year = today_ist().year
         if not (current_year - 5) <= v <= current_year:
             raise ValueError(f'Year must be between {current_year - 5} and {current_year}')
         return v
@@ -88,19 +102,18 @@ class HomeTeacherSalaryInfo(BaseModel):
     deductions: float = 0.0
     net_salary: float = 1050.0
     
-    class Config:
-        schema_extra = {
-            "example": {
-                "employee_id": "HT001",
-                "employee_name": "John Doe",
-                "designation": "Home Teacher",
-                "department": "Education",
-                "basic_salary": 1000.0,
-                "allowances": 50.0,
-                "deductions": 0.0,
-                "net_salary": 1050.0
-            }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "employee_id": "HT001",
+            "employee_name": "John Doe",
+            "designation": "Home Teacher",
+            "department": "Education",
+            "basic_salary": 1000.0,
+            "allowances": 50.0,
+            "deductions": 0.0,
+            "net_salary": 1050.0
         }
+    })
 
 class SalarySlipHistoryItem(BaseModel):
     """Individual salary slip history item"""
@@ -140,49 +153,47 @@ class HomeTeacherProfileResponse(BaseModel):
     profile: dict
     message: str
     
-    class Config:
-        schema_extra = {
-            "example": {
-                "status": "success",
-                "profile": {
-                    "employee_info": {
-                        "id": "HT001",
-                        "name": "John Doe",
-                        "email": "john@example.com",
-                        "phone": "+91-9876543210",
-                        "city": "Mumbai",
-                        "state": "Maharashtra",
-                        "employment_date": "2024-01-15T10:30:00",
-                        "employment_duration": "8 months",
-                        "monthly_salary": 1050
-                    },
-                    "manager_info": {
-                        "name": "Field Manager Name",
-                        "email": "fm@example.com",
-                        "phone": "+91-9876543211",
-                        "city": "Mumbai",
-                        "state": "Maharashtra"
-                    }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "status": "success",
+            "profile": {
+                "employee_info": {
+                    "id": "HT001",
+                    "name": "John Doe",
+                    "email": "john@example.com",
+                    "phone": "+91-9876543210",
+                    "city": "Mumbai",
+                    "state": "Maharashtra",
+                    "employment_date": "2024-01-15T10:30:00",
+                    "employment_duration": "8 months",
+                    "monthly_salary": 1050
                 },
-                "message": "Profile retrieved successfully"
-            }
+                "manager_info": {
+                    "name": "Field Manager Name",
+                    "email": "fm@example.com",
+                    "phone": "+91-9876543211",
+                    "city": "Mumbai",
+                    "state": "Maharashtra"
+                }
+            },
+            "message": "Profile retrieved successfully"
         }
+    })
 
 class HomeTeacherFundsResponse(BaseModel):
     """Response for home teacher funds (always 0)"""
     status: str
     detail: dict
     
-    class Config:
-        schema_extra = {
-            "example": {
-                "status": "good",
-                "detail": {
-                    "message": "Funds fetched successfully",
-                    "funds": 0
-                }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "status": "good",
+            "detail": {
+                "message": "Funds fetched successfully",
+                "funds": 0
             }
         }
+    })
 
 class SalarySlipGenerationResponse(BaseModel):
     """Response for salary slip generation"""
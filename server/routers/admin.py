@@ -0,0 +1,344 @@
+from fastapi import APIRouter, HTTPException, Depends, Request
+import asyncio
+from utils.responses import ORJSONResponse
+from utils.auth import get_login_role
+from utils.db_config import get_db_connection
+from utils.replicas import get_read_connection, mark_write
+from utils.outbox import enqueue_event, EMPLOYEE_CREATED, FUNDS_ADDED
+from utils.funds_ledger import post_funds_entry, ADMIN_CREDIT
+from utils.data_version import bump_data_version, bump_employee_versions, check_etag, cache_headers, EMPLOYEES, RULES
+from utils.api_error import raise_http_error
+from utils.hierarchy import add_to_hierarchy
+from utils.authorization import invalidate_employee
+from utils.rules import load_rules, RULE_COLUMNS
+from utils.geo_rollup import get_geo_rollup
+from utils.scheduler import get_job_status
+from utils.helper import generate_emp_id
+from utils.clock import now_ist
+from pydantic_models.models import create_emp_request, create_manager_request, Add_funds_request, Compensation_rule_request
+
+router = APIRouter(tags=["admin"])
+
+@router.post("/create_branch_emp")
+async def create_branch_emp(data: create_emp_request, token_data: dict = Depends(get_login_role)):
+
+    creator_role = token_data.get("role")
+
+    if data.role != "branch" and creator_role != "admin":
+        raise_http_error(f"Cannot create {data.role}.")
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+
+    try:
+        new_emp_id = generate_emp_id(data.role)
+        today_datetime = now_ist()
+
+        cursor.execute(
+            """
+            INSERT INTO employees (id, name, fname, mname, DOB, addr, city, district, state, email, phn, password, role, created_at)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """,
+            (new_emp_id, data.name, data.fname, data.mname, data.dob, data.addr, data.city, data.district, data.state, data.email, data.phn, data.pwd, data.role, today_datetime)
+        )
+        add_to_hierarchy(cursor, new_emp_id)
+        enqueue_event(cursor, EMPLOYEE_CREATED, {
+            "id": new_emp_id, "role": data.role, "created_by": token_data.get("emp_id"),
+            "registered_at": today_datetime, "commissions": []
+        })
+        conn.commit()
+        mark_write()
+        bump_employee_versions(conn, new_emp_id)
+        invalidate_employee(new_emp_id)
+
+        return {"status": "good", "detail": {"message": "Branch employee created.", "role": data.role, "name": data.name, "email": data.email, "password": data.pwd}}
+
+    except Exception as err:
+        raise_http_error("Cannot create branch", err)
+    finally:
+        conn.close()
+
+
+@router.post("/create_manager")
+async def create_manager(data: create_manager_request, token_data: dict = Depends(get_login_role)):
+
+    creater_role = token_data.get("role")
+
+    if creater_role != "admin":
+        raise_http_error("Only admin can make managers")
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    try:
+        new_emp_id = generate_emp_id("manager")
+        today_datetime = now_ist()
+        cursor.execute(
+            """
+            INSERT INTO employees (id, name, fname, mname, DOB, addr, city, district, state, email, phn, password, role, created_at)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """,
+            (new_emp_id, data.name, data.fname, data.mname, data.dob, data.addr, data.city, data.district, data.state, data.email, data.phn, data.pwd, "manager", today_datetime)
+        )
+        add_to_hierarchy(cursor, new_emp_id)
+        enqueue_event(cursor, EMPLOYEE_CREATED, {
+            "id": new_emp_id, "role": "manager", "created_by": token_data.get("emp_id"),
+            "registered_at": today_datetime, "commissions": []
+        })
+        conn.commit()
+        mark_write()
+        bump_employee_versions(conn, new_emp_id)
+        invalidate_employee(new_emp_id)
+        return {"status": "good", "detail": {"message": "Manager created successfully"}}
+
+    except Exception as err:
+        conn.rollback()
+        print(err)
+        raise_http_error("Cannot create manager", err)
+    finally:
+        conn.close()
+
+
+@router.post("/add_funds")
+async def add_funds(data: Add_funds_request, token_data: dict = Depends(get_login_role)):
+    sender_id = token_data.get("emp_id")
+    sender_role = token_data.get("role")
+
+    if sender_id != "admin" and sender_role != "admin":
+        raise_http_error("Only admin can send funds")
+
+    if data.amount <= 0:
+        raise HTTPException(status_code=400, detail={"message": "Amount must be greater than 0"})
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("SELECT role, manager_id FROM employees WHERE id = %s", (data.receiver_id,))
+        receiver = cursor.fetchone()
+        if not receiver:
+            raise HTTPException(status_code=404, detail={"message": "Receiver not found"})
+
+        today_datetime = now_ist()
+        post_funds_entry(cursor, data.receiver_id, data.amount, ADMIN_CREDIT, created_at=today_datetime)
+
+        cursor.execute(
+            """
+            INSERT INTO funds_transfer_history (sender_id, transferred_amount, reciever_id, transferred_at)
+            VALUES (%s, %s, %s, %s)
+            """,
+            (
+                None,
+                data.amount,
+                data.receiver_id,
+                today_datetime
+            )
+        )
+
+        enqueue_event(cursor, FUNDS_ADDED, {"employee_id": data.receiver_id, "amount": data.amount})
+        conn.commit()
+        mark_write()
+        bump_employee_versions(conn, data.receiver_id)
+        return {
+            "status": "good",
+            "detail": {"message": f"{data.amount} transferred to {data.receiver_id}"}
+        }
+
+    except HTTPException:
+        raise
+    except Exception as err:
+        conn.rollback()
+        print(err)
+        raise raise_http_error("cannot add funds", err)
+    finally:
+        conn.close()
+
+
+@router.get("/get_employee_hierarchy")
+async def get_employee_hierarchy(request: Request, token_data: dict = Depends(get_login_role)):
+    role = token_data.get("role")
+    
+    if role not in ["admin", "branch"]:
+        raise HTTPException(status_code=403, detail="Only admin and branch can access hierarchy")
+    
+    conn = get_read_connection()
+    cursor = conn.cursor(dictionary=True)
+    
+    try:
+        etag, not_modified = check_etag(cursor, request, token_data, (EMPLOYEES,))
+        if not_modified:
+            return not_modified
+
+        # Get managers
+        cursor.execute("""
+            SELECT id, name, email, funds, created_at 
+            FROM employees 
+            WHERE role = 'manager' 
+            ORDER BY created_at DESC
+        """)
+        managers = cursor.fetchall()
+        
+        hierarchy = []
+        
+        for manager in managers:
+            # Get field-managers under this manager
+            cursor.execute("""
+                SELECT id, name, email, funds, created_at 
+                FROM employees 
+                WHERE role = 'field-manager' AND manager_id = %s
+                ORDER BY created_at DESC
+            """, (manager['id'],))
+            field_managers = cursor.fetchall()
+            
+            # For each field-manager, get their home-teachers
+            for fm in field_managers:
+                cursor.execute("""
+                    SELECT id, name, email, funds, created_at 
+                    FROM employees 
+                    WHERE role = 'home-teacher' AND manager_id = %s
+                    ORDER BY created_at DESC
+                """, (fm['id'],))
+                fm['home_teachers'] = cursor.fetchall()
+            
+            manager['field_managers'] = field_managers
+            hierarchy.append(manager)
+        
+        return ORJSONResponse({"status": "success", "hierarchy": hierarchy}, headers=cache_headers(etag))
+    
+    except Exception as err:
+        raise_http_error("Cannot fetch hierarchy", err)
+    finally:
+        conn.close()
+
+
+@router.get("/get_dashboard_stats")
+async def get_dashboard_stats(token_data: dict = Depends(get_login_role)):
+    role = token_data.get("role")
+    
+    if role not in ["admin", "branch"]:
+        raise HTTPException(status_code=403, detail="Only admin and branch can access dashboard stats")
+    
+    conn = get_read_connection()
+    cursor = conn.cursor()
+    
+    try:
+        # Count employees by role
+        cursor.execute("SELECT role, COUNT(*) as count FROM employees GROUP BY role")
+        role_counts = dict(cursor.fetchall())
+        
+        # Total funds distributed
+        cursor.execute("SELECT SUM(funds) as total_funds FROM employees WHERE funds > 0")
+        total_funds = cursor.fetchone()[0] or 0
+        
+        return {
+            "status": "success",
+            "stats": {
+                "total_managers": role_counts.get('manager', 0),
+                "total_field_managers": role_counts.get('field-manager', 0), 
+                "total_home_teachers": role_counts.get('home-teacher', 0),
+                "total_funds_distributed": total_funds
+            }
+        }
+    
+    except Exception as err:
+        raise_http_error("Cannot fetch dashboard stats", err)
+    finally:
+        conn.close()
+
+
+@router.get("/geo_rollup")
+async def geo_rollup(state: str = None, district: str = None, city: str = None, token_data: dict = Depends(get_login_role)):
+    """
+    Employee counts by role, funds and commissions per place, from the geo_rollup table.
+    No filter lists states, a state its districts, a district its cities; any level can be filtered alone.
+    """
+    if token_data.get("role") not in ["admin", "branch"]:
+        raise HTTPException(status_code=403, detail={"message": "Only admin and branch can view regional rollups"})
+
+    conn = get_read_connection()
+
+    try:
+        return ORJSONResponse({"status": "good", "detail": get_geo_rollup(conn, state, district, city)})
+
+    except Exception as err:
+        raise_http_error("Cannot fetch regional rollup", err)
+    finally:
+        conn.close()
+
+
+@router.get("/compensation_rules")
+async def get_compensation_rules(token_data: dict = Depends(get_login_role)):
+    if token_data.get("role") != "admin":
+        raise HTTPException(status_code=403, detail={"message": "Only admin can view compensation rules"})
+
+    conn = get_read_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    try:
+        cursor.execute(f"SELECT id, {RULE_COLUMNS}, updated_at FROM compensation_rules ORDER BY role, region, effective_from DESC")
+        return {"status": "good", "detail": {"rules": cursor.fetchall()}}
+
+    except Exception as err:
+        raise_http_error("Cannot fetch compensation rules", err)
+    finally:
+        conn.close()
+
+
+@router.post("/compensation_rules")
+async def set_compensation_rule(data: Compensation_rule_request, token_data: dict = Depends(get_login_role)):
+    """
+    Add or replace the rule for (role, region, effective_from).
+    This worker reloads immediately, the others pick it up on their next refresh.
+    """
+    if token_data.get("role") != "admin":
+        raise HTTPException(status_code=403, detail={"message": "Only admin can change compensation rules"})
+    if data.role not in ["field-manager", "home-teacher"]:
+        raise HTTPException(status_code=400, detail={"message": "Invalid role provided"})
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute(
+            f"""
+            INSERT INTO compensation_rules ({RULE_COLUMNS})
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                cost = VALUES(cost),
+                manager_commission = VALUES(manager_commission),
+                field_manager_commission = VALUES(field_manager_commission),
+                basic_salary = VALUES(basic_salary),
+                allowances = VALUES(allowances),
+                deductions = VALUES(deductions)
+            """,
+            (data.role, data.region, data.effective_from, data.cost, data.manager_commission,
+             data.field_manager_commission, data.basic_salary, data.allowances, data.deductions)
+        )
+        conn.commit()
+        mark_write()
+        bump_data_version(conn, RULES)
+
+    except Exception as err:
+        conn.rollback()
+        raise_http_error("Cannot save compensation rule", err)
+    finally:
+        conn.close()
+
+    try:
+        await asyncio.to_thread(load_rules)
+    except Exception:
+        # the rule is saved and RULES bumped, the refresh job loads it on its next run
+        pass
+    return {"status": "good", "detail": {"message": "Compensation rule saved"}}
+
+
+@router.get("/scheduler/jobs")
+async def get_scheduler_jobs(token_data: dict = Depends(get_login_role)):
+    """
+    Last run status, duration and next run time of every scheduled job in this worker
+    """
+    if token_data.get("role") != "admin":
+        raise HTTPException(status_code=403, detail={"message": "Only admin can view scheduled jobs"})
+
+    return {"status": "good", "detail": {"jobs": get_job_status()}}
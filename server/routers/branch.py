@@ -0,0 +1,190 @@
+from fastapi import APIRouter, HTTPException, Depends
+from datetime import timedelta
+from utils.clock import today_ist, day_range
+from utils.responses import ORJSONResponse
+from utils.auth import get_login_role
+from utils.replicas import get_read_connection
+from utils.api_error import raise_http_error
+from utils.commission_rollup import get_commission_summary
+from utils.queries import Query, CommissionWithNames
+from pydantic_models.models import HistoryRequest
+
+router = APIRouter(tags=["branch"])
+
+@router.post("/funds_transfer_history")
+async def funds_transfer_history_branch(data: HistoryRequest, token_data: dict = Depends(get_login_role)):
+    conn = get_read_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    try:
+        emp_id = token_data.get("emp_id")
+        role = token_data.get("role")
+
+        today = today_ist()
+        start_date = data.start_date
+        end_date = data.end_date
+
+        if not start_date and not end_date:
+            end_date = today
+            start_date = today - timedelta(days=30)
+
+        elif start_date and not end_date:
+            max_end = start_date + timedelta(days=60)
+            end_date = min(max_end, today)
+
+        elif end_date and not start_date:
+            end_date = min(end_date, today)
+            start_date = end_date - timedelta(days=60)
+
+        elif start_date and end_date:
+            if (end_date - start_date).days > 62:
+                raise HTTPException(
+                    status_code=400,
+                    detail={"message": "Date range cannot exceed 2 months"}
+                )
+            # disallow future dates
+            if end_date > today:
+                end_date = today
+
+        where_clause = ""
+        params = []
+
+        if role in ["admin", "branch"]:
+            where_clause = "WHERE f.transferred_at >= %s AND f.transferred_at < %s"
+            params = list(day_range(start_date, end_date))
+
+        elif role == "manager":
+            where_clause = """
+                WHERE (f.sender_id = %s OR f.reciever_id = %s)
+                AND f.transferred_at >= %s AND f.transferred_at < %s
+            """
+            params = [emp_id, emp_id, *day_range(start_date, end_date)]
+
+        else:
+            return {
+                "status": "bad", 
+                "detail": {
+                    "message": f"{role} cannot see transaction history.", 
+                    "transactions": []
+                }
+            }
+
+        query = f"""
+            SELECT 
+                f.id,
+                f.sender_id,
+                COALESCE(s.name, 'Admin') AS sender_name,
+                f.reciever_id,
+                r.name AS reciever_name,
+                r.role AS reciever_role,
+                f.transferred_amount,
+                f.transferred_at
+            FROM funds_transfer_history f
+            LEFT JOIN employees s ON f.sender_id = s.id
+            JOIN employees r ON f.reciever_id = r.id
+            {where_clause}
+            ORDER BY f.transferred_at DESC
+        """
+
+        cursor.execute(query, tuple(params))
+        history = cursor.fetchall()
+
+        return ORJSONResponse({"status": "good", "detail": {"transactions": history}})
+
+    except HTTPException:
+        raise
+    except Exception as err:
+        raise_http_error("Cannot fetch transfer history", err)
+    finally:
+        conn.close()
+
+
+IN_RANGE = "WHERE c.registered_at >= %s AND c.registered_at < %s"
+
+BRANCH_COMMISSION_HISTORY = Query(CommissionWithNames, """
+    SELECT {columns}
+    FROM commisions c
+    LEFT JOIN employees m ON c.manager_id = m.id
+    LEFT JOIN employees fm ON c.field_manager_id = fm.id
+    LEFT JOIN employees e ON c.created_id = e.id
+    {where}
+    ORDER BY c.registered_at DESC
+""", where=IN_RANGE)
+
+
+@router.post("/post/get_manager_commission_history")
+async def get_manager_commission_history_branch(
+    data: HistoryRequest,
+    summary_only: bool = False,
+    token_data: dict = Depends(get_login_role)
+):
+    """
+    Get commission history for branch dashboard (all managers)
+    Pass summary_only=true to skip the history rows (dashboard cards)
+    """
+    user_role = token_data.get("role")
+    
+    if user_role not in ["admin", "branch"]:
+        raise HTTPException(
+            status_code=403,
+            detail={"message": "Insufficient permissions"}
+        )
+    
+    conn = get_read_connection()
+    cursor = conn.cursor(dictionary=True)
+    
+    try:
+        today = today_ist()
+        start_date = data.start_date
+        end_date = data.end_date
+        
+        # Set default date range if not provided
+        if not start_date and not end_date:
+            end_date = today
+            start_date = today - timedelta(days=90)  # Last 3 months
+        elif start_date and not end_date:
+            max_end = start_date + timedelta(days=90)
+            end_date = min(max_end, today)
+        elif end_date and not start_date:
+            end_date = min(end_date, today)
+            start_date = end_date - timedelta(days=90)
+        elif start_date and end_date:
+            if (end_date - start_date).days > 365:  # Max 1 year range
+                raise HTTPException(
+                    status_code=400,
+                    detail={"message": "Date range cannot exceed 1 year"}
+                )
+            if end_date > today:
+                end_date = today
+        
+        params = list(day_range(start_date, end_date))
+
+        totals = get_commission_summary(cursor, IN_RANGE, params)
+
+        result = {
+            "status": "success",
+            "summary": {
+                "total_manager_commission": totals["total_manager_commission"],
+                "total_field_manager_commission": totals["total_field_manager_commission"],
+                "field_managers_recruited": totals["field_managers_recruited"],
+                "home_teachers_recruited": totals["home_teachers_recruited"],
+                "total_registrations": totals["total_registrations"],
+                "date_range": {
+                    "start_date": start_date.isoformat(),
+                    "end_date": end_date.isoformat()
+                }
+            }
+        }
+
+        if not summary_only:
+            # Get all commission history for branch dashboard
+            result["commission_history"] = BRANCH_COMMISSION_HISTORY.all(conn, tuple(params))
+        
+        return ORJSONResponse(result)
+        
+    except HTTPException:
+        raise
+    except Exception as err:
+        raise_http_error("Cannot fetch commission history", err)
+    finally:
+        conn.close()
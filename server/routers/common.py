@@ -0,0 +1,342 @@
+from fastapi import APIRouter, HTTPException, Depends, Request
+import asyncio
+from fastapi.responses import StreamingResponse
+from utils.responses import ORJSONResponse
+from utils.auth import get_login_role
+from utils.db_config import fetch_all, fetch_one
+from utils.replicas import get_read_connection
+from utils.statements import execute_cached
+from utils.queries import Query, row_type, fetch_rows, Commission, FIELD_MANAGER_COMMISSION_HISTORY
+from utils.data_version import check_etag, cache_headers, employees_scope, EMPLOYEES
+from utils.live_events import subscribe, stream_events
+from utils.employee_search import search_employees, SEARCH_MAX_LIMIT, SEARCH_MAX_OFFSET
+from utils.api_error import raise_http_error
+
+router = APIRouter(tags=["common"])
+
+EARNER_COMMISSIONS = Query(Commission, "SELECT {columns} FROM commisions c WHERE c.manager_id = %s OR c.field_manager_id = %s")
+MANAGER_COMMISSIONS = Query(Commission, "SELECT {columns} FROM commisions c WHERE c.manager_id = %s")
+FIELD_MANAGER_COMMISSIONS = Query(Commission, "SELECT {columns} FROM commisions c WHERE c.field_manager_id = %s")
+
+
+@router.get("/get_commisions/{emp_id}")
+async def get_commisions(emp_id: str, token_data: dict = Depends(get_login_role)):
+    user_role = token_data.get("role")
+    user_id = token_data.get("emp_id")
+
+    conn = get_read_connection()
+
+    try:
+        # ADMIN or requesting own commissions
+        if user_role == "admin" or user_role == "branch " or user_id == emp_id:
+            rows = EARNER_COMMISSIONS.all(conn, (emp_id, emp_id))
+            return ORJSONResponse({"status": "good", "detail": rows})
+
+        # MANAGER
+        elif user_role == "manager":
+            rows = MANAGER_COMMISSIONS.all(conn, (user_id,))
+            return ORJSONResponse({"status": "good", "detail": rows})
+
+        # FIELD MANAGER
+        elif user_role == "field-manager":
+            rows = FIELD_MANAGER_COMMISSIONS.all(conn, (user_id,))
+            return ORJSONResponse({"status": "good", "detail": rows})
+
+        else:
+            return {"status": "bad", "detail": {"message": "You are not allowed to view commissions"}}
+
+    except Exception as err:
+        raise_http_error("Cannot get commission list", err)
+
+    finally:
+        conn.close()
+
+
+EmployeeDetails = row_type(
+    "EmployeeDetails",
+    ["name", "fname", "mname", "DOB", "addr", "city", "district", "state", "email", "phn", "role", "manager_id"]
+)
+EMP_DETAILS = Query(EmployeeDetails, "SELECT {columns} FROM employees WHERE id = %s")
+
+
+@router.get("/get_emp_details/{emp_id}")
+async def get_emp_details(emp_id: str, request: Request, token_data: dict = Depends(get_login_role)):
+
+    conn = get_read_connection()
+    cursor = conn.cursor()
+
+    try:
+        etag, not_modified = check_etag(cursor, request, token_data, (employees_scope(emp_id),))
+        if not_modified:
+            return not_modified
+
+        emp_detail = EMP_DETAILS.one(conn, (emp_id,))
+        if not emp_detail:
+            return {"status": "bad", "detail": {"message": "employee not found"}}
+
+        return ORJSONResponse(
+            {"status": "good", "detail": {"message": "Employee details found", "data": emp_detail}},
+            headers=cache_headers(etag)
+        )
+
+    except Exception as err:
+        raise_http_error("cannot get employees details", err)
+    finally:
+        conn.close()
+
+
+ALL_EMPLOYEES_QUERY = """
+    SELECT e.id, e.name, e.email, e.role, e.funds, e.created_at,
+           m.name as manager_name
+    FROM employees e
+    LEFT JOIN employees m ON e.manager_id = m.id
+    ORDER BY 
+        CASE e.role 
+            WHEN 'manager' THEN 1
+            WHEN 'field-manager' THEN 2 
+            WHEN 'home-teacher' THEN 3
+            WHEN 'branch' THEN 4
+        END,
+        e.created_at DESC
+"""
+
+# Every employee below emp_id, at any depth, via the employee_hierarchy closure table
+DESCENDANT_EMPLOYEES_QUERY = """
+    SELECT e.id, e.name, e.email, e.role, e.funds, e.created_at,
+           m.name as manager_name
+    FROM employee_hierarchy h
+    JOIN employees e ON e.id = h.descendant_id
+    LEFT JOIN employees m ON e.manager_id = m.id
+    WHERE h.ancestor_id = %s AND h.depth > 0
+    ORDER BY 
+        CASE e.role 
+            WHEN 'field-manager' THEN 1
+            WHEN 'home-teacher' THEN 2
+        END,
+        e.created_at DESC
+"""
+
+
+@router.get("/get_all_employees")
+async def get_all_employees(request: Request, token_data: dict = Depends(get_login_role)):
+    role = token_data.get("role")
+    emp_id = token_data.get("emp_id")
+    
+    conn = get_read_connection()
+    cursor = conn.cursor(dictionary=True)
+    
+    try:
+        # admin and branch list everyone, the others only their subtree
+        scope = EMPLOYEES if role in ["admin", "branch"] else employees_scope(emp_id)
+        etag, not_modified = check_etag(cursor, request, token_data, (scope,))
+        if not_modified:
+            return not_modified
+
+        if role in ["admin", "branch"]:
+            # Branch and admin can see all employees except addresses
+            employees = execute_cached(conn, ALL_EMPLOYEES_QUERY, dictionary=True).fetchall()
+        
+        elif role in ["manager", "field-manager"]:
+            # Managers and field-managers can see only the employees below them
+            employees = execute_cached(conn, DESCENDANT_EMPLOYEES_QUERY, (emp_id,), dictionary=True).fetchall()
+        
+        else:
+            return {"status": "error", "message": "Insufficient permissions"}
+        
+        return ORJSONResponse({"status": "success", "employees": employees}, headers=cache_headers(etag))
+    
+    except Exception as err:
+        raise_http_error("Cannot fetch employees", err)
+    finally:
+        conn.close()
+
+
+@router.get("/search_employees")
+async def search_employees_endpoint(q: str, limit: int = 20, offset: int = 0, token_data: dict = Depends(get_login_role)):
+    """
+    Typeahead search over id, name, email, phone, city and district.
+    Admin and branch search everyone, managers and field-managers their own subtree.
+    """
+    role = token_data.get("role")
+    emp_id = token_data.get("emp_id")
+
+    if role not in ["admin", "branch", "manager", "field-manager"]:
+        raise HTTPException(status_code=403, detail={"message": "You are not allowed to search employees"})
+
+    q = q.strip()
+    if not q:
+        raise HTTPException(status_code=400, detail={"message": "Search text is required"})
+    if not (1 <= limit <= SEARCH_MAX_LIMIT) or not (0 <= offset <= SEARCH_MAX_OFFSET):
+        raise HTTPException(
+            status_code=400,
+            detail={"message": f"limit must be 1-{SEARCH_MAX_LIMIT} and offset 0-{SEARCH_MAX_OFFSET}"}
+        )
+
+    conn = get_read_connection()
+
+    try:
+        employees = search_employees(conn, role, emp_id, q, limit, offset)
+        return ORJSONResponse({
+            "status": "good",
+            "detail": {"employees": employees, "limit": limit, "offset": offset}
+        })
+
+    except Exception as err:
+        raise_http_error("Cannot search employees", err)
+    finally:
+        conn.close()
+
+
+@router.get("/dashboard/bootstrap")
+async def dashboard_bootstrap(token_data: dict = Depends(get_login_role)):
+    """
+    Everything the initial dashboard view needs for the caller's role in one response.
+    Independent queries run concurrently, each on its own pooled connection.
+    """
+    role = token_data.get("role")
+    emp_id = token_data.get("emp_id")
+
+    def query_all(query, params=()):
+        return asyncio.to_thread(fetch_all, query, params, get_read_connection)
+
+    def query_one(query, params=()):
+        return asyncio.to_thread(fetch_one, query, params, get_read_connection)
+
+    try:
+        if role in ["admin", "branch"]:
+            role_counts, funds_result, employees = await asyncio.gather(
+                query_all("SELECT role, COUNT(*) as count FROM employees GROUP BY role"),
+                query_one("SELECT SUM(funds) as total_funds FROM employees WHERE funds > 0"),
+                query_all(ALL_EMPLOYEES_QUERY)
+            )
+            role_counts = {row['role']: row['count'] for row in role_counts}
+
+            return {
+                "status": "success",
+                "role": role,
+                "stats": {
+                    "total_managers": role_counts.get('manager', 0),
+                    "total_field_managers": role_counts.get('field-manager', 0),
+                    "total_home_teachers": role_counts.get('home-teacher', 0),
+                    "total_funds_distributed": funds_result['total_funds'] or 0
+                },
+                "employees": employees
+            }
+
+        elif role == "manager":
+            funds_result, employees, field_managers, commission_result = await asyncio.gather(
+                query_one("SELECT funds FROM employees WHERE id = %s", (emp_id,)),
+                query_all(DESCENDANT_EMPLOYEES_QUERY, (emp_id,)),
+                query_all("""
+                    SELECT fm.id, fm.name, fm.email, fm.funds, fm.created_at,
+                           COUNT(ht.id) as home_teachers_count
+                    FROM employees fm
+                    LEFT JOIN employees ht ON ht.manager_id = fm.id AND ht.role = 'home-teacher'
+                    WHERE fm.role = 'field-manager' AND fm.manager_id = %s
+                    GROUP BY fm.id, fm.name, fm.email, fm.funds, fm.created_at
+                    ORDER BY fm.created_at DESC
+                """, (emp_id,)),
+                query_one("""
+                    SELECT total_commission
+                    FROM commission_balance
+                    WHERE employee_id = %s
+                """, (emp_id,))
+            )
+            if not funds_result:
+                raise HTTPException(status_code=404, detail={"message": "Manager not found"})
+
+            return {
+                "status": "success",
+                "role": role,
+                "funds": funds_result['funds'],
+                "employees": employees,
+                "field_managers": field_managers,
+                "total_commission": commission_result['total_commission'] if commission_result else 0
+            }
+
+        elif role == "field-manager":
+            field_manager_info, home_teachers, commissions, commission_result = await asyncio.gather(
+                query_one("""
+                    SELECT e.name, e.email, e.manager_id, m.name as manager_name, m.email as manager_email
+                    FROM employees e
+                    LEFT JOIN employees m ON e.manager_id = m.id
+                    WHERE e.id = %s
+                """, (emp_id,)),
+                query_all("""
+                    SELECT id, name, email, phn, city, state, created_at
+                    FROM employees 
+                    WHERE role = 'home-teacher' AND manager_id = %s
+                    ORDER BY created_at DESC
+                """, (emp_id,)),
+                asyncio.to_thread(fetch_rows, FIELD_MANAGER_COMMISSION_HISTORY, (emp_id,), get_read_connection),
+                query_one("""
+                    SELECT total_commission
+                    FROM commission_balance
+                    WHERE employee_id = %s
+                """, (emp_id,))
+            )
+            if not field_manager_info:
+                raise HTTPException(status_code=404, detail={"message": "Field manager not found"})
+
+            return {
+                "status": "success",
+                "role": role,
+                "field_manager_info": field_manager_info,
+                "home_teachers": home_teachers,
+                "commissions": commissions,
+                "stats": {
+                    "total_home_teachers": len(home_teachers),
+                    "total_commission": commission_result['total_commission'] if commission_result else 0
+                }
+            }
+
+        elif role == "home-teacher":
+            profile_data, salary_history = await asyncio.gather(
+                query_one("""
+                    SELECT ht.id, ht.name, ht.email, ht.phn, ht.city, ht.state, ht.created_at,
+                           ht.manager_id, fm.name as manager_name, fm.email as manager_email,
+                           fm.phn as manager_phone, fm.city as manager_city, fm.state as manager_state
+                    FROM employees ht
+                    LEFT JOIN employees fm ON ht.manager_id = fm.id
+                    WHERE ht.id = %s
+                """, (emp_id,)),
+                query_all("""
+                    SELECT month, year, generated_at
+                    FROM salary_slip_history
+                    WHERE employee_id = %s
+                    ORDER BY year DESC, month DESC
+                    LIMIT 12
+                """, (emp_id,))
+            )
+            if not profile_data:
+                raise HTTPException(status_code=404, detail={"message": "Profile not found"})
+
+            return {
+                "status": "success",
+                "role": role,
+                "profile": profile_data,
+                "salary_slip_history": salary_history
+            }
+
+        else:
+            raise HTTPException(status_code=403, detail={"message": "Insufficient permissions"})
+
+    except HTTPException:
+        raise
+    except Exception as err:
+        raise_http_error("Cannot load dashboard", err)
+
+
+@router.get("/events/stream")
+async def event_stream(request: Request, token_data: dict = Depends(get_login_role)):
+    """
+    Server-sent change events (employee_created, funds_added, commission_earned) so dashboards
+    refetch only what changed. Admin and branch get every event, others only their own subtree.
+    Reconnecting clients send Last-Event-ID and get what they missed.
+    """
+    subscriber = subscribe(token_data.get("role"), token_data.get("emp_id"))
+    return StreamingResponse(
+        stream_events(request, subscriber, request.headers.get("last-event-id")),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,240 @@
+from fastapi import APIRouter, HTTPException, Depends
+from utils.auth import get_login_role
+from utils.replicas import get_read_connection
+from utils.queries import Query, CommissionWithCreator, FIELD_MANAGER_COMMISSION_HISTORY
+from utils.api_error import raise_http_error
+from utils.commission_rollup import get_commission_balance, get_monthly_rollup, get_yearly_rollup
+from utils.authorization import can_view_employee
+from utils.clock import month_range
+
+router = APIRouter(tags=["field-manager"])
+
+@router.get("/get_field_manager_data/{field_manager_id}")
+async def get_field_manager_data(field_manager_id: str, token_data: dict = Depends(get_login_role)):
+    """
+    Get field manager's home teachers and commission data
+    """
+    user_role = token_data.get("role")
+    user_id = token_data.get("emp_id")
+    
+    conn = get_read_connection()
+    cursor = conn.cursor(dictionary=True)
+    
+    try:
+        # Check authorization
+        if not can_view_employee(cursor, user_role, user_id, field_manager_id):
+            raise HTTPException(status_code=403, detail={"message": "Unauthorized access"})
+
+        # Get home teachers under this field manager
+        cursor.execute("""
+            SELECT id, name, email, phn, city, state, created_at
+            FROM employees 
+            WHERE role = 'home-teacher' AND manager_id = %s
+            ORDER BY created_at DESC
+        """, (field_manager_id,))
+        
+        home_teachers = cursor.fetchall()
+        
+        # Get field manager's commissions
+        commissions = FIELD_MANAGER_COMMISSION_HISTORY.all(conn, (field_manager_id,))
+        
+        # Get field manager's own details
+        cursor.execute("""
+            SELECT e.name, e.email, e.manager_id, m.name as manager_name
+            FROM employees e
+            LEFT JOIN employees m ON e.manager_id = m.id
+            WHERE e.id = %s
+        """, (field_manager_id,))
+        
+        field_manager_info = cursor.fetchone()
+        
+        # Calculate stats
+        total_home_teachers = len(home_teachers)
+        total_commission = get_commission_balance(cursor, field_manager_id)
+        
+        return {
+            "status": "success",
+            "data": {
+                "field_manager_info": field_manager_info,
+                "home_teachers": home_teachers,
+                "commissions": commissions,
+                "stats": {
+                    "total_home_teachers": total_home_teachers,
+                    "total_commission": total_commission
+                }
+            }
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as err:
+        raise_http_error("Cannot fetch field manager data", err)
+    finally:
+        conn.close()
+
+
+FIELD_MANAGER_MONTHLY_COMMISSIONS = Query(CommissionWithCreator, """
+    SELECT {columns}
+    FROM commisions c
+    LEFT JOIN employees e ON c.created_id = e.id
+    WHERE c.field_manager_id = %s
+    AND c.registered_at >= %s AND c.registered_at < %s
+    ORDER BY c.registered_at DESC
+""")
+
+
+@router.get("/get_field_manager_monthly_commissions/{field_manager_id}/{year}/{month}")
+async def get_field_manager_monthly_commissions(
+    field_manager_id: str, 
+    year: int, 
+    month: int, 
+    summary_only: bool = False,
+    token_data: dict = Depends(get_login_role)
+):
+    """
+    Get field manager's commission breakdown for a specific month
+    Pass summary_only=true to skip the commission rows (dashboard cards)
+    """
+    user_role = token_data.get("role")
+    user_id = token_data.get("emp_id")
+    
+    conn = get_read_connection()
+    cursor = conn.cursor(dictionary=True)
+    
+    try:
+        if not 1 <= month <= 12:
+            raise HTTPException(status_code=400, detail={"message": "Month must be between 1 and 12"})
+
+        # Check authorization
+        if not can_view_employee(cursor, user_role, user_id, field_manager_id):
+            raise HTTPException(status_code=403, detail={"message": "Unauthorized access"})
+
+        totals = get_monthly_rollup(conn, field_manager_id, "field-manager", year, month)
+
+        result = {
+            "status": "success",
+            "month": month,
+            "year": year,
+            "summary": {
+                "total_commission": totals["total_commission"],
+                "home_teachers_recruited": totals["home_teachers_recruited"],
+                "total_registrations": totals["total_registrations"]
+            }
+        }
+
+        if not summary_only:
+            # Get commissions for the specific month and year
+            result["commissions"] = FIELD_MANAGER_MONTHLY_COMMISSIONS.all(conn, (field_manager_id, *month_range(year, month)))
+        
+        return result
+        
+    except HTTPException:
+        raise
+    except Exception as err:
+        raise_http_error("Cannot fetch monthly commissions", err)
+    finally:
+        conn.close()
+
+
+@router.get("/get_field_manager_yearly_commissions/{field_manager_id}/{year}")
+async def get_field_manager_yearly_commissions(field_manager_id: str, year: int, token_data: dict = Depends(get_login_role)):
+    """
+    Month by month commission totals for a field manager, served from the monthly rollup
+    """
+    user_role = token_data.get("role")
+    user_id = token_data.get("emp_id")
+    
+    conn = get_read_connection()
+    cursor = conn.cursor(dictionary=True)
+    
+    try:
+        # Check authorization
+        if not can_view_employee(cursor, user_role, user_id, field_manager_id):
+            raise HTTPException(status_code=403, detail={"message": "Unauthorized access"})
+
+        months = get_yearly_rollup(conn, field_manager_id, "field-manager", year)
+
+        return {
+            "status": "success",
+            "year": year,
+            "months": months,
+            "summary": {
+                "total_commission": sum(m['total_commission'] for m in months),
+                "home_teachers_recruited": sum(m['home_teachers_recruited'] for m in months),
+                "total_registrations": sum(m['total_registrations'] for m in months)
+            }
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as err:
+        raise_http_error("Cannot fetch yearly commissions", err)
+    finally:
+        conn.close()
+
+
+HOME_TEACHER_COMMISSIONS = Query(CommissionWithCreator, """
+    SELECT {columns}
+    FROM commisions c
+    LEFT JOIN employees e ON c.created_id = e.id
+    WHERE c.field_manager_id = %s AND c.created_role = 'home-teacher'
+    ORDER BY c.registered_at DESC
+""")
+
+
+@router.get("/get_field_manager_home_teachers/{field_manager_id}")
+async def get_field_manager_home_teachers(field_manager_id: str, token_data: dict = Depends(get_login_role)):
+    """
+    Get all home teachers under a specific field manager
+    """
+    user_role = token_data.get("role")
+    user_id = token_data.get("emp_id")
+    
+    conn = get_read_connection()
+    cursor = conn.cursor(dictionary=True)
+    
+    try:
+        # Check authorization
+        if not can_view_employee(cursor, user_role, user_id, field_manager_id):
+            raise HTTPException(status_code=403, detail="Unauthorized access")
+
+        # Get field manager info first
+        cursor.execute("""
+            SELECT e.id, e.name, e.email, e.created_at, m.name as manager_name
+            FROM employees e
+            LEFT JOIN employees m ON e.manager_id = m.id
+            WHERE e.id = %s AND e.role = 'field-manager'
+        """, (field_manager_id,))
+        
+        field_manager_info = cursor.fetchone()
+        if not field_manager_info:
+            raise HTTPException(status_code=404, detail="Field manager not found")
+        
+        # Get all home teachers under this field manager
+        cursor.execute("""
+            SELECT id, name, email, phn, city, state, created_at
+            FROM employees 
+            WHERE role = 'home-teacher' AND manager_id = %s
+            ORDER BY created_at DESC
+        """, (field_manager_id,))
+        
+        home_teachers = cursor.fetchall()
+        
+        # Get field manager's commissions
+        commissions = HOME_TEACHER_COMMISSIONS.all(conn, (field_manager_id,))
+        
+        return {
+            "status": "success",
+            "field_manager_info": field_manager_info,
+            "home_teachers": home_teachers,
+            "commissions": commissions,
+            "total_home_teachers": len(home_teachers),
+            "total_commission": get_commission_balance(cursor, field_manager_id)
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as err:
+        raise_http_error("Cannot fetch field manager home teachers", err)
+    finally:
+        conn.close()
@@ -0,0 +1,386 @@
+from fastapi import APIRouter, HTTPException, Depends, Request
+import asyncio
+from datetime import datetime
+from fastapi.responses import FileResponse
+from utils.responses import ORJSONResponse
+from utils.auth import get_login_role
+from utils.db_config import get_db_connection
+from utils.replicas import get_read_connection, mark_write
+from utils.data_version import bump_data_version, check_etag, cache_headers, employees_scope, salary_slips_scope, RULES
+from utils.api_error import raise_http_error
+from utils.salary_slip import build_salary_slip, salary_slip_path, write_salary_slip_pdf
+from utils.rules import get_rule
+from utils.clock import now_ist, today_ist
+from pydantic_models.models import HomeTeacherSalaryInfo, SalarySlipRequest
+
+router = APIRouter(tags=["home-teacher"])
+
+@router.get("/get_home_teacher_funds")
+async def get_home_teacher_funds(token_data: dict = Depends(get_login_role)):
+    """
+    Get home teacher funds (returns static 0 as home teachers don't handle funds)
+    """
+    role = token_data.get("role")
+    
+    if role != "home-teacher":
+        raise_http_error(f"Cannot get funds for {role}")
+
+    return {
+        "status": "good", 
+        "detail": {
+            "message": "Funds fetched successfully", 
+            "funds": 0
+        }
+    }
+
+
+@router.post("/generate_salary_slip")
+async def generate_salary_slip(
+    data: SalarySlipRequest,
+    token_data: dict = Depends(get_login_role)
+):
+    """
+    Generate salary slip for home teacher
+    """
+    emp_id = token_data.get("emp_id")
+    role = token_data.get("role")
+
+    if role != "home-teacher":
+        raise HTTPException(
+            status_code=403,
+            detail={"message": "Only home teachers can generate salary slips"}
+        )
+
+    # Validate month and year
+    if not (1 <= data.month <= 12):
+        raise HTTPException(
+            status_code=400,
+            detail={"message": "Invalid month. Must be between 1 and 12"}
+        )
+
+    current_year = today_ist().year
+    if not (current_year - 5 <= data.year <= current_year):
+        raise HTTPException(
+            status_code=400,
+            detail={"message": f"Invalid year. Must be between {current_year - 5} and {current_year}"}
+        )
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        # Get employee details, and the slip if the month-end batch or an earlier request made it
+        cursor.execute(
+            """
+            SELECT e.name, e.created_at, e.state, s.generated_at
+            FROM employees e
+            LEFT JOIN salary_slip_history s
+                ON s.employee_id = e.id AND s.month = %s AND s.year = %s
+            WHERE e.id = %s
+            """,
+            (data.month, data.year, emp_id)
+        )
+        employee_data = cursor.fetchone()
+
+        if not employee_data:
+            raise HTTPException(
+                status_code=404,
+                detail={"message": "Employee not found"}
+            )
+
+        employee_name, created_at, state, generated_at = employee_data
+
+        # Ensure created_at is a datetime object
+        if isinstance(created_at, str):
+            try:
+                created_at = datetime.strptime(created_at, "%Y-%m-%d %H:%M:%S")
+            except ValueError:
+                created_at = datetime.strptime(created_at, "%Y-%m-%d")
+
+        # Check if requested month/year is before joining date
+        requested_date = datetime(data.year, data.month, 1)
+        if requested_date < created_at:
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "message": "Salary slip cannot be created before joining date",
+                    "joining_date": created_at.strftime("%Y-%m-%d"),
+                    "requested_month": f"{data.month}/{data.year}"
+                }
+            )
+
+        # Create salary slip data
+        rule = get_rule("home-teacher", state, requested_date.date())
+        salary_info = HomeTeacherSalaryInfo(
+            employee_id=emp_id,
+            employee_name=employee_name,
+            basic_salary=rule.basic_salary,
+            allowances=rule.allowances,
+            deductions=rule.deductions,
+            net_salary=rule.net_salary
+        )
+
+        # already generated: nothing to write, the month-end rush stays read only
+        if generated_at:
+            return {
+                "status": "success",
+                "salary_slip": salary_info.model_dump(),
+                "generation_date": generated_at.isoformat(),
+                "message": "Salary slip generated successfully"
+            }
+
+        # Log salary slip generation
+        today_datetime = now_ist()
+        cursor.execute(
+            """
+            INSERT INTO salary_slip_history (employee_id, month, year, generated_at)
+            VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE generated_at = %s
+            """,
+            (emp_id, data.month, data.year, today_datetime, today_datetime)
+        )
+        conn.commit()
+        mark_write()
+        bump_data_version(conn, salary_slips_scope(emp_id))
+
+        return {
+            "status": "success",
+            "salary_slip": salary_info.model_dump(),
+            "generation_date": today_datetime.isoformat(),
+            "message": "Salary slip generated successfully"
+        }
+
+    except HTTPException:
+        raise
+    except Exception as err:
+        conn.rollback()
+        raise_http_error("Cannot generate salary slip", err)
+    finally:
+        conn.close()
+
+
+@router.get("/salary_slip_pdf/{year}/{month}")
+async def get_salary_slip_pdf(year: int, month: int, token_data: dict = Depends(get_login_role)):
+    """
+    Serve the home teacher's pre-generated salary slip PDF.
+    Slips missing from the monthly batch are rendered and cached on first request.
+    """
+    emp_id = token_data.get("emp_id")
+    role = token_data.get("role")
+
+    if role != "home-teacher":
+        raise HTTPException(
+            status_code=403,
+            detail={"message": "Only home teachers can download salary slips"}
+        )
+
+    current_year = today_ist().year
+    if not (1 <= month <= 12) or not (current_year - 5 <= year <= current_year):
+        raise HTTPException(
+            status_code=400,
+            detail={"message": "Invalid month or year"}
+        )
+
+    filename = f"salary-slip-{year}-{month:02d}.pdf"
+    path = salary_slip_path(emp_id, year, month)
+    if path.exists():
+        return FileResponse(path, media_type="application/pdf", filename=filename)
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("SELECT name, created_at, state FROM employees WHERE id = %s", (emp_id,))
+        employee_data = cursor.fetchone()
+
+        if not employee_data:
+            raise HTTPException(
+                status_code=404,
+                detail={"message": "Employee not found"}
+            )
+
+        employee_name, created_at, state = employee_data
+        if created_at and datetime(year, month, 1) < created_at:
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "message": "Salary slip cannot be created before joining date",
+                    "joining_date": created_at.strftime("%Y-%m-%d"),
+                    "requested_month": f"{month}/{year}"
+                }
+            )
+
+        slip = build_salary_slip(emp_id, employee_name, year, month, state)
+        path = await asyncio.to_thread(write_salary_slip_pdf, slip)
+
+        today_datetime = now_ist()
+        cursor.execute(
+            """
+            INSERT INTO salary_slip_history (employee_id, month, year, generated_at)
+            VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE generated_at = %s
+            """,
+            (emp_id, month, year, today_datetime, today_datetime)
+        )
+        conn.commit()
+        mark_write()
+        bump_data_version(conn, salary_slips_scope(emp_id))
+
+        return FileResponse(path, media_type="application/pdf", filename=filename)
+
+    except HTTPException:
+        raise
+    except Exception as err:
+        conn.rollback()
+        raise_http_error("Cannot generate salary slip", err)
+    finally:
+        conn.close()
+
+
+@router.get("/get_salary_slip_history")
+async def get_salary_slip_history(request: Request, token_data: dict = Depends(get_login_role)):
+    """
+    Get salary slip generation history for home teacher
+    """
+    emp_id = token_data.get("emp_id")
+    role = token_data.get("role")
+    
+    if role != "home-teacher":
+        raise HTTPException(
+            status_code=403,
+            detail={"message": "Only home teachers can view salary slip history"}
+        )
+    
+    conn = get_read_connection()
+    cursor = conn.cursor(dictionary=True)
+    
+    try:
+        etag, not_modified = check_etag(cursor, request, token_data, (salary_slips_scope(emp_id),))
+        if not_modified:
+            return not_modified
+
+        cursor.execute(
+            """
+            SELECT month, year, generated_at
+            FROM salary_slip_history
+            WHERE employee_id = %s
+            ORDER BY year DESC, month DESC
+            LIMIT 12
+            """,
+            (emp_id,)
+        )
+        
+        history = cursor.fetchall()
+        
+        return ORJSONResponse(
+            {
+                "status": "success",
+                "history": history,
+                "message": "Salary slip history retrieved successfully"
+            },
+            headers=cache_headers(etag)
+        )
+        
+    except Exception as err:
+        raise_http_error("Cannot fetch salary slip history", err)
+    finally:
+        conn.close()
+
+
+@router.get("/get_home_teacher_profile")
+async def get_home_teacher_profile(request: Request, token_data: dict = Depends(get_login_role)):
+    """
+    Get complete home teacher profile including manager info
+    """
+    emp_id = token_data.get("emp_id")
+    role = token_data.get("role")
+    
+    if role != "home-teacher":
+        raise HTTPException(
+            status_code=403,
+            detail={"message": "Only home teachers can access this endpoint"}
+        )
+    
+    conn = get_read_connection()
+    cursor = conn.cursor(dictionary=True)
+    
+    try:
+        # employment_duration moves with the date, so today is part of the tag
+        etag, not_modified = check_etag(cursor, request, token_data, (employees_scope(emp_id), RULES), today_ist())
+        if not_modified:
+            return not_modified
+
+        # Get home teacher details
+        cursor.execute(
+            """
+            SELECT ht.id, ht.name, ht.email, ht.phn, ht.city, ht.state, 
+                   ht.created_at, ht.manager_id,
+                   fm.name as manager_name, fm.email as manager_email, 
+                   fm.phn as manager_phone, fm.city as manager_city, fm.state as manager_state
+            FROM employees ht
+            LEFT JOIN employees fm ON ht.manager_id = fm.id
+            WHERE ht.id = %s
+            """,
+            (emp_id,)
+        )
+        
+        profile_data = cursor.fetchone()
+        
+        if not profile_data:
+            raise HTTPException(
+                status_code=404,
+                detail={"message": "Profile not found"}
+            )
+        
+        # Calculate employment duration
+        employment_date = profile_data['created_at']
+        current_date = now_ist()
+        
+        if employment_date:
+            duration_days = (current_date - employment_date).days
+            duration_months = duration_days // 30
+            
+            if duration_months < 1:
+                employment_duration = f"{duration_days} days"
+            else:
+                employment_duration = f"{duration_months} month{'s' if duration_months > 1 else ''}"
+        else:
+            employment_duration = "N/A"
+        
+        # Prepare response
+        profile = {
+            "employee_info": {
+                "id": profile_data['id'],
+                "name": profile_data['name'],
+                "email": profile_data['email'],
+                "phone": profile_data['phn'],
+                "city": profile_data['city'],
+                "state": profile_data['state'],
+                "employment_date": employment_date.isoformat() if employment_date else None,
+                "employment_duration": employment_duration,
+                "monthly_salary": get_rule("home-teacher", profile_data['state']).net_salary
+            },
+            "manager_info": {
+                "name": profile_data['manager_name'],
+                "email": profile_data['manager_email'],
+                "phone": profile_data['manager_phone'],
+                "city": profile_data['manager_city'],
+                "state": profile_data['manager_state']
+            } if profile_data['manager_name'] else None
+        }
+        
+        return ORJSONResponse(
+            {
+                "status": "success",
+                "profile": profile,
+                "message": "Profile retrieved successfully"
+            },
+            headers=cache_headers(etag)
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as err:
+        raise_http_error("Cannot fetch profile", err)
+    finally:
+        conn.close()
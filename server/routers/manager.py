@@ -0,0 +1,498 @@
+from fastapi import APIRouter, HTTPException, Depends
+from datetime import date, timedelta
+from utils.clock import now_ist, today_ist, day_range, month_range
+from utils.responses import ORJSONResponse
+from utils.auth import get_login_role
+from utils.db_config import get_db_connection
+from utils.replicas import get_read_connection, mark_write
+from utils.queries import Query, CommissionWithCreator, CommissionWithManager
+from utils.data_version import bump_employee_versions
+from utils.outbox import enqueue_event, EMPLOYEE_CREATED
+from utils.funds_ledger import post_funds_entry, get_balance_at, REGISTRATION_DEBIT
+from utils.api_error import raise_http_error
+from utils.commission_rollup import record_commission, get_commission_balance, get_commission_summary, get_monthly_rollup, get_yearly_rollup
+from utils.hierarchy import add_to_hierarchy
+from utils.authorization import can_view_employee, invalidate_employee
+from utils.rules import get_rule
+from utils.helper import generate_emp_id
+from pydantic_models.models import create_emp_request, HistoryRequest
+
+router = APIRouter(tags=["manager"])
+
+@router.post("/create_employee")
+async def create_employee(data: create_emp_request, token_data: dict = Depends(get_login_role)):
+    creator_role = token_data.get("role")
+    creator_id = token_data.get("emp_id")
+
+    if creator_role != "manager":
+        raise_http_error(f"Only manager can create {data.role}")
+    if data.role not in ["field-manager", "home-teacher"]:
+        raise_http_error("Invalid role provided")
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        new_emp_id = generate_emp_id(data.role)
+        today_datetime = now_ist()
+
+        cursor.execute("SELECT funds from employees where id = %s", (creator_id,))
+        total_funds = cursor.fetchone()[0]
+
+        rule = get_rule(data.role, data.state)
+
+        if data.role == "field-manager":
+            if total_funds < rule.cost:
+                return {"status": "bad", "detail": {"message": "Insufficient funds"}}
+            cursor.execute(
+                """
+                INSERT INTO employees (id, name, fname, mname, DOB, addr, city, district, state, email, phn, password, role, manager_id, created_at)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                """,
+                (new_emp_id, data.name, data.fname, data.mname, data.dob, data.addr, data.city, data.district, data.state, data.email, data.phn, data.pwd, data.role, creator_id, today_datetime)
+            )
+            add_to_hierarchy(cursor, new_emp_id, creator_id)
+
+            post_funds_entry(cursor, creator_id, -rule.cost, REGISTRATION_DEBIT, new_emp_id, today_datetime)
+
+            cursor.execute(
+                """
+                INSERT INTO commisions (manager_id, manager_commision, created_role, created_id, registered_at)
+                VALUES(%s, %s, %s, %s, %s)
+                """, (creator_id, rule.manager_commission, data.role, new_emp_id, today_datetime)
+            )
+            commissions = [
+                {"earner_id": creator_id, "earner_role": "manager", "amount": rule.manager_commission}
+            ]
+        
+        if data.role == "home-teacher":
+            if total_funds < rule.cost:
+                return {"status": "bad", "detail": {"message": "Insufficient funds"}}
+            cursor.execute(
+                """
+                INSERT INTO employees (id, name, fname, mname, DOB, addr, city, district, state, email, phn, password, role, manager_id, created_at)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                """,
+                (new_emp_id, data.name, data.fname, data.mname, data.dob, data.addr, data.city, data.district, data.state, data.email, data.phn, data.pwd, data.role, data.manager_id, today_datetime)
+            )
+            add_to_hierarchy(cursor, new_emp_id, data.manager_id)
+
+            post_funds_entry(cursor, creator_id, -rule.cost, REGISTRATION_DEBIT, new_emp_id, today_datetime)
+
+            cursor.execute(
+                """
+                INSERT INTO commisions (manager_id, field_manager_id, manager_commision, field_manager_commision, created_role, created_id, registered_at)
+                VALUES(%s, %s, %s, %s, %s, %s, %s)
+                """, (creator_id, data.manager_id, rule.manager_commission, rule.field_manager_commission, data.role, new_emp_id, today_datetime)
+            )
+            commissions = [
+                {"earner_id": creator_id, "earner_role": "manager", "amount": rule.manager_commission}
+            ]
+            if data.manager_id:
+                commissions.append(
+                    {"earner_id": data.manager_id, "earner_role": "field-manager", "amount": rule.field_manager_commission}
+                )
+
+        # monthly rollups and running balances commit with the commisions row,
+        # the geo rollup and live events follow through the outbox dispatcher
+        for commission in commissions:
+            record_commission(
+                cursor, commission["earner_id"], commission["earner_role"], data.role,
+                commission["amount"], today_datetime
+            )
+        enqueue_event(cursor, EMPLOYEE_CREATED, {
+            "id": new_emp_id,
+            "role": data.role,
+            "created_by": creator_id,
+            "registered_at": today_datetime,
+            "cost": rule.cost,
+            "commissions": commissions
+        })
+
+        conn.commit()
+        mark_write()
+        # the new employee's ancestors and the creator, whose funds went down
+        bump_employee_versions(conn, new_emp_id, creator_id)
+        invalidate_employee(new_emp_id)
+        return {"status": "good", "detail": {"message": f"{data.role} created successfully", "role": data.role, "name": data.name, "email": data.email, "password": data.pwd}}
+
+    except Exception as err:
+        conn.rollback()
+        print(data)
+        print(err)
+        raise raise_http_error("Cannot create employee", err)
+
+    finally:
+        conn.close()
+
+
+@router.get("/get_emp_funds")
+async def get_emp_funds(token_data: dict = Depends(get_login_role)):
+    emp_id = token_data.get("emp_id")
+    role = token_data.get("role")
+    if role != "manager":
+        raise_http_error(f"cannot get funds for {role}")
+
+    conn = get_read_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("SELECT funds FROM employees WHERE id = %s", (emp_id,))
+
+        amount = cursor.fetchone()
+        if not amount:
+            raise_http_error("Cannot find employee")
+        return {"status": "good", "detail": {"message": "Funds fetched succesully", "funds": amount[0]}}
+    except Exception as err:
+        raise_http_error("cannot get employee funds", err)
+    finally:
+        conn.close()
+
+
+@router.get("/get_emp_funds_at/{emp_id}")
+async def get_emp_funds_at(emp_id: str, on: date, token_data: dict = Depends(get_login_role)):
+    """
+    Funds an employee held at the end of `on` (IST), from the nearest balance snapshot plus the ledger tail
+    """
+    user_role = token_data.get("role")
+    user_id = token_data.get("emp_id")
+
+    conn = get_read_connection()
+    cursor = conn.cursor()
+
+    try:
+        if not can_view_employee(cursor, user_role, user_id, emp_id):
+            raise HTTPException(status_code=403, detail={"message": "You can only view funds in your own hierarchy"})
+
+        # day_range's end is exclusive, the ledger lookup is inclusive
+        _, next_day = day_range(on, on)
+        funds = get_balance_at(cursor, emp_id, next_day - timedelta(seconds=1))
+
+        return {"status": "good", "detail": {"employee_id": emp_id, "date": on.isoformat(), "funds": funds}}
+
+    except HTTPException:
+        raise
+    except Exception as err:
+        raise_http_error("cannot get employee funds", err)
+    finally:
+        conn.close()
+
+
+@router.get("/get_field_managers_under_manager/{manager_id}")
+async def get_field_managers_under_manager(manager_id: str, token_data: dict = Depends(get_login_role)):
+    """
+    Get all field managers under a specific manager
+    Only the manager themselves or admin can access this data
+    """
+    user_role = token_data.get("role")
+    user_id = token_data.get("emp_id")
+    
+    conn = get_read_connection()
+    cursor = conn.cursor(dictionary=True)
+    
+    try:
+        # Check authorization
+        if not can_view_employee(cursor, user_role, user_id, manager_id):
+            raise HTTPException(status_code=403, detail={"message": "You can only view your own field managers"})
+
+        # Get all field managers under this manager
+        cursor.execute("""
+            SELECT id, name, email, funds, created_at
+            FROM employees 
+            WHERE role = 'field-manager' AND manager_id = %s
+            ORDER BY created_at DESC
+        """, (manager_id,))
+        
+        field_managers = cursor.fetchall()
+        
+        # Get count of home teachers under each field manager
+        for fm in field_managers:
+            cursor.execute("""
+                SELECT COUNT(*) as count
+                FROM employees 
+                WHERE role = 'home-teacher' AND manager_id = %s
+            """, (fm['id'],))
+            
+            count_result = cursor.fetchone()
+            fm['home_teachers_count'] = count_result['count'] if count_result else 0
+        
+        return {
+            "status": "success", 
+            "field_managers": field_managers,
+            "total_count": len(field_managers)
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as err:
+        raise_http_error("Cannot fetch field managers", err)
+    finally:
+        conn.close()
+
+
+MANAGER_MONTHLY_COMMISSIONS = Query(CommissionWithCreator, """
+    SELECT {columns}
+    FROM commisions c
+    LEFT JOIN employees e ON c.created_id = e.id
+    WHERE c.manager_id = %s
+    AND c.registered_at >= %s AND c.registered_at < %s
+    ORDER BY c.registered_at DESC
+""")
+
+
+@router.get("/get_manager_monthly_commissions/{manager_id}/{year}/{month}")
+async def get_manager_monthly_commissions(
+    manager_id: str, 
+    year: int, 
+    month: int, 
+    summary_only: bool = False,
+    token_data: dict = Depends(get_login_role)
+):
+    """
+    Get detailed commission breakdown for a manager for a specific month and year
+    Pass summary_only=true to skip the commission rows (dashboard cards)
+    """
+    user_role = token_data.get("role")
+    user_id = token_data.get("emp_id")
+    
+    conn = get_read_connection()
+    cursor = conn.cursor(dictionary=True)
+    
+    try:
+        if not 1 <= month <= 12:
+            raise HTTPException(status_code=400, detail={"message": "Month must be between 1 and 12"})
+
+        # Check authorization
+        if not can_view_employee(cursor, user_role, user_id, manager_id):
+            raise HTTPException(status_code=403, detail={"message": "You can only view your own commission details"})
+
+        totals = get_monthly_rollup(conn, manager_id, "manager", year, month)
+
+        result = {
+            "status": "success",
+            "month": month,
+            "year": year,
+            "summary": {
+                "total_commission": totals["total_commission"],
+                "field_managers_recruited": totals["field_managers_recruited"],
+                "home_teachers_recruited": totals["home_teachers_recruited"],
+                "total_registrations": totals["total_registrations"]
+            }
+        }
+
+        if not summary_only:
+            # Get commissions for the specific month and year
+            result["commissions"] = MANAGER_MONTHLY_COMMISSIONS.all(conn, (manager_id, *month_range(year, month)))
+        
+        return result
+        
+    except HTTPException:
+        raise
+    except Exception as err:
+        raise_http_error("Cannot fetch monthly commissions", err)
+    finally:
+        conn.close()
+
+
+@router.get("/get_manager_yearly_commissions/{manager_id}/{year}")
+async def get_manager_yearly_commissions(manager_id: str, year: int, token_data: dict = Depends(get_login_role)):
+    """
+    Month by month commission totals for a manager, served from the monthly rollup
+    """
+    user_role = token_data.get("role")
+    user_id = token_data.get("emp_id")
+    
+    conn = get_read_connection()
+    cursor = conn.cursor(dictionary=True)
+    
+    try:
+        # Check authorization
+        if not can_view_employee(cursor, user_role, user_id, manager_id):
+            raise HTTPException(status_code=403, detail={"message": "You can only view your own commission details"})
+
+        months = get_yearly_rollup(conn, manager_id, "manager", year)
+
+        return {
+            "status": "success",
+            "year": year,
+            "months": months,
+            "summary": {
+                "total_commission": sum(m['total_commission'] for m in months),
+                "field_managers_recruited": sum(m['field_managers_recruited'] for m in months),
+                "home_teachers_recruited": sum(m['home_teachers_recruited'] for m in months),
+                "total_registrations": sum(m['total_registrations'] for m in months)
+            }
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as err:
+        raise_http_error("Cannot fetch yearly commissions", err)
+    finally:
+        conn.close()
+
+
+IN_RANGE = "WHERE c.registered_at >= %s AND c.registered_at < %s"
+MANAGER_IN_RANGE = "WHERE c.manager_id = %s AND c.registered_at >= %s AND c.registered_at < %s"
+
+COMMISSION_HISTORY_SQL = """
+    SELECT {columns}
+    FROM commisions c
+    LEFT JOIN employees e ON c.created_id = e.id
+    LEFT JOIN employees m ON c.manager_id = m.id
+    {where}
+    ORDER BY c.registered_at DESC
+"""
+COMMISSION_HISTORY = Query(CommissionWithManager, COMMISSION_HISTORY_SQL, where=IN_RANGE)
+MANAGER_COMMISSION_HISTORY = Query(CommissionWithManager, COMMISSION_HISTORY_SQL, where=MANAGER_IN_RANGE)
+
+
+@router.post("/get_manager_commission_history")
+async def get_manager_commission_history(
+    data: HistoryRequest,
+    summary_only: bool = False,
+    token_data: dict = Depends(get_login_role)
+):
+    """
+    Get commission history for a manager with date filtering
+    Pass summary_only=true to skip the history rows (dashboard cards)
+    """
+    user_role = token_data.get("role")
+    user_id = token_data.get("emp_id")
+    
+    if user_role not in ["admin", "branch", "manager"]:
+        raise HTTPException(
+            status_code=403,
+            detail={"message": "Insufficient permissions"}
+        )
+    
+    conn = get_read_connection()
+    cursor = conn.cursor(dictionary=True)
+    
+    try:
+        today = today_ist()
+        start_date = data.start_date
+        end_date = data.end_date
+        
+        # Set default date range if not provided
+        if not start_date and not end_date:
+            end_date = today
+            start_date = today - timedelta(days=90)  # Last 3 months
+        elif start_date and not end_date:
+            max_end = start_date + timedelta(days=90)
+            end_date = min(max_end, today)
+        elif end_date and not start_date:
+            end_date = min(end_date, today)
+            start_date = end_date - timedelta(days=90)
+        elif start_date and end_date:
+            if (end_date - start_date).days > 365:  # Max 1 year range
+                raise HTTPException(
+                    status_code=400,
+                    detail={"message": "Date range cannot exceed 1 year"}
+                )
+            if end_date > today:
+                end_date = today
+        
+        if user_role in ["admin", "branch"]:
+            where_clause = IN_RANGE
+            history_query = COMMISSION_HISTORY
+            params = list(day_range(start_date, end_date))
+        else:  # manager
+            where_clause = MANAGER_IN_RANGE
+            history_query = MANAGER_COMMISSION_HISTORY
+            params = [user_id, *day_range(start_date, end_date)]
+        
+        totals = get_commission_summary(cursor, where_clause, params)
+
+        result = {
+            "status": "success",
+            "summary": {
+                "total_commission": totals["total_manager_commission"],
+                "field_managers_recruited": totals["field_managers_recruited"],
+                "home_teachers_recruited": totals["home_teachers_recruited"],
+                "total_registrations": totals["total_registrations"],
+                "date_range": {
+                    "start_date": start_date.isoformat(),
+                    "end_date": end_date.isoformat()
+                }
+            }
+        }
+
+        if not summary_only:
+            result["commission_history"] = history_query.all(conn, tuple(params))
+        
+        return ORJSONResponse(result)
+        
+    except HTTPException:
+        raise
+    except Exception as err:
+        raise_http_error("Cannot fetch commission history", err)
+    finally:
+        conn.close()
+
+
+@router.get("/get_manager_field_managers/{manager_id}")
+async def get_manager_field_managers(manager_id: str, token_data: dict = Depends(get_login_role)):
+    """
+    Get all field managers under a specific manager with their home teacher counts
+    """
+    user_role = token_data.get("role")
+    user_id = token_data.get("emp_id")
+    
+    conn = get_read_connection()
+    cursor = conn.cursor(dictionary=True)
+    
+    try:
+        # Check authorization
+        if not can_view_employee(cursor, user_role, user_id, manager_id):
+            raise HTTPException(status_code=403, detail="Unauthorized access")
+
+        # Get manager info first
+        cursor.execute("""
+            SELECT id, name, email, funds, created_at
+            FROM employees 
+            WHERE id = %s AND role = 'manager'
+        """, (manager_id,))
+        
+        manager_info = cursor.fetchone()
+        if not manager_info:
+            raise HTTPException(status_code=404, detail="Manager not found")
+        
+        # Get all field managers under this manager
+        cursor.execute("""
+            SELECT id, name, email, funds, created_at
+            FROM employees 
+            WHERE role = 'field-manager' AND manager_id = %s
+            ORDER BY created_at DESC
+        """, (manager_id,))
+        
+        field_managers = cursor.fetchall()
+        
+        # For each field manager, get home teacher count
+        for fm in field_managers:
+            cursor.execute("""
+                SELECT COUNT(*) as count
+                FROM employees 
+                WHERE role = 'home-teacher' AND manager_id = %s
+            """, (fm['id'],))
+            
+            count_result = cursor.fetchone()
+            fm['home_teachers_count'] = count_result['count'] if count_result else 0
+        
+        # Get manager's total commissions from the running balance
+        total_commission = get_commission_balance(cursor, manager_id)
+        
+        return {
+            "status": "success",
+            "manager_info": manager_info,
+            "field_managers": field_managers,
+            "total_field_managers": len(field_managers),
+            "total_commission": total_commission
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as err:
+        raise_http_error("Cannot fetch manager field managers", err)
+    finally:
+        conn.close()
@@ -0,0 +1,183 @@
+from fastapi import APIRouter
+import asyncio
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+from fastapi.responses import JSONResponse
+from utils.responses import ORJSONResponse
+from utils.auth import create_access_token, TOKEN_EXPIRE_DAYS
+from utils.db_config import get_db_connection, ping_db
+from utils.replicas import get_read_connection, get_replica_status
+from utils.statements import execute_cached
+from utils.queries import Query, row_type
+from utils.clock import now_ist
+from utils.api_error import raise_http_error
+from utils.scheduler import get_scheduler_state
+from utils.startup import startup_state, READY_MAX_PING_MS
+from pydantic_models.models import Admin_login_request, emp_login_request, User_querry_request
+
+router = APIRouter(tags=["public"])
+
+@router.get("/")
+async def root():
+    return "Server running"
+
+
+@router.get("/healthz")
+async def healthz():
+    """
+    Liveness: the worker's event loop is answering, no DB round trip
+    """
+    return {"status": "alive"}
+
+
+@router.get("/readyz")
+async def readyz():
+    """
+    Readiness for the load balancer: startup done with the pool warmed to POOL_MIN_WARM,
+    a DB ping under READY_MAX_PING_MS and the scheduler not stopped
+    """
+    checks = {
+        "startup": startup_state,
+        "scheduler": get_scheduler_state(),
+        "db_ping_ms": None,
+        # informational, reads fall back to the primary when no replica is healthy
+        "replicas": get_replica_status()
+    }
+
+    if startup_state["ready"]:
+        try:
+            checks["db_ping_ms"] = await asyncio.to_thread(ping_db)
+        except Exception as err:
+            checks["db_error"] = str(err)
+
+    ready = (
+        startup_state["ready"]
+        and checks["db_ping_ms"] is not None
+        and checks["db_ping_ms"] <= READY_MAX_PING_MS
+        and checks["scheduler"] != "stopped"
+    )
+
+    if not ready:
+        status_text = "failed" if startup_state["error"] else "not-ready"
+        return JSONResponse(status_code=503, content={"status": status_text, "detail": checks})
+    return {"status": "ready", "detail": checks}
+
+
+@router.post("/admin_login")
+async def admin_login(data: Admin_login_request):
+    try:
+        file_path = Path(__file__).parent / "credentials.txt"
+        with open(file_path, "r") as file:
+            credentials = file.readlines()
+
+        for line in credentials:
+            stored_id, stored_password = line.strip().split(":")
+
+        expire = datetime.now(timezone.utc) + timedelta(days=TOKEN_EXPIRE_DAYS)
+        
+        if data.username == stored_id and data.pwd == stored_password:
+            payload = {
+                "role": "admin",
+                "emp_id": "admin",
+                "exp": expire
+            }
+
+            token = create_access_token(payload)
+
+            return {
+                "status": "good",
+                "matches": "login-successfull",
+                "access_token": token,
+                "token_type": "bearer",
+                "role": "admin"
+            }
+
+        return {"status": "bad", "matches": "invalid-credentials"}
+
+    except FileNotFoundError:
+        raise_http_error("Credentials file not found")
+    except Exception as err:
+        raise_http_error("Cannot validate credentials", err)
+
+
+EMP_LOGIN_QUERY = "SELECT id, name FROM employees WHERE email = %s AND password = %s AND role = %s"
+
+
+@router.post("/emp_login")
+async def emp_login(data: emp_login_request):
+    if data.role not in ["manager", "field-manager", "home-teacher", "branch"]:
+        raise_http_error("Wrong role selected")
+
+    conn = get_db_connection()
+
+    try:
+        row = execute_cached(conn, EMP_LOGIN_QUERY, (data.email, data.pwd, data.role)).fetchone()
+        if not row:
+            return {"status": "bad", "matches": "Invalid credentials"}
+
+        emp_id, emp_name = row
+
+        expire = datetime.now(timezone.utc) + timedelta(days=TOKEN_EXPIRE_DAYS)
+
+        payload = {
+            "role": data.role,
+            "emp_id": emp_id,
+            "exp": expire
+        }
+
+        token = create_access_token(payload)
+
+        return {
+            "status": "good",
+            "matches": "login-successful",
+            "access_token": token,
+            "token_type": "bearer",
+            "emp_name": emp_name,
+            "role": data.role
+        }
+
+    except Exception as err:
+        raise_http_error("Cannot validate credentials", err)
+    finally:
+        conn.close()
+
+
+@router.post("/user_querry")
+async def get_user_querry(data: User_querry_request):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try: 
+        cursor.execute(
+            "INSERT INTO user_querry (name, email, phn, querry, created_at) VALUES (%s, %s, %s, %s, %s)",
+            (data.name, data.email, data.phn, data.querry, now_ist())
+        )
+        conn.commit()
+
+        return {"status": "good", "detail" : {"message": "querry noted"}}
+
+    except Exception as err:
+        raise_http_error("Cannot take questions right now", err)
+    finally:
+        conn.close()
+
+
+UserQuerry = row_type("UserQuerry", ["name", "email", "phn", "querry", "created_at"])
+USER_QUERRIES = Query(UserQuerry, "SELECT {columns} FROM user_querry")
+
+
+@router.get("/get_user_querries")
+async def get_user_querries():
+    conn = get_read_connection()
+    try:
+        data = USER_QUERRIES.all(conn)
+
+        if not data:
+            return {"status": "bad", "detail": {"message": "No querries yet"}}
+
+        return ORJSONResponse({"status": "good", "detail": {"message": "user querries fetched", "data": data}})
+
+    except Exception as err:
+        raise_http_error("cannot get user querries", err)
+    finally:
+        conn.close()
@@ -0,0 +1,10 @@
+import os
+import sys
+from pathlib import Path
+
+# run from server/: python -m pytest -q
+SERVER_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SERVER_DIR))
+
+# utils.auth reads it at import; none of these tests touch the database
+os.environ.setdefault("TOKEN_EXPIRE_DAYS", "1")
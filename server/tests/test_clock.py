@@ -0,0 +1,20 @@
+from datetime import date, datetime
+from utils.clock import day_range, month_range
+
+
+def test_day_range_is_half_open_over_inclusive_dates():
+    start, end = day_range(date(2025, 3, 1), date(2025, 3, 31))
+    assert start == datetime(2025, 3, 1)
+    assert end == datetime(2025, 4, 1)
+
+
+def test_day_range_single_day():
+    assert day_range(date(2025, 12, 31), date(2025, 12, 31)) == (datetime(2025, 12, 31), datetime(2026, 1, 1))
+
+
+def test_month_range_leap_february():
+    assert month_range(2024, 2) == (datetime(2024, 2, 1), datetime(2024, 3, 1))
+
+
+def test_month_range_december_rolls_over_the_year():
+    assert month_range(2025, 12) == (datetime(2025, 12, 1), datetime(2026, 1, 1))
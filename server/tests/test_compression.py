@@ -0,0 +1,51 @@
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import Response
+from starlette.routing import Route
+from starlette.testclient import TestClient
+from utils import compression
+from utils.compression import CompressionMiddleware
+
+BODY = b"x" * 4096
+
+
+def make_client():
+    def endpoint(media_type, body=BODY):
+        return lambda request: Response(body, media_type=media_type)
+
+    app = Starlette(routes=[
+        Route("/json", endpoint("application/json")),
+        Route("/text", endpoint("text/html")),
+        Route("/png", endpoint("image/png")),
+        Route("/pdf", endpoint("application/pdf")),
+        Route("/small", endpoint("application/json", b"{}")),
+    ])
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path", ["/json", "/text"])
+def test_compressible_types_are_gzipped(path):
+    response = make_client().get(path, headers={"accept-encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == BODY
+
+
+@pytest.mark.parametrize("path", ["/png", "/pdf"])
+def test_compressed_media_types_are_skipped(path):
+    response = make_client().get(path, headers={"accept-encoding": "gzip, br"})
+    assert "content-encoding" not in response.headers
+    assert response.content == BODY
+
+
+def test_small_responses_are_not_compressed():
+    response = make_client().get("/small", headers={"accept-encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+@pytest.mark.skipif(compression.brotli is None, reason="Brotli package not installed")
+def test_brotli_preferred_when_accepted():
+    response = make_client().get("/json", headers={"accept-encoding": "gzip, br"})
+    assert response.headers["content-encoding"] == "br"
+    # the test client decodes br itself when Brotli is installed
+    assert response.content == BODY
@@ -0,0 +1,71 @@
+import pytest
+from starlette.requests import Request
+from utils.data_version import check_etag, employees_scope, salary_slips_scope
+
+TOKEN = {"role": "manager", "emp_id": "M-1"}
+
+
+class VersionCursor:
+    def __init__(self, versions):
+        self.versions = versions
+
+    def execute(self, query, params=()):
+        self.scopes = params
+
+    def fetchall(self):
+        return [(scope, self.versions[scope]) for scope in self.scopes if scope in self.versions]
+
+
+def make_request(if_none_match=None, path="/get_all_employees", query=b""):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({
+        "type": "http", "method": "GET", "scheme": "http", "server": ("test", 80),
+        "root_path": "", "path": path, "query_string": query, "headers": headers
+    })
+
+
+def etag_for(versions, scope, token=TOKEN, **request):
+    etag, not_modified = check_etag(VersionCursor(versions), make_request(**request), token, (scope,))
+    assert not_modified is None
+    return etag
+
+
+def test_scopes():
+    assert employees_scope("M-1") == "employees:M-1"
+    assert salary_slips_scope("HT-1") == "salary_slips:HT-1"
+
+
+def test_matching_tag_returns_304():
+    scope = employees_scope("M-1")
+    etag = etag_for({scope: 3}, scope)
+    _, not_modified = check_etag(VersionCursor({scope: 3}), make_request(etag), TOKEN, (scope,))
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+
+
+@pytest.mark.parametrize("header", ['W/"other", {etag}', '{etag} , W/"other"', "*"])
+def test_tag_lists_and_wildcard_match(header):
+    scope = employees_scope("M-1")
+    etag = etag_for({scope: 3}, scope)
+    _, not_modified = check_etag(VersionCursor({scope: 3}), make_request(header.format(etag=etag)), TOKEN, (scope,))
+    assert not_modified is not None
+
+
+def test_version_bump_changes_the_tag():
+    scope = employees_scope("M-1")
+    etag = etag_for({scope: 3}, scope)
+    _, not_modified = check_etag(VersionCursor({scope: 4}), make_request(etag), TOKEN, (scope,))
+    assert not_modified is None
+
+
+def test_missing_scope_counts_as_version_zero():
+    scope = employees_scope("M-1")
+    assert etag_for({}, scope) == etag_for({scope: 0}, scope)
+
+
+def test_tag_depends_on_caller_and_url():
+    scope = employees_scope("M-1")
+    base = etag_for({scope: 1}, scope)
+    assert etag_for({scope: 1}, scope, token={"role": "manager", "emp_id": "M-2"}) != base
+    assert etag_for({scope: 1}, scope, query=b"page=2") != base
+    assert etag_for({scope: 1}, scope, path="/get_emp_details/M-1") != base
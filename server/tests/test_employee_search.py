@@ -0,0 +1,135 @@
+import re
+import pytest
+from utils.employee_search import (
+    search_employees, _like_prefix, EmployeeMatch, PREFIX_COLUMNS,
+    PREFIX_SEARCH, SUBTREE_PREFIX_SEARCH, FULLTEXT_SEARCH, SUBTREE_FULLTEXT_SEARCH
+)
+
+
+class RecordingCursor:
+    def __init__(self, executed):
+        self.executed = executed
+
+    def execute(self, query, params=()):
+        self.executed.append((query, params))
+
+    def fetchall(self):
+        return []
+
+
+class RecordingConnection:
+    """Stands in for a one-off connection: no statement cache, nothing is sent anywhere"""
+
+    def __init__(self):
+        self.executed = []
+
+    def cursor(self, dictionary=False):
+        return RecordingCursor(self.executed)
+
+
+class PrefixUnionCursor:
+    """Evaluates the prefix UNION query over in-memory rows, branch by branch as MySQL would"""
+
+    BRANCH = re.compile(r"WHERE e\.(\w+) LIKE %s ORDER BY ([\w., ]+?) LIMIT %s\)")
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def execute(self, query, params=()):
+        branches = self.BRANCH.findall(query)
+        matches = set()
+        for index, (column, order_by) in enumerate(branches):
+            pattern, branch_limit = params[2 * index:2 * index + 2]
+            keys = [key.strip().removeprefix("e.") for key in order_by.split(",")]
+            # case-insensitive, like the table's collation
+            hits = [row for row in self.rows if row[column].lower().startswith(pattern[:-1].lower())]
+            hits.sort(key=lambda row: [row[key] for key in keys])
+            matches.update(row["id"] for row in hits[:branch_limit])
+
+        limit, offset = params[-2:]
+        page = sorted((row for row in self.rows if row["id"] in matches), key=lambda row: (row["name"], row["id"]))
+        self.result = [tuple(row.values()) for row in page[offset:offset + limit]]
+
+    def fetchall(self):
+        return self.result
+
+
+class PrefixUnionConnection:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def cursor(self, dictionary=False):
+        return PrefixUnionCursor(self.rows)
+
+
+def employee(id, name, city="Patna", district="Patna"):
+    return {
+        "id": id, "name": name, "email": f"{id.lower()}@example.com", "phn": "9000000000", "role": "home-teacher",
+        "city": city, "district": district, "manager_id": "M-1"
+    }
+
+
+def run_search(role, q, limit=20, offset=0):
+    conn = RecordingConnection()
+    search_employees(conn, role, "M-1", q, limit, offset)
+    assert len(conn.executed) == 1
+    return conn.executed[0]
+
+
+@pytest.mark.parametrize("term, pattern", [
+    ("ram", "ram%"),
+    ("50%", "50\\%%"),
+    ("a_b", "a\\_b%"),
+    ("c:\\x", "c:\\\\x%"),
+])
+def test_like_prefix_escapes_wildcards(term, pattern):
+    assert _like_prefix(term) == pattern
+
+
+def test_single_word_is_a_prefix_search_per_column():
+    query, params = run_search("admin", "ram", limit=20, offset=40)
+    assert query == PREFIX_SEARCH.sql
+    # each branch stops after offset + limit rows, the outer query pages
+    assert params == ("ram%", 60) * len(PREFIX_COLUMNS) + (20, 40)
+
+
+def test_single_word_below_admin_is_scoped_to_the_subtree():
+    query, params = run_search("manager", "ram")
+    assert query == SUBTREE_PREFIX_SEARCH.sql
+    assert params == ("M-1", "ram%", 20) * len(PREFIX_COLUMNS) + (20, 0)
+
+
+def test_several_words_use_fulltext_with_every_word_required():
+    query, params = run_search("branch", "ram kumar")
+    assert query == FULLTEXT_SEARCH.sql
+    assert params == ("+ram* +kumar*", "+ram* +kumar*", 20, 0)
+
+
+def test_boolean_operators_and_short_words_are_dropped():
+    query, params = run_search("field-manager", '+ram -"ku" (patna)')
+    assert query == SUBTREE_FULLTEXT_SEARCH.sql
+    assert params == ("M-1", "+ram* +patna*", "+ram* +patna*", 20, 0)
+
+
+def test_only_short_words_fall_back_to_prefix_on_the_first():
+    query, params = run_search("admin", "ra ku")
+    assert query == PREFIX_SEARCH.sql
+    assert params[0] == "ra%"
+
+
+def test_paging_covers_every_match_exactly_once():
+    # "ra" matches by id, name and city; ids sort in the opposite order of names,
+    # so a branch cut in its own column order would skip names on later pages
+    rows = [employee(f"RA{99 - i:02}", f"Amit {i:02}") for i in range(12)]
+    rows += [employee(f"HT{i:02}", f"Ravi {i:02}") for i in range(12)]
+    rows += [employee(f"HT{50 + i:02}", f"Bina {i:02}", city="Rampur") for i in range(12)]
+    expected = sorted((row["name"], row["id"]) for row in rows)
+
+    conn = PrefixUnionConnection(rows)
+    seen = []
+    for offset in range(0, len(rows) + 5, 5):
+        page = search_employees(conn, "admin", "admin", "ra", 5, offset)
+        assert all(isinstance(match, EmployeeMatch) for match in page)
+        seen.extend((match.name, match.id) for match in page)
+
+    assert seen == expected
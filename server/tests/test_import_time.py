@@ -0,0 +1,41 @@
+import json
+import os
+import subprocess
+import sys
+from conftest import SERVER_DIR
+
+# generous for CI machines; 'import main' takes about 0.5s locally, most of it fastapi
+IMPORT_TIME_BUDGET_SECONDS = float(os.getenv("IMPORT_TIME_BUDGET_SECONDS", 1.5))
+
+# loaded on first use, not with the app (see the lazy imports in utils and routers)
+LAZY_MODULES = ("mysql.connector", "apscheduler", "jose", "pytz")
+
+PROBE = f"""
+import json, sys, time
+started = time.perf_counter()
+import main
+elapsed = time.perf_counter() - started
+print(json.dumps([elapsed, [name for name in {LAZY_MODULES!r} if name in sys.modules]]))
+"""
+
+
+def import_main():
+    env = {**os.environ, "TOKEN_EXPIRE_DAYS": "1"}
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", PROBE],
+        cwd=SERVER_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    # last line, after anything the app prints while importing
+    elapsed, eager = json.loads(result.stdout.strip().splitlines()[-1])
+    return elapsed, eager
+
+
+def test_import_main_within_budget():
+    # best of three fresh interpreters, the first one also pays for a cold disk cache
+    elapsed = min(import_main()[0] for _ in range(3))
+    assert elapsed < IMPORT_TIME_BUDGET_SECONDS, f"import main took {elapsed:.2f}s"
+
+
+def test_heavy_dependencies_stay_lazy():
+    _, eager = import_main()
+    assert eager == []
@@ -0,0 +1,131 @@
+from datetime import datetime
+import orjson
+import pytest
+from utils import outbox
+
+NOW = datetime(2025, 3, 1, 10, 0)
+
+
+class OutboxCursor:
+    """Just enough of the outbox table for dispatch_outbox and requeue_dead_letters"""
+
+    def __init__(self, events):
+        self.events = events
+        self.rowcount = 0
+
+    def execute(self, query, params=()):
+        query = " ".join(query.split())
+        if query.startswith("SELECT id, event_type, payload, attempts FROM outbox"):
+            now, limit = params
+            self.result = [
+                (event["id"], event["event_type"], event["payload"], event["attempts"])
+                for event in self.events
+                if event["processed_at"] is None and event["dead_lettered_at"] is None
+                and event["next_attempt_at"] <= now
+            ][:limit]
+        elif query.startswith("UPDATE outbox SET processed_at"):
+            self.find(params[1])["processed_at"] = params[0]
+        elif query.startswith("UPDATE outbox SET attempts = attempts + 1"):
+            next_attempt_at, last_error, dead_lettered_at, event_id = params
+            event = self.find(event_id)
+            event.update(
+                attempts=event["attempts"] + 1, next_attempt_at=next_attempt_at,
+                last_error=last_error, dead_lettered_at=dead_lettered_at
+            )
+        elif query.startswith("UPDATE outbox SET attempts = 0"):
+            requeued = [
+                event for event in self.events
+                if event["processed_at"] is None and event["dead_lettered_at"] is not None
+                and (len(params) == 1 or event["id"] in params[1:])
+            ]
+            for event in requeued:
+                event.update(attempts=0, next_attempt_at=params[0], dead_lettered_at=None)
+            self.rowcount = len(requeued)
+
+    def find(self, event_id):
+        return next(event for event in self.events if event["id"] == event_id)
+
+    def fetchall(self):
+        return self.result
+
+
+class OutboxConnection:
+    def __init__(self, events):
+        self.events = events
+
+    def cursor(self):
+        return OutboxCursor(self.events)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def make_event(event_id, attempts=0):
+    return {
+        "id": event_id, "event_type": "funds_added", "payload": orjson.dumps({"amount": 100}),
+        "attempts": attempts, "next_attempt_at": NOW, "processed_at": None, "dead_lettered_at": None,
+        "last_error": None
+    }
+
+
+@pytest.fixture
+def events(monkeypatch):
+    events = []
+    monkeypatch.setattr(outbox, "get_db_connection", lambda: OutboxConnection(events))
+    monkeypatch.setattr(outbox, "now_ist", lambda: NOW)
+    monkeypatch.setattr(outbox, "_handlers", {})
+    return events
+
+
+def failing_handler(cursor, payload):
+    raise RuntimeError("ledger unavailable")
+
+
+def test_failed_event_is_retried_with_backoff(events):
+    outbox.register_handler("funds_added", failing_handler)
+    events.append(make_event(1, attempts=2))
+
+    assert outbox.dispatch_outbox() == 0
+    assert events[0]["attempts"] == 3
+    assert events[0]["next_attempt_at"] > NOW
+    assert events[0]["dead_lettered_at"] is None
+
+
+def test_exhausted_event_is_dead_lettered_and_no_longer_claimed(events, monkeypatch):
+    outbox.register_handler("funds_added", failing_handler)
+    events.append(make_event(1, attempts=outbox.OUTBOX_MAX_ATTEMPTS - 1))
+
+    outbox.dispatch_outbox()
+    assert events[0]["dead_lettered_at"] == NOW
+    assert events[0]["last_error"] == "ledger unavailable"
+
+    # even once its backoff has passed
+    events[0]["next_attempt_at"] = NOW
+    monkeypatch.setattr(outbox, "_handlers", {})
+    assert outbox.dispatch_outbox() == 0
+    assert events[0]["processed_at"] is None
+
+
+def test_requeued_dead_letter_is_applied(events, monkeypatch):
+    applied = []
+    outbox.register_handler("funds_added", failing_handler)
+    last_try = outbox.OUTBOX_MAX_ATTEMPTS - 1
+    events.extend([make_event(1, attempts=last_try), make_event(2, attempts=last_try)])
+    outbox.dispatch_outbox()
+
+    monkeypatch.setattr(outbox, "_handlers", {})
+    outbox.register_handler("funds_added", lambda cursor, payload: applied.append(payload))
+    assert outbox.requeue_dead_letters([2]) == 1
+    assert events[1]["attempts"] == 0 and events[1]["dead_lettered_at"] is None
+
+    assert outbox.dispatch_outbox() == 1
+    assert applied == [{"amount": 100}]
+    assert events[1]["processed_at"] == NOW
+    # the other one stays dead-lettered until it is requeued too
+    assert events[0]["dead_lettered_at"] == NOW
@@ -0,0 +1,52 @@
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+from utils import replicas
+from utils.replicas import ReadYourWritesMiddleware, WRITE_HEADER, mark_write, session_wrote_recently
+
+
+def write(request):
+    mark_write()
+    return JSONResponse({})
+
+
+def read(request):
+    return JSONResponse({"primary": session_wrote_recently()})
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # the middleware only tracks writes when replicas are configured
+    monkeypatch.setattr(replicas, "replicas", [object()])
+    monkeypatch.setattr(replicas, "_last_writes", {})
+    app = Starlette(routes=[Route("/write", write, methods=["POST"]), Route("/read", read)])
+    app.add_middleware(ReadYourWritesMiddleware)
+    return TestClient(app)
+
+
+def test_write_returns_the_marker_header(client):
+    response = client.post("/write")
+    assert float(response.headers[WRITE_HEADER]) > 0
+    assert "set-cookie" not in response.headers
+
+
+def test_echoed_marker_keeps_reads_on_the_primary(client, monkeypatch):
+    wrote_at = client.post("/write").headers[WRITE_HEADER]
+    # as if another worker took the read: nothing remembered locally, no bearer token
+    monkeypatch.setattr(replicas, "_last_writes", {})
+    assert client.get("/read", headers={WRITE_HEADER: wrote_at}).json() == {"primary": True}
+    assert client.get("/read").json() == {"primary": False}
+
+
+def test_same_worker_remembers_the_bearer_token(client):
+    auth = {"Authorization": "Bearer abc"}
+    client.post("/write", headers=auth)
+    assert client.get("/read", headers=auth).json() == {"primary": True}
+
+
+def test_reads_without_writes_have_no_marker(client):
+    response = client.get("/read", headers={WRITE_HEADER: "not a time"})
+    assert response.json() == {"primary": False}
+    assert WRITE_HEADER not in response.headers
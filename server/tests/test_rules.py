@@ -0,0 +1,65 @@
+from datetime import date
+import pytest
+import utils.rules as rules
+from utils.rules import CompensationRule, RuleSet
+
+OLD = CompensationRule("home-teacher", "", date(2020, 1, 1), 4950, 50, 150, 1000, 50, 0)
+NEW = CompensationRule("home-teacher", "", date(2025, 4, 1), 5200, 60, 160, 1100, 50, 0)
+REGIONAL = CompensationRule("home-teacher", "Bihar", date(2024, 1, 1), 4500, 40, 120, 900, 50, 0)
+
+
+@pytest.fixture
+def rule_set():
+    return RuleSet([NEW, REGIONAL, OLD], version=3)
+
+
+def test_picks_latest_rule_in_effect(rule_set):
+    assert rule_set.get("home-teacher", on=date(2025, 3, 31)) is OLD
+    assert rule_set.get("home-teacher", on=date(2025, 4, 1)) is NEW
+
+
+def test_regional_rule_wins_over_default(rule_set):
+    assert rule_set.get("home-teacher", "Bihar", date(2025, 6, 1)) is REGIONAL
+
+
+def test_region_falls_back_to_default(rule_set):
+    # before the regional rule starts, and for regions without their own rule
+    assert rule_set.get("home-teacher", "Bihar", date(2023, 6, 1)) is OLD
+    assert rule_set.get("home-teacher", "Goa", date(2025, 6, 1)) is NEW
+
+
+def test_no_rule_in_effect_raises(rule_set):
+    with pytest.raises(ValueError):
+        rule_set.get("home-teacher", on=date(2019, 12, 31))
+    with pytest.raises(ValueError):
+        rule_set.get("field-manager", on=date(2025, 1, 1))
+
+
+def test_defaults_to_today_in_ist(rule_set, monkeypatch):
+    monkeypatch.setattr(rules, "today_ist", lambda: date(2025, 3, 31))
+    assert rule_set.get("home-teacher") is OLD
+
+
+def test_net_salary():
+    assert NEW.net_salary == 1100 + 50 - 0
+
+
+class FailingCursor:
+    def execute(self, query, params=()):
+        raise RuntimeError("database unavailable")
+
+
+class FailingConnection:
+    def cursor(self):
+        return FailingCursor()
+
+    def close(self):
+        pass
+
+
+def test_load_failure_is_raised_and_keeps_the_current_rules(monkeypatch):
+    current = rules._rule_set
+    monkeypatch.setattr(rules, "get_db_connection", FailingConnection)
+    with pytest.raises(RuntimeError):
+        rules.load_rules()
+    assert rules._rule_set is current
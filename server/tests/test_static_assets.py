@@ -0,0 +1,33 @@
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+from utils.static_assets import PrecompressedStaticFiles, IMMUTABLE_CACHE, REVALIDATE_CACHE
+
+FILES = [
+    "index.html",
+    "assets/images/logo.png",
+    "assets/js/app.5d41402a.js",
+    "assets/css/site-3f9a1c2e7b.min.css",
+    "Dashboard/js/admin-dashboard.js",
+]
+
+
+@pytest.fixture
+def client(tmp_path):
+    for name in FILES:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x")
+    app = Starlette(routes=[Mount("/", PrecompressedStaticFiles(directory=tmp_path))])
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path", ["assets/js/app.5d41402a.js", "assets/css/site-3f9a1c2e7b.min.css"])
+def test_fingerprinted_files_are_immutable(client, path):
+    assert client.get(f"/{path}").headers["cache-control"] == IMMUTABLE_CACHE
+
+
+@pytest.mark.parametrize("path", ["index.html", "assets/images/logo.png", "Dashboard/js/admin-dashboard.js"])
+def test_other_files_revalidate(client, path):
+    assert client.get(f"/{path}").headers["cache-control"] == REVALIDATE_CACHE
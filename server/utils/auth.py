@@ -0,0 +1,60 @@
+import os
+from dotenv import load_dotenv
+from fastapi import HTTPException, status, Security
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+
+load_dotenv()
+
+SECRET_KEY = os.getenv("JWT_SECRET")
+ALGORITHM = os.getenv("ALGORITHM")
+TOKEN_EXPIRE_DAYS = int(os.getenv("TOKEN_EXPIRE_DAYS"))
+
+#=================LOGIN FUNCTIONS========================
+
+security = HTTPBearer()
+
+def create_access_token(payload: dict) -> str:
+    # python-jose is only imported once the first token is issued or checked
+    from jose import jwt
+    return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
+
+
+async def get_login_role(credentials: HTTPAuthorizationCredentials = Security(security)):
+    from jose import jwt, JWTError, ExpiredSignatureError
+
+    token = credentials.credentials
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        role = payload.get("role")
+        print(f"role: {role}")
+
+        if role not in ["admin", "manager", "field-manager", "home-teacher", "branch"]:
+            print("except")
+            raise HTTPException(
+                
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You do not have enough permissions"
+            )
+        return payload
+
+    except ExpiredSignatureError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has expired"
+        )
+    except JWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials"
+        )
+#=========================================================
+
+#==================ALLOWED HIREARCHIES===================
+allowed_hierarchy = {
+    "admin": ["manager", "field-manager", "home-teacher"],
+    "manager": ["field-manager"],
+    "field-manager": ["home-teacher"],
+    "home-teacher": []
+}
+
+#=========================================================
@@ -0,0 +1,52 @@
+import os
+import threading
+from collections import OrderedDict
+from utils.hierarchy import get_ancestor_ids
+
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", 10000))
+
+# emp_id -> frozenset of ancestor ids, least recently used first
+_ancestor_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+def get_ancestors(cursor, emp_id: str) -> frozenset:
+    """
+    Ancestors of emp_id from the LRU cache, falling back to the closure table
+    on the caller's cursor so no extra connection is opened.
+    """
+    with _cache_lock:
+        ancestors = _ancestor_cache.get(emp_id)
+        if ancestors is not None:
+            _ancestor_cache.move_to_end(emp_id)
+            return ancestors
+
+    ancestors = frozenset(get_ancestor_ids(cursor, emp_id))
+
+    # unknown or top level ids are not cached, the employee may be created later
+    if ancestors:
+        with _cache_lock:
+            _ancestor_cache[emp_id] = ancestors
+            _ancestor_cache.move_to_end(emp_id)
+            while len(_ancestor_cache) > AUTH_CACHE_SIZE:
+                _ancestor_cache.popitem(last=False)
+
+    return ancestors
+
+
+def can_view_employee(cursor, role: str, principal_id: str, target_id: str) -> bool:
+    """Admin and branch see everyone, everyone else sees themselves and their subtree"""
+    if role in ["admin", "branch"]:
+        return True
+    if principal_id == target_id:
+        return True
+    return principal_id in get_ancestors(cursor, target_id)
+
+
+def invalidate_employee(emp_id: str):
+    with _cache_lock:
+        _ancestor_cache.pop(emp_id, None)
+
+
+def clear_authorization_cache():
+    with _cache_lock:
+        _ancestor_cache.clear()
@@ -0,0 +1,47 @@
+import argparse
+import calendar
+import timeit
+from datetime import date, datetime, time, timedelta, timezone
+
+# India has no DST, so a fixed offset is exact and the zone is built once at import
+IST = timezone(timedelta(hours=5, minutes=30), "IST")
+
+def now_ist() -> datetime:
+    """
+    Current IST wall time as a naive datetime, the way our DATETIME columns store it.
+    Passed straight to the driver instead of a formatted string.
+    """
+    return datetime.now(IST).replace(tzinfo=None, microsecond=0)
+
+
+def today_ist() -> date:
+    return datetime.now(IST).date()
+
+
+def day_range(start_date: date, end_date: date) -> tuple:
+    """
+    Half open [start 00:00, day after end 00:00) bounds for an inclusive IST date range.
+    Compare the raw column against these (col >= %s AND col < %s) so MySQL can
+    range scan its index instead of evaluating DATE(col) on every row.
+    """
+    return datetime.combine(start_date, time.min), datetime.combine(end_date + timedelta(days=1), time.min)
+
+
+def month_range(year: int, month: int) -> tuple:
+    """day_range of a whole calendar month"""
+    return day_range(date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1]))
+
+
+if __name__ == "__main__":
+    # python -m utils.clock [--number 100000]
+    parser = argparse.ArgumentParser(description="Benchmark the IST clock helpers")
+    parser.add_argument("--number", type=int, default=100000)
+    args = parser.parse_args()
+
+    def old_helper():
+        import pytz
+        return datetime.now(pytz.timezone("Asia/Kolkata")).strftime("%Y-%m-%d %H:%M:%S")
+
+    for name, func in (("pytz + strftime", old_helper), ("now_ist", now_ist)):
+        seconds = timeit.timeit(func, number=args.number)
+        print(f"{name:<16} {seconds / args.number * 1e6:.2f} us/call")
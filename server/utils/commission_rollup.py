@@ -0,0 +1,231 @@
+import argparse
+from datetime import datetime
+from utils.clock import now_ist
+from utils.db_config import get_db_connection
+from utils.statements import execute_cached
+
+# commisions column holding each earner's share, keyed by earner role
+EARNER_COLUMNS = {
+    "manager": ("manager_id", "manager_commision"),
+    "field-manager": ("field_manager_id", "field_manager_commision"),
+}
+
+def record_commission(cursor, earner_id: str, earner_role: str, created_role: str, amount: int, registered_at: datetime):
+    """
+    Add one commission to the earner's monthly rollup row and running balance.
+    Runs on the caller's cursor so it commits with the commisions insert.
+    """
+    cursor.execute(
+        """
+        INSERT INTO commission_balance (employee_id, total_commission, updated_at)
+        VALUES (%s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            total_commission = total_commission + VALUES(total_commission),
+            updated_at = VALUES(updated_at)
+        """,
+        (earner_id, amount, registered_at)
+    )
+    cursor.execute(
+        """
+        INSERT INTO commission_monthly_rollup
+            (earner_id, role, year, month, total_commission,
+             field_managers_recruited, home_teachers_recruited, total_registrations)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, 1)
+        ON DUPLICATE KEY UPDATE
+            total_commission = total_commission + VALUES(total_commission),
+            field_managers_recruited = field_managers_recruited + VALUES(field_managers_recruited),
+            home_teachers_recruited = home_teachers_recruited + VALUES(home_teachers_recruited),
+            total_registrations = total_registrations + 1
+        """,
+        (
+            earner_id, earner_role, registered_at.year, registered_at.month, amount,
+            int(created_role == "field-manager"), int(created_role == "home-teacher")
+        )
+    )
+
+
+def get_commission_summary(cursor, where_clause, params):
+    """
+    Totals and recruit counts for the commisions rows matching where_clause,
+    computed by the database in a single aggregate
+    """
+    cursor.execute(f"""
+        SELECT 
+            COALESCE(SUM(c.manager_commision), 0) as total_manager_commission,
+            COALESCE(SUM(c.field_manager_commision), 0) as total_field_manager_commission,
+            COALESCE(SUM(c.created_role = 'field-manager'), 0) as field_managers_recruited,
+            COALESCE(SUM(c.created_role = 'home-teacher'), 0) as home_teachers_recruited,
+            COUNT(*) as total_registrations
+        FROM commisions c
+        {where_clause}
+    """, tuple(params))
+
+    # SUM() comes back as Decimal
+    return {key: int(value) for key, value in cursor.fetchone().items()}
+
+
+def get_commission_balance(cursor, employee_id: str) -> int:
+    cursor.execute(
+        "SELECT total_commission FROM commission_balance WHERE employee_id = %s",
+        (employee_id,)
+    )
+    row = cursor.fetchone()
+    if not row:
+        return 0
+    return row["total_commission"] if isinstance(row, dict) else row[0]
+
+
+MONTHLY_ROLLUP_QUERY = """
+    SELECT total_commission, field_managers_recruited, home_teachers_recruited, total_registrations
+    FROM commission_monthly_rollup
+    WHERE earner_id = %s AND role = %s AND year = %s AND month = %s
+"""
+
+YEARLY_ROLLUP_QUERY = """
+    SELECT month, total_commission, field_managers_recruited, home_teachers_recruited, total_registrations
+    FROM commission_monthly_rollup
+    WHERE earner_id = %s AND role = %s AND year = %s
+    ORDER BY month
+"""
+
+def get_monthly_rollup(conn, earner_id: str, earner_role: str, year: int, month: int) -> dict:
+    cursor = execute_cached(conn, MONTHLY_ROLLUP_QUERY, (earner_id, earner_role, year, month), dictionary=True)
+    row = cursor.fetchone()
+    if not row:
+        return {
+            "total_commission": 0,
+            "field_managers_recruited": 0,
+            "home_teachers_recruited": 0,
+            "total_registrations": 0
+        }
+    return row
+
+
+def get_yearly_rollup(conn, earner_id: str, earner_role: str, year: int) -> list:
+    return execute_cached(conn, YEARLY_ROLLUP_QUERY, (earner_id, earner_role, year), dictionary=True).fetchall()
+
+
+def rebuild_commission_rollup():
+    """
+    Recompute commission_monthly_rollup from the commisions ledger, archived partitions included.
+    Used for the initial backfill and to repair drift.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        print("[INFO]: REBUILDING COMMISSION MONTHLY ROLLUP")
+        cursor.execute("DELETE FROM commission_monthly_rollup")
+
+        for earner_role, (id_column, amount_column) in EARNER_COLUMNS.items():
+            cursor.execute(f"""
+                INSERT INTO commission_monthly_rollup
+                    (earner_id, role, year, month, total_commission,
+                     field_managers_recruited, home_teachers_recruited, total_registrations)
+                SELECT 
+                    {id_column},
+                    %s,
+                    YEAR(registered_at),
+                    MONTH(registered_at),
+                    COALESCE(SUM({amount_column}), 0),
+                    SUM(created_role = 'field-manager'),
+                    SUM(created_role = 'home-teacher'),
+                    COUNT(*)
+                FROM commisions_ledger
+                WHERE {id_column} IS NOT NULL
+                GROUP BY {id_column}, YEAR(registered_at), MONTH(registered_at)
+            """, (earner_role,))
+
+        conn.commit()
+        print("[INFO]: COMMISSION MONTHLY ROLLUP REBUILT")
+
+    except Exception as err:
+        conn.rollback()
+        print("[INFO]: CANNOT REBUILD COMMISSION MONTHLY ROLLUP")
+        print(err)
+        raise
+    finally:
+        conn.close()
+
+
+def ledger_balances_query() -> str:
+    """Lifetime commission per earner, summed from the commisions ledger"""
+    parts = [
+        f"""
+        SELECT {id_column} as employee_id, COALESCE(SUM({amount_column}), 0) as total_commission
+        FROM commisions_ledger
+        WHERE {id_column} IS NOT NULL
+        GROUP BY {id_column}
+        """
+        for id_column, amount_column in EARNER_COLUMNS.values()
+    ]
+    return " UNION ALL ".join(parts)
+
+
+def audit_commission_balances(fix: bool = False) -> list:
+    """
+    Compare commission_balance against the commisions ledger.
+    Returns the mismatched rows; with fix=True the balances are reset to the ledger values.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    try:
+        print("[INFO]: AUDITING COMMISSION BALANCES")
+        cursor.execute(f"""
+            SELECT 
+                l.employee_id,
+                l.total_commission as ledger_total,
+                COALESCE(b.total_commission, 0) as balance_total
+            FROM ({ledger_balances_query()}) l
+            LEFT JOIN commission_balance b ON b.employee_id = l.employee_id
+            WHERE COALESCE(b.total_commission, 0) <> l.total_commission
+            UNION ALL
+            SELECT b.employee_id, 0, b.total_commission
+            FROM commission_balance b
+            LEFT JOIN ({ledger_balances_query()}) l ON l.employee_id = b.employee_id
+            WHERE l.employee_id IS NULL AND b.total_commission <> 0
+        """)
+        mismatches = cursor.fetchall()
+
+        for row in mismatches:
+            print(f"[INFO]: {row['employee_id']}: ledger {row['ledger_total']} != balance {row['balance_total']}")
+
+        if fix and mismatches:
+            fixed_at = now_ist()
+            cursor.executemany(
+                """
+                INSERT INTO commission_balance (employee_id, total_commission, updated_at)
+                VALUES (%s, %s, %s)
+                ON DUPLICATE KEY UPDATE total_commission = VALUES(total_commission), updated_at = VALUES(updated_at)
+                """,
+                [(row["employee_id"], int(row["ledger_total"]), fixed_at) for row in mismatches]
+            )
+            conn.commit()
+            print(f"[INFO]: {len(mismatches)} COMMISSION BALANCES FIXED")
+        else:
+            print(f"[INFO]: {len(mismatches)} COMMISSION BALANCE MISMATCHES")
+
+        return mismatches
+
+    except Exception as err:
+        conn.rollback()
+        print("[INFO]: CANNOT AUDIT COMMISSION BALANCES")
+        print(err)
+        raise
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    # python -m utils.commission_rollup rebuild
+    # python -m utils.commission_rollup audit [--fix]
+    parser = argparse.ArgumentParser(description="Commission rollup maintenance")
+    parser.add_argument("command", choices=["rebuild", "audit"])
+    parser.add_argument("--fix", action="store_true", help="reset mismatched balances to the ledger values")
+    args = parser.parse_args()
+
+    if args.command == "rebuild":
+        rebuild_commission_rollup()
+    else:
+        audit_commission_balances(fix=args.fix)
@@ -0,0 +1,114 @@
+import hashlib
+from fastapi import Request, Response
+
+# version scopes: writers bump them, read endpoints fold them into their ETag.
+# EMPLOYEES covers the admin and branch wide views, employees_scope and
+# salary_slips_scope one employee's subtree and slips.
+EMPLOYEES = "employees"
+SALARY_SLIPS = "salary_slips"
+RULES = "rules"
+
+def employees_scope(emp_id: str) -> str:
+    """Bumped when anything in emp_id's subtree, emp_id included, changes"""
+    return f"{EMPLOYEES}:{emp_id}"
+
+
+def salary_slips_scope(emp_id: str) -> str:
+    return f"{SALARY_SLIPS}:{emp_id}"
+
+
+def bump_data_version(conn, *scopes: str):
+    """
+    Bump scopes in their own short transaction. Writers call it after their commit, so the
+    business transaction never queues on these rows. A reader in between caches the new data
+    under the old tag, and the bump makes its next request refetch.
+    A failed bump is logged, not raised: the write itself is already committed.
+    """
+    cursor = conn.cursor()
+    try:
+        # sorted so concurrent bumps lock rows in the same order
+        cursor.executemany(
+            """
+            INSERT INTO data_version (scope, version) VALUES (%s, 1)
+            ON DUPLICATE KEY UPDATE version = version + 1
+            """,
+            [(scope,) for scope in sorted(set(scopes))]
+        )
+        conn.commit()
+    except Exception as err:
+        conn.rollback()
+        print("[INFO]: CANNOT BUMP DATA VERSION")
+        print(err)
+
+
+def bump_employee_versions(conn, *emp_ids: str):
+    """After a write to emp_ids: the admin and branch views and the subtree of every ancestor"""
+    placeholders = ", ".join(["%s"] * len(emp_ids))
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            f"""
+            SELECT DISTINCT ancestor_id FROM employee_hierarchy
+            WHERE descendant_id IN ({placeholders})
+            """,
+            emp_ids
+        )
+        ancestors = [row[0] for row in cursor.fetchall()]
+    except Exception as err:
+        print("[INFO]: CANNOT BUMP DATA VERSION")
+        print(err)
+        ancestors = list(emp_ids)
+
+    bump_data_version(conn, EMPLOYEES, *(employees_scope(emp_id) for emp_id in {*ancestors, *emp_ids}))
+
+
+def bump_all_employee_versions(conn):
+    """After a rebuild that can move employees between subtrees"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            "UPDATE data_version SET version = version + 1 WHERE scope = %s OR scope LIKE %s",
+            (EMPLOYEES, f"{EMPLOYEES}:%")
+        )
+        conn.commit()
+    except Exception as err:
+        conn.rollback()
+        print("[INFO]: CANNOT BUMP DATA VERSION")
+        print(err)
+
+
+def get_data_versions(cursor, *scopes: str) -> tuple:
+    placeholders = ", ".join(["%s"] * len(scopes))
+    cursor.execute(f"SELECT scope, version FROM data_version WHERE scope IN ({placeholders})", scopes)
+
+    versions = {}
+    for row in cursor.fetchall():
+        if isinstance(row, dict):
+            versions[row["scope"]] = row["version"]
+        else:
+            versions[row[0]] = row[1]
+    return tuple(versions.get(scope, 0) for scope in scopes)
+
+
+def cache_headers(etag: str) -> dict:
+    # private: responses depend on the caller; no-cache: always revalidate
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def check_etag(cursor, request: Request, token_data: dict, scopes: tuple, *extra):
+    """
+    ETag from the request, the caller and the version counters of scopes, no body hashing.
+    Returns (etag, response); response is a 304 to return as is when If-None-Match matches,
+    so the endpoint's real queries never run.
+    A write landing between this lookup and the queries only makes the next request refetch.
+    """
+    versions = get_data_versions(cursor, *scopes)
+    key = "|".join(str(part) for part in (
+        request.url.path, request.url.query, token_data.get("role"), token_data.get("emp_id"), *versions, *extra
+    ))
+    etag = f'W/"{hashlib.blake2b(key.encode(), digest_size=12).hexdigest()}"'
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return etag, Response(status_code=304, headers=cache_headers(etag))
+    return etag, None
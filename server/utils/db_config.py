@@ -1,6 +1,7 @@
-from mysql.connector import connect
 from dotenv import load_dotenv
 import os
+import threading
+import time
 
 load_dotenv()
 
@@ -8,18 +9,183 @@ HOST = os.getenv("HOST")
 USER = os.getenv("USER")
 PWD = os.getenv("PWD")
 DATABASE = os.getenv("DATABASE")
+POOL_SIZE = int(os.getenv("POOL_SIZE", 10))
+POOL_MIN_WARM = int(os.getenv("POOL_MIN_WARM", POOL_SIZE))
+# prepared statements kept per pooled connection, 0 turns the cache off (see utils.statements)
+STATEMENT_CACHE_SIZE = int(os.getenv("STATEMENT_CACHE_SIZE", 64))
 
 database_exists = False
 
+connection_pool = None
+_pool_lock = threading.Lock()
+
+def connect(**kwargs):
+    # mysql.connector is imported on first use, not when the app module loads
+    from mysql.connector import connect as mysql_connect
+    return mysql_connect(**kwargs)
+
+def create_pool(pool_name: str, pool_size: int, **kwargs):
+    """
+    Connection pool for the primary or a replica. With the statement cache on, returned
+    connections are rolled back instead of reset: COM_RESET_CONNECTION would also
+    deallocate the session's prepared statements.
+    """
+    from mysql.connector.pooling import MySQLConnectionPool, PooledMySQLConnection
+
+    if STATEMENT_CACHE_SIZE <= 0:
+        return MySQLConnectionPool(pool_name=pool_name, pool_size=pool_size, pool_reset_session=True, **kwargs)
+
+    class RollbackPooledConnection(PooledMySQLConnection):
+        def close(self):
+            cnx = self._cnx
+            try:
+                # ends whatever transaction the handler left open, unread rows included
+                cnx.rollback()
+            except Exception:
+                # a broken connection is reconnected when it is next checked out
+                pass
+            finally:
+                self._cnx_pool.add_connection(cnx)
+                self._cnx = None
+
+    class RollbackConnectionPool(MySQLConnectionPool):
+        def get_connection(self):
+            pooled = super().get_connection()
+            pooled.__class__ = RollbackPooledConnection
+            return pooled
+
+    return RollbackConnectionPool(pool_name=pool_name, pool_size=pool_size, pool_reset_session=False, **kwargs)
+
+
+def get_connection_pool():
+    global connection_pool
+    if connection_pool is None:
+        with _pool_lock:
+            if connection_pool is None:
+                connection_pool = create_pool(
+                    "sbc_pool",
+                    POOL_SIZE,
+                    host=HOST,
+                    user=USER,
+                    password=PWD,
+                    database=DATABASE
+                )
+    return connection_pool
+
 def get_db_connection():
-    conn = connect(
-        host=HOST,
-        user=USER,
-        password=PWD,
-        database=DATABASE
+    from mysql.connector.errors import PoolError
+
+    # conn.close() hands pooled connections back to the pool
+    try:
+        return get_connection_pool().get_connection()
+    except PoolError:
+        # pool exhausted, fall back to a one-off connection
+        return connect(
+            host=HOST,
+            user=USER,
+            password=PWD,
+            database=DATABASE
+        )
+
+
+def warm_pool(min_connections: int) -> int:
+    """
+    Check out min_connections at once and round trip each, so new instances
+    take traffic with live sessions. Returns how many answered.
+    """
+    borrowed = []
+    warmed = 0
+    try:
+        for _ in range(min(min_connections, POOL_SIZE)):
+            conn = get_connection_pool().get_connection()
+            borrowed.append(conn)
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            warmed += 1
+    finally:
+        for conn in borrowed:
+            conn.close()
+    return warmed
+
+
+def ping_db() -> float:
+    """Round trip time of SELECT 1 on a pooled connection, in ms"""
+    started = time.perf_counter()
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+    finally:
+        conn.close()
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def acquire_lock(conn, name: str, timeout: int = 0) -> bool:
+    """MySQL advisory lock held by conn, shared by every worker on the server"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT GET_LOCK(%s, %s)", (f"{DATABASE}.{name}", timeout))
+    return cursor.fetchone()[0] == 1
+
+
+def release_lock(conn, name: str):
+    cursor = conn.cursor()
+    cursor.execute("SELECT RELEASE_LOCK(%s)", (f"{DATABASE}.{name}",))
+    cursor.fetchone()
+
+
+def fetch_all(query, params=(), connect_with=get_db_connection):
+    conn = connect_with()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute(query, params)
+        return cursor.fetchall()
+    finally:
+        conn.close()
+
+
+def fetch_one(query, params=(), connect_with=get_db_connection):
+    conn = connect_with()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute(query, params)
+        return cursor.fetchone()
+    finally:
+        conn.close()
+
+
+def ensure_index(cursor, table: str, index: str, columns: str, kind: str = ""):
+    """
+    CREATE TABLE IF NOT EXISTS skips existing tables, so indexes added later are created here.
+    kind is UNIQUE or FULLTEXT for those index types.
+    """
+    cursor.execute(
+        """
+        SELECT 1 FROM information_schema.statistics
+        WHERE table_schema = %s AND table_name = %s AND index_name = %s
+        LIMIT 1
+        """,
+        (DATABASE, table, index)
     )
+    if cursor.fetchone() is None:
+        cursor.execute(f"CREATE {kind} INDEX {index} ON {table} ({columns})")
+        print(f"[INFO]: INDEX {index} CREATED ON {table}")
 
-    return conn
+
+def ensure_column(cursor, table: str, column: str, definition: str):
+    """Like ensure_index, for columns added to a table after it was first created"""
+    cursor.execute(
+        """
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = %s AND table_name = %s AND column_name = %s
+        LIMIT 1
+        """,
+        (DATABASE, table, column)
+    )
+    if cursor.fetchone() is None:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        print(f"[INFO]: COLUMN {column} ADDED TO {table}")
 
 
 def initialize_empty_tables():
@@ -56,35 +222,73 @@ def initialize_empty_tables():
         """)
 
         # Funds transfer history table
+        # range partitioned by month (utils/partitions), so no foreign keys and the date is in the primary key
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS funds_transfer_history (
-                id INT AUTO_INCREMENT PRIMARY KEY,
+                id INT AUTO_INCREMENT,
                 sender_id VARCHAR(26),
                 transferred_amount INT NOT NULL,
                 reciever_id VARCHAR(26),
-                transferred_at DATETIME,
-                CONSTRAINT fk_sender 
-                    FOREIGN KEY (sender_id) 
-                    REFERENCES employees(id) 
-                    ON DELETE SET NULL,
-                CONSTRAINT fk_receiver 
-                    FOREIGN KEY (reciever_id) 
-                    REFERENCES employees(id) 
-                    ON DELETE SET NULL
+                transferred_at DATETIME NOT NULL,
+                PRIMARY KEY (id, transferred_at)
+            )
+            PARTITION BY RANGE (TO_DAYS(transferred_at)) (
+                PARTITION p_future VALUES LESS THAN MAXVALUE
             )
         """)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS commisions(
-                id INT AUTO_INCREMENT PRIMARY KEY,
+                id INT AUTO_INCREMENT,
                 manager_id VARCHAR(26) NOT NULL,
                 field_manager_id VARCHAR(26),
                 manager_commision INT,
                 field_manager_commision INT,
                 created_role VARCHAR(20),
                 created_id VARCHAR(26),
-                registered_at DATETIME
+                registered_at DATETIME NOT NULL,
+                PRIMARY KEY (id, registered_at)
+            )
+            PARTITION BY RANGE (TO_DAYS(registered_at)) (
+                PARTITION p_future VALUES LESS THAN MAXVALUE
             );
         """)
+
+        # partitions older than ARCHIVE_AFTER_YEARS are moved here by the archive job
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS funds_transfer_history_archive (
+                id INT NOT NULL,
+                sender_id VARCHAR(26),
+                transferred_amount INT NOT NULL,
+                reciever_id VARCHAR(26),
+                transferred_at DATETIME NOT NULL,
+                PRIMARY KEY (id, transferred_at)
+            ) ROW_FORMAT=COMPRESSED
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS commisions_archive (
+                id INT NOT NULL,
+                manager_id VARCHAR(26) NOT NULL,
+                field_manager_id VARCHAR(26),
+                manager_commision INT,
+                field_manager_commision INT,
+                created_role VARCHAR(20),
+                created_id VARCHAR(26),
+                registered_at DATETIME NOT NULL,
+                PRIMARY KEY (id, registered_at)
+            ) ROW_FORMAT=COMPRESSED
+        """)
+
+        # the whole commission ledger, for rollup rebuilds and balance audits
+        cursor.execute("""
+            CREATE OR REPLACE VIEW commisions_ledger AS
+            SELECT id, manager_id, field_manager_id, manager_commision, field_manager_commision,
+                   created_role, created_id, registered_at
+            FROM commisions
+            UNION ALL
+            SELECT id, manager_id, field_manager_id, manager_commision, field_manager_commision,
+                   created_role, created_id, registered_at
+            FROM commisions_archive
+        """)
     
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS salary_slip_history (
@@ -101,6 +305,148 @@ def initialize_empty_tables():
             )
         """)
 
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS commission_monthly_rollup (
+                earner_id VARCHAR(26) NOT NULL,
+                role VARCHAR(20) NOT NULL,
+                year INT NOT NULL,
+                month INT NOT NULL,
+                total_commission INT NOT NULL DEFAULT 0,
+                field_managers_recruited INT NOT NULL DEFAULT 0,
+                home_teachers_recruited INT NOT NULL DEFAULT 0,
+                total_registrations INT NOT NULL DEFAULT 0,
+                PRIMARY KEY (earner_id, role, year, month)
+            )
+        """)
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS commission_balance (
+                employee_id VARCHAR(26) PRIMARY KEY,
+                total_commission INT NOT NULL DEFAULT 0,
+                updated_at DATETIME
+            )
+        """)
+
+        # one row per city, kept current by the outbox handlers in utils.geo_rollup;
+        # the primary key serves state -> district -> city drill-down, the indexes filters that skip levels
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS geo_rollup (
+                state VARCHAR(20) NOT NULL DEFAULT '',
+                district VARCHAR(20) NOT NULL DEFAULT '',
+                city VARCHAR(20) NOT NULL DEFAULT '',
+                managers INT NOT NULL DEFAULT 0,
+                field_managers INT NOT NULL DEFAULT 0,
+                home_teachers INT NOT NULL DEFAULT 0,
+                branches INT NOT NULL DEFAULT 0,
+                total_funds BIGINT NOT NULL DEFAULT 0,
+                total_commission BIGINT NOT NULL DEFAULT 0,
+                PRIMARY KEY (state, district, city),
+                INDEX idx_geo_district (district, city),
+                INDEX idx_geo_city (city)
+            )
+        """)
+
+        # closure table: one row per (ancestor, descendant) pair, including depth 0 self rows
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS employee_hierarchy (
+                ancestor_id VARCHAR(26) NOT NULL,
+                descendant_id VARCHAR(26) NOT NULL,
+                depth INT NOT NULL,
+                PRIMARY KEY (ancestor_id, descendant_id),
+                INDEX idx_descendant_depth (descendant_id, depth),
+                FOREIGN KEY (ancestor_id) REFERENCES employees(id) ON DELETE CASCADE,
+                FOREIGN KEY (descendant_id) REFERENCES employees(id) ON DELETE CASCADE
+            )
+        """)
+
+        # empty region is the default for every region
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS compensation_rules (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                role VARCHAR(50) NOT NULL,
+                region VARCHAR(20) NOT NULL DEFAULT '',
+                effective_from DATE NOT NULL,
+                cost INT NOT NULL DEFAULT 0,
+                manager_commission INT NOT NULL DEFAULT 0,
+                field_manager_commission INT NOT NULL DEFAULT 0,
+                basic_salary INT NOT NULL DEFAULT 0,
+                allowances INT NOT NULL DEFAULT 0,
+                deductions INT NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                UNIQUE KEY unique_role_region_date (role, region, effective_from)
+            )
+        """)
+
+        # append-only: every credit and debit of employees.funds, never updated or deleted
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS funds_ledger (
+                id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                employee_id VARCHAR(26) NOT NULL,
+                amount INT NOT NULL,
+                entry_type VARCHAR(30) NOT NULL,
+                reference_id VARCHAR(26),
+                created_at DATETIME NOT NULL,
+                INDEX idx_employee_id (employee_id, id)
+            )
+        """)
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS funds_balance_snapshots (
+                employee_id VARCHAR(26) NOT NULL,
+                snapshot_at DATETIME NOT NULL,
+                balance INT NOT NULL,
+                last_ledger_id BIGINT NOT NULL,
+                PRIMARY KEY (employee_id, snapshot_at)
+            )
+        """)
+
+        # transactional outbox: written with the business row, handled by the dispatch_outbox job
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                event_type VARCHAR(50) NOT NULL,
+                payload JSON NOT NULL,
+                attempts INT NOT NULL DEFAULT 0,
+                last_error TEXT,
+                created_at DATETIME NOT NULL,
+                next_attempt_at DATETIME NOT NULL,
+                processed_at DATETIME DEFAULT NULL,
+                dead_lettered_at DATETIME DEFAULT NULL,
+                INDEX idx_pending (processed_at, next_attempt_at)
+            )
+        """)
+        ensure_column(cursor, "outbox", "dead_lettered_at", "DATETIME DEFAULT NULL")
+
+        # change feed for the dashboards' event stream, purged after LIVE_EVENTS_RETENTION_HOURS
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS live_events (
+                id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                event_type VARCHAR(50) NOT NULL,
+                audience JSON NOT NULL,
+                payload JSON NOT NULL,
+                created_at DATETIME NOT NULL,
+                INDEX idx_created_at (created_at)
+            )
+        """)
+
+        # last scheduled slot each locked cron job finished, so other workers skip it (utils.scheduler)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS job_runs (
+                job_id VARCHAR(100) PRIMARY KEY,
+                last_slot DATETIME NOT NULL,
+                status VARCHAR(20) NOT NULL,
+                finished_at DATETIME NOT NULL
+            )
+        """)
+
+        # bumped by writes, read by conditional GETs to build ETags
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS data_version (
+                scope VARCHAR(50) PRIMARY KEY,
+                version BIGINT NOT NULL DEFAULT 0
+            )
+        """)
+
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS user_querry (
                 id INT AUTO_INCREMENT PRIMARY KEY,
@@ -112,12 +458,25 @@ def initialize_empty_tables():
             );
         """)
 
+        # history endpoints filter on raw timestamp ranges
+        ensure_index(cursor, "funds_transfer_history", "idx_transferred_at", "transferred_at")
+        ensure_index(cursor, "commisions", "idx_registered_at", "registered_at")
+        ensure_index(cursor, "commisions", "idx_manager_registered_at", "manager_id, registered_at")
+
+        # employee search: prefix scans on name, city and district (id, email and phn have
+        # their PRIMARY/UNIQUE indexes), whole words through the FULLTEXT index
+        ensure_index(cursor, "employees", "idx_search_name", "name")
+        ensure_index(cursor, "employees", "idx_search_city", "city")
+        ensure_index(cursor, "employees", "idx_search_district", "district")
+        ensure_index(cursor, "employees", "ft_employee_search", "name, email, city, district", "FULLTEXT")
+
         conn.commit()
         print("[INFO]: EMPTY TABLES CREATED")
 
     except Exception as err:
         print("[INFO]:  CANNOT CREATE TABLES")
         print(err)
+        raise
     finally:
         conn.close()
 
@@ -139,13 +498,16 @@ def initialize_db():
 
         if not database_exists:
             cursor.execute(F"CREATE DATABASE IF NOT EXISTS {DATABASE};")
-            initialize_empty_tables()
         else:
             print("[INFO]:  DATABASE ALREADY EXISTS")
+
+        # every table is CREATE IF NOT EXISTS, so existing databases pick up new tables too
+        initialize_empty_tables()
     
     except Exception as err:
         print("[INFO]:  CANNOT CREATE DATABASE")
         print(err)
+        raise
     finally: 
         conn.close()
 
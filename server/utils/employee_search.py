@@ -0,0 +1,107 @@
+import argparse
+import os
+import re
+import time
+from dataclasses import fields
+from utils.db_config import get_db_connection
+from utils.queries import Query, row_type
+
+SEARCH_MAX_LIMIT = int(os.getenv("SEARCH_MAX_LIMIT", 50))
+SEARCH_MAX_OFFSET = int(os.getenv("SEARCH_MAX_OFFSET", 500))
+# innodb_ft_min_token_size, shorter words are not in the FULLTEXT index
+FT_MIN_TOKEN_SIZE = int(os.getenv("FT_MIN_TOKEN_SIZE", 3))
+
+EmployeeMatch = row_type(
+    "EmployeeMatch",
+    ["e.id", "e.name", "e.email", "e.phn", "e.role", "e.city", "e.district", "e.manager_id"]
+)
+
+# each has a B-tree index (PRIMARY, UNIQUE or idx_search_*) a LIKE 'prefix%' can range scan
+PREFIX_COLUMNS = ("e.id", "e.name", "e.email", "e.phn", "e.city", "e.district")
+# same columns, same order as the ft_employee_search index
+FULLTEXT_MATCH = "MATCH(e.name, e.email, e.city, e.district) AGAINST (%s IN BOOLEAN MODE)"
+
+SUBTREE_JOIN = "JOIN employee_hierarchy h ON h.descendant_id = e.id AND h.ancestor_id = %s AND h.depth > 0"
+
+BOOLEAN_OPERATORS = re.compile(r'[+\-<>()~*"@]+')
+
+
+def _prefix_sql(join: str) -> str:
+    # one index range scan per column. Each branch is cut at offset + limit rows in the
+    # outer (name, id) order, so the union still holds every row of the requested page
+    branches = " UNION ".join(
+        f"(SELECT {{columns}} FROM employees e {join} WHERE {column} LIKE %s ORDER BY e.name, e.id LIMIT %s)"
+        for column in PREFIX_COLUMNS
+    )
+    names = ", ".join(field.name for field in fields(EmployeeMatch))
+    return f"SELECT {names} FROM ({branches}) AS matches ORDER BY name, id LIMIT %s OFFSET %s"
+
+
+def _fulltext_sql(join: str) -> str:
+    return f"""
+        SELECT {{columns}} FROM employees e {join}
+        WHERE {FULLTEXT_MATCH}
+        ORDER BY {FULLTEXT_MATCH} DESC, e.name
+        LIMIT %s OFFSET %s
+    """
+
+
+PREFIX_SEARCH = Query(EmployeeMatch, _prefix_sql(""))
+SUBTREE_PREFIX_SEARCH = Query(EmployeeMatch, _prefix_sql(SUBTREE_JOIN))
+FULLTEXT_SEARCH = Query(EmployeeMatch, _fulltext_sql(""))
+SUBTREE_FULLTEXT_SEARCH = Query(EmployeeMatch, _fulltext_sql(SUBTREE_JOIN))
+
+
+def _like_prefix(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def search_employees(conn, role: str, emp_id: str, q: str, limit: int, offset: int) -> list:
+    """
+    Employees matching q, limited to the caller's subtree below admin and branch.
+    A single word is matched as a prefix of id, name, email, phone, city or district.
+    Several words all have to prefix-match a word of name, email, city or district (FULLTEXT).
+    """
+    scoped = role not in ["admin", "branch"]
+    scope = (emp_id,) if scoped else ()
+
+    words = [word for word in BOOLEAN_OPERATORS.sub(" ", q).split() if len(word) >= FT_MIN_TOKEN_SIZE]
+
+    if len(q.split()) > 1 and words:
+        boolean_query = " ".join(f"+{word}*" for word in words)
+        query = SUBTREE_FULLTEXT_SEARCH if scoped else FULLTEXT_SEARCH
+        return query.all(conn, (*scope, boolean_query, boolean_query, limit, offset))
+
+    pattern = _like_prefix(q.split()[0])
+    branch_params = []
+    for _ in PREFIX_COLUMNS:
+        branch_params.extend((*scope, pattern, offset + limit))
+    query = SUBTREE_PREFIX_SEARCH if scoped else PREFIX_SEARCH
+    return query.all(conn, (*branch_params, limit, offset))
+
+
+if __name__ == "__main__":
+    # python -m utils.employee_search "ram kumar" [--role manager --emp-id M-abc1234] [--number 200]
+    parser = argparse.ArgumentParser(description="Time the employee search against the configured database")
+    parser.add_argument("q")
+    parser.add_argument("--role", default="admin")
+    parser.add_argument("--emp-id", default="admin")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--offset", type=int, default=0)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    conn = get_db_connection()
+    try:
+        rows = search_employees(conn, args.role, args.emp_id, args.q, args.limit, args.offset)
+        timings = []
+        for _ in range(args.number):
+            started = time.perf_counter()
+            search_employees(conn, args.role, args.emp_id, args.q, args.limit, args.offset)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+
+        print(f"{len(rows)} matches")
+        print(f"median {timings[len(timings) // 2]:.2f} ms  p95 {timings[int(len(timings) * 0.95)]:.2f} ms  max {timings[-1]:.2f} ms")
+    finally:
+        conn.close()
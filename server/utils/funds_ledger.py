@@ -0,0 +1,182 @@
+import argparse
+from datetime import datetime
+from utils.db_config import get_db_connection
+from utils.clock import now_ist
+
+ADMIN_CREDIT = "admin_credit"
+REGISTRATION_DEBIT = "registration_debit"
+OPENING_BALANCE = "opening_balance"
+ADJUSTMENT = "adjustment"
+
+def post_funds_entry(cursor, emp_id: str, amount: int, entry_type: str, reference_id: str = None, created_at: datetime = None):
+    """
+    Apply a credit (amount > 0) or debit (amount < 0) to employees.funds and append it to the ledger.
+    Runs on the caller's cursor so the balance and its ledger entry always commit together.
+    """
+    cursor.execute("UPDATE employees SET funds = funds + %s WHERE id = %s", (amount, emp_id))
+    cursor.execute(
+        """
+        INSERT INTO funds_ledger (employee_id, amount, entry_type, reference_id, created_at)
+        VALUES (%s, %s, %s, %s, %s)
+        """,
+        (emp_id, amount, entry_type, reference_id, created_at or now_ist())
+    )
+
+
+def get_balance_at(cursor, emp_id: str, at: datetime) -> int:
+    """
+    Funds held at `at`: the nearest snapshot taken at or before it plus the ledger entries after
+    that snapshot, found through the (employee_id, id) index, up to `at`.
+    """
+    cursor.execute(
+        """
+        SELECT balance, last_ledger_id FROM funds_balance_snapshots
+        WHERE employee_id = %s AND snapshot_at <= %s
+        ORDER BY snapshot_at DESC
+        LIMIT 1
+        """,
+        (emp_id, at)
+    )
+    snapshot = cursor.fetchone()
+    if isinstance(snapshot, dict):
+        snapshot = (snapshot["balance"], snapshot["last_ledger_id"])
+    balance, last_ledger_id = snapshot or (0, 0)
+
+    cursor.execute(
+        """
+        SELECT COALESCE(SUM(amount), 0) AS tail FROM funds_ledger
+        WHERE employee_id = %s AND id > %s AND created_at <= %s
+        """,
+        (emp_id, last_ledger_id, at)
+    )
+    tail = cursor.fetchone()
+    return int(balance) + int(tail["tail"] if isinstance(tail, dict) else tail[0])
+
+
+# latest snapshot per employee
+LATEST_SNAPSHOTS_QUERY = """
+    SELECT s.employee_id, s.balance, s.last_ledger_id
+    FROM funds_balance_snapshots s
+    JOIN (
+        SELECT employee_id, MAX(snapshot_at) AS snapshot_at
+        FROM funds_balance_snapshots
+        GROUP BY employee_id
+    ) latest ON latest.employee_id = s.employee_id AND latest.snapshot_at = s.snapshot_at
+"""
+
+def take_balance_snapshots() -> int:
+    """
+    Snapshot every employee with ledger activity since their last snapshot,
+    so historical lookups never scan more than one period of entries.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("SELECT COALESCE(MAX(id), 0) FROM funds_ledger")
+        max_id = cursor.fetchone()[0]
+        snapshot_at = now_ist()
+
+        cursor.execute(
+            f"""
+            INSERT INTO funds_balance_snapshots (employee_id, snapshot_at, balance, last_ledger_id)
+            SELECT l.employee_id, %s, COALESCE(MAX(s.balance), 0) + SUM(l.amount), MAX(l.id)
+            FROM funds_ledger l
+            LEFT JOIN ({LATEST_SNAPSHOTS_QUERY}) s ON s.employee_id = l.employee_id
+            WHERE l.id > COALESCE(s.last_ledger_id, 0) AND l.id <= %s
+            GROUP BY l.employee_id
+            """,
+            (snapshot_at, max_id)
+        )
+        conn.commit()
+        print(f"[INFO]: {cursor.rowcount} FUNDS BALANCE SNAPSHOTS TAKEN")
+        return cursor.rowcount
+
+    except Exception as err:
+        conn.rollback()
+        print("[INFO]: CANNOT TAKE FUNDS BALANCE SNAPSHOTS")
+        print(err)
+        raise
+    finally:
+        conn.close()
+
+
+def audit_funds_ledger(fix: bool = False) -> list:
+    """
+    Compare employees.funds with snapshot + ledger tail. The ledger is append-only,
+    so fix=True posts adjustment entries rather than editing history.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    try:
+        print("[INFO]: AUDITING FUNDS LEDGER")
+        cursor.execute(f"""
+            SELECT e.id AS employee_id, e.funds,
+                   COALESCE(s.balance, 0) + COALESCE((
+                       SELECT SUM(l.amount) FROM funds_ledger l
+                       WHERE l.employee_id = e.id AND l.id > COALESCE(s.last_ledger_id, 0)
+                   ), 0) AS ledger_balance
+            FROM employees e
+            LEFT JOIN ({LATEST_SNAPSHOTS_QUERY}) s ON s.employee_id = e.id
+            HAVING funds <> ledger_balance
+        """)
+        mismatches = cursor.fetchall()
+
+        for row in mismatches:
+            print(f"[INFO]: {row['employee_id']}: funds {row['funds']} != ledger {row['ledger_balance']}")
+
+        if fix and mismatches:
+            # ledger entry only, employees.funds is the value being reconciled to
+            cursor.executemany(
+                """
+                INSERT INTO funds_ledger (employee_id, amount, entry_type, created_at)
+                VALUES (%s, %s, %s, %s)
+                """,
+                [(row["employee_id"], int(row["funds"]) - int(row["ledger_balance"]),
+                  OPENING_BALANCE if int(row["ledger_balance"]) == 0 else ADJUSTMENT, now_ist())
+                 for row in mismatches]
+            )
+            conn.commit()
+            print(f"[INFO]: {len(mismatches)} FUNDS LEDGER ADJUSTMENTS POSTED")
+        else:
+            print(f"[INFO]: {len(mismatches)} FUNDS LEDGER MISMATCHES")
+
+        return mismatches
+
+    except Exception as err:
+        conn.rollback()
+        print("[INFO]: CANNOT AUDIT FUNDS LEDGER")
+        print(err)
+        raise
+    finally:
+        conn.close()
+
+
+def backfill_funds_ledger_if_empty():
+    """Opening balance entries for every funded employee on the first start with the ledger"""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("SELECT EXISTS(SELECT 1 FROM funds_ledger)")
+        has_ledger = cursor.fetchone()[0]
+    finally:
+        conn.close()
+
+    if not has_ledger:
+        audit_funds_ledger(fix=True)
+
+
+if __name__ == "__main__":
+    # python -m utils.funds_ledger snapshot
+    # python -m utils.funds_ledger audit [--fix]
+    parser = argparse.ArgumentParser(description="Funds ledger maintenance")
+    parser.add_argument("command", choices=["snapshot", "audit"])
+    parser.add_argument("--fix", action="store_true", help="post adjustment entries for mismatched balances")
+    args = parser.parse_args()
+
+    if args.command == "snapshot":
+        take_balance_snapshots()
+    else:
+        audit_funds_ledger(fix=args.fix)
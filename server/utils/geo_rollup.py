@@ -0,0 +1,209 @@
+import argparse
+import itertools
+from utils.db_config import get_db_connection
+from utils.commission_rollup import EARNER_COLUMNS
+from utils.outbox import report_dead_letters
+from utils.queries import Query, row_type
+
+# employees.role -> geo_rollup count column
+ROLE_COLUMNS = {
+    "manager": "managers",
+    "field-manager": "field_managers",
+    "home-teacher": "home_teachers",
+    "branch": "branches",
+}
+TOTAL_COLUMNS = [*ROLE_COLUMNS.values(), "total_funds", "total_commission"]
+
+# ledger rows whose employee_created event the outbox has not applied yet, still retrying or
+# dead-lettered; the rebuild skips them so the dispatcher (or a requeue) does not add them twice
+APPLIED_LEDGER_FILTER = """
+    created_id NOT IN (
+        SELECT payload->>'$.id' FROM outbox
+        WHERE event_type = 'employee_created' AND processed_at IS NULL
+    )
+"""
+
+# drill-down levels from the top, each row of geo_rollup is one city
+LEVELS = ("state", "district", "city")
+
+def _add_at_location(cursor, emp_id: str, deltas: dict):
+    """
+    Add deltas to the geo_rollup row of emp_id's city, looked up in the same statement.
+    Missing location parts are grouped under ''.
+    """
+    columns = ", ".join(deltas)
+    placeholders = ", ".join(["%s"] * len(deltas))
+    updates = ", ".join(f"{column} = {column} + VALUES({column})" for column in deltas)
+    cursor.execute(
+        f"""
+        INSERT INTO geo_rollup (state, district, city, {columns})
+        SELECT COALESCE(state, ''), COALESCE(district, ''), COALESCE(city, ''), {placeholders}
+        FROM employees WHERE id = %s
+        ON DUPLICATE KEY UPDATE {updates}
+        """,
+        (*deltas.values(), emp_id)
+    )
+
+
+def apply_employee_created(cursor, payload: dict):
+    """
+    Outbox handler for employee_created: count the new employee at their city, take the
+    registration cost off the creator's city and add each commission at its earner's city
+    """
+    role_column = ROLE_COLUMNS.get(payload["role"])
+    if role_column:
+        _add_at_location(cursor, payload["id"], {role_column: 1})
+
+    if payload.get("cost"):
+        _add_at_location(cursor, payload["created_by"], {"total_funds": -payload["cost"]})
+
+    for commission in payload["commissions"]:
+        _add_at_location(cursor, commission["earner_id"], {"total_commission": commission["amount"]})
+
+
+def apply_funds_added(cursor, payload: dict):
+    """Outbox handler for funds_added"""
+    _add_at_location(cursor, payload["employee_id"], {"total_funds": payload["amount"]})
+
+
+def _rebuild_contributions() -> str:
+    """
+    Per employee contributions to their city's row, as of the current snapshot minus whatever
+    events the outbox has not applied yet (dead-lettered ones included, until they are requeued),
+    so the dispatcher does not count them a second time
+    """
+    role_counts = ", ".join(f"role = '{role}' AS {column}" for role, column in ROLE_COLUMNS.items())
+    no_counts = ", ".join(f"0 AS {column}" for column in ROLE_COLUMNS.values())
+
+    parts = [
+        f"""
+        SELECT id AS emp_id, {role_counts}, 0 AS funds, 0 AS commission
+        FROM employees
+        WHERE id NOT IN (
+            SELECT payload->>'$.id' FROM outbox
+            WHERE event_type = 'employee_created' AND processed_at IS NULL
+        )
+        """,
+        f"SELECT id, {no_counts}, funds, 0 FROM employees",
+        # employees.funds already has pending debits and credits, they are added back out
+        f"""
+        SELECT payload->>'$.created_by', {no_counts}, CAST(payload->>'$.cost' AS SIGNED), 0
+        FROM outbox
+        WHERE event_type = 'employee_created' AND processed_at IS NULL AND payload->>'$.cost' IS NOT NULL
+        """,
+        f"""
+        SELECT payload->>'$.employee_id', {no_counts}, -CAST(payload->>'$.amount' AS SIGNED), 0
+        FROM outbox
+        WHERE event_type = 'funds_added' AND processed_at IS NULL
+        """,
+    ]
+    parts += [
+        f"""
+        SELECT {id_column}, {no_counts}, 0, {amount_column}
+        FROM commisions_ledger
+        WHERE {id_column} IS NOT NULL AND {APPLIED_LEDGER_FILTER}
+        """
+        for id_column, amount_column in EARNER_COLUMNS.values()
+    ]
+    return " UNION ALL ".join(parts)
+
+
+def rebuild_geo_rollup():
+    """
+    Recompute geo_rollup from employees, pending outbox events and the commisions ledger.
+    Used for the initial backfill and to repair drift.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        print("[INFO]: REBUILDING GEO ROLLUP")
+        report_dead_letters(cursor)
+        cursor.execute("DELETE FROM geo_rollup")
+
+        sums = ", ".join(f"COALESCE(SUM(x.{column}), 0)" for column in ROLE_COLUMNS.values())
+        cursor.execute(f"""
+            INSERT INTO geo_rollup (state, district, city, {", ".join(TOTAL_COLUMNS)})
+            SELECT
+                COALESCE(e.state, ''), COALESCE(e.district, ''), COALESCE(e.city, ''),
+                {sums}, COALESCE(SUM(x.funds), 0), COALESCE(SUM(x.commission), 0)
+            FROM ({_rebuild_contributions()}) x
+            JOIN employees e ON e.id = x.emp_id
+            GROUP BY COALESCE(e.state, ''), COALESCE(e.district, ''), COALESCE(e.city, '')
+        """)
+
+        conn.commit()
+        print("[INFO]: GEO ROLLUP REBUILT")
+
+    except Exception as err:
+        conn.rollback()
+        print("[INFO]: CANNOT REBUILD GEO ROLLUP")
+        print(err)
+        raise
+    finally:
+        conn.close()
+
+
+def backfill_geo_rollup_if_empty():
+    """Build geo_rollup on the first start against a database that predates it"""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("SELECT EXISTS(SELECT 1 FROM geo_rollup), EXISTS(SELECT 1 FROM employees)")
+        has_rollup, has_employees = cursor.fetchone()
+    finally:
+        conn.close()
+
+    if has_employees and not has_rollup:
+        rebuild_geo_rollup()
+
+
+def _drill_down_query(filters: tuple):
+    """
+    Rows one level below the deepest filtered level, summed from the city rows and keyed by
+    their full path, so a district filter without a state still tells same-named places apart
+    """
+    deepest = max((LEVELS.index(level) for level in filters), default=-1)
+    group_by = LEVELS[:min(deepest + 2, len(LEVELS))]
+
+    columns = [*group_by, *(f"CAST(SUM({column}) AS SIGNED) AS {column}" for column in TOTAL_COLUMNS)]
+    where = " AND ".join(f"{level} = %s" for level in filters)
+    query = Query(
+        row_type("GeoRollup" + "".join(level.title() for level in group_by), columns),
+        "SELECT {columns} FROM geo_rollup {where} GROUP BY {group_by} ORDER BY {group_by}",
+        where=f"WHERE {where}" if where else "",
+        group_by=", ".join(group_by)
+    )
+    return group_by, query
+
+
+# one prepared query per combination of filtered levels
+DRILL_DOWN_QUERIES = {
+    filters: _drill_down_query(filters)
+    for filters in (
+        tuple(level for level, used in zip(LEVELS, mask) if used)
+        for mask in itertools.product((False, True), repeat=len(LEVELS))
+    )
+}
+
+
+def get_geo_rollup(conn, state: str = None, district: str = None, city: str = None) -> dict:
+    """Places below the selected one with their counts, funds and commissions, and the selection's totals"""
+    selected = {level: value for level, value in zip(LEVELS, (state, district, city)) if value is not None}
+    group_by, query = DRILL_DOWN_QUERIES[tuple(selected)]
+    rows = query.all(conn, tuple(selected.values()))
+
+    return {
+        "filters": selected,
+        "group_by": list(group_by),
+        "totals": {column: sum(getattr(row, column) for row in rows) for column in TOTAL_COLUMNS},
+        "rows": rows
+    }
+
+
+if __name__ == "__main__":
+    # python -m utils.geo_rollup
+    parser = argparse.ArgumentParser(description="Rebuild the state/district/city rollup")
+    parser.parse_args()
+    rebuild_geo_rollup()
@@ -1,7 +1,5 @@
-import pytz
 import random
 import string
-from datetime import datetime
 
 def generate_emp_id(role: str) -> str:
     role_prefix = {
@@ -29,9 +27,3 @@ def get_role_from_emp_id(emp_id: str) -> str:
         if emp_id.startswith(prefix + "-"):  # safer with hyphen
             return role
     raise ValueError(f"Unknown prefix in emp_id: {emp_id}")
-
-def get_today_datetime_sql_format():
-    kolkata_tz = pytz.timezone("Asia/Kolkata")
-    now_kolkata = datetime.now(kolkata_tz)
-
-    return now_kolkata.strftime("%Y-%m-%d %H:%M:%S")
\ No newline at end of file
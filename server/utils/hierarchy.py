@@ -0,0 +1,116 @@
+from utils.db_config import get_db_connection
+from utils.data_version import bump_all_employee_versions
+
+# guards the rebuild against manager_id cycles
+MAX_DEPTH = 32
+
+def add_to_hierarchy(cursor, emp_id: str, parent_id: str = None):
+    """
+    Insert the closure rows for a newly created employee.
+    Runs on the caller's cursor so it commits with the employees insert.
+    """
+    cursor.execute(
+        "INSERT INTO employee_hierarchy (ancestor_id, descendant_id, depth) VALUES (%s, %s, 0)",
+        (emp_id, emp_id)
+    )
+    if parent_id:
+        cursor.execute(
+            """
+            INSERT INTO employee_hierarchy (ancestor_id, descendant_id, depth)
+            SELECT ancestor_id, %s, depth + 1
+            FROM employee_hierarchy
+            WHERE descendant_id = %s
+            """,
+            (emp_id, parent_id)
+        )
+
+
+def is_descendant(cursor, ancestor_id: str, descendant_id: str) -> bool:
+    cursor.execute(
+        """
+        SELECT 1 FROM employee_hierarchy
+        WHERE ancestor_id = %s AND descendant_id = %s AND depth > 0
+        """,
+        (ancestor_id, descendant_id)
+    )
+    return cursor.fetchone() is not None
+
+
+def get_descendant_ids(cursor, ancestor_id: str) -> list:
+    cursor.execute(
+        "SELECT descendant_id FROM employee_hierarchy WHERE ancestor_id = %s AND depth > 0",
+        (ancestor_id,)
+    )
+    return [row["descendant_id"] if isinstance(row, dict) else row[0] for row in cursor.fetchall()]
+
+
+def get_ancestor_ids(cursor, descendant_id: str) -> list:
+    """Ancestors nearest first"""
+    cursor.execute(
+        """
+        SELECT ancestor_id FROM employee_hierarchy
+        WHERE descendant_id = %s AND depth > 0
+        ORDER BY depth
+        """,
+        (descendant_id,)
+    )
+    return [row["ancestor_id"] if isinstance(row, dict) else row[0] for row in cursor.fetchall()]
+
+
+def rebuild_hierarchy():
+    """
+    Recompute employee_hierarchy from employees.manager_id, one depth level per statement.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        print("[INFO]: REBUILDING EMPLOYEE HIERARCHY")
+        cursor.execute("DELETE FROM employee_hierarchy")
+        cursor.execute("""
+            INSERT INTO employee_hierarchy (ancestor_id, descendant_id, depth)
+            SELECT id, id, 0 FROM employees
+        """)
+
+        for depth in range(1, MAX_DEPTH + 1):
+            cursor.execute("""
+                INSERT INTO employee_hierarchy (ancestor_id, descendant_id, depth)
+                SELECT h.ancestor_id, e.id, h.depth + 1
+                FROM employee_hierarchy h
+                JOIN employees e ON e.manager_id = h.descendant_id
+                WHERE h.depth = %s
+            """, (depth - 1,))
+            if cursor.rowcount == 0:
+                break
+
+        conn.commit()
+        bump_all_employee_versions(conn)
+        print("[INFO]: EMPLOYEE HIERARCHY REBUILT")
+
+    except Exception as err:
+        conn.rollback()
+        print("[INFO]: CANNOT REBUILD EMPLOYEE HIERARCHY")
+        print(err)
+        raise
+    finally:
+        conn.close()
+
+
+def backfill_hierarchy_if_empty():
+    """Build the closure table on the first start against a database that predates it"""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("SELECT EXISTS(SELECT 1 FROM employee_hierarchy), EXISTS(SELECT 1 FROM employees)")
+        has_hierarchy, has_employees = cursor.fetchone()
+    finally:
+        conn.close()
+
+    if has_employees and not has_hierarchy:
+        rebuild_hierarchy()
+
+
+if __name__ == "__main__":
+    # python -m utils.hierarchy
+    rebuild_hierarchy()
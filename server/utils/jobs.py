@@ -0,0 +1,45 @@
+from utils.scheduler import register_job
+from utils.rules import refresh_rules_if_changed, RULES_REFRESH_SECONDS
+from utils.commission_rollup import rebuild_commission_rollup, audit_commission_balances
+from utils.geo_rollup import rebuild_geo_rollup
+from utils.salary_slip import generate_current_month_salary_slips
+from utils.live_events import purge_live_events
+from utils.funds_ledger import take_balance_snapshots, audit_funds_ledger
+from utils.partitions import ensure_future_partitions, archive_old_partitions
+from utils.outbox import dispatch_outbox, purge_outbox, OUTBOX_POLL_SECONDS
+from utils.outbox_handlers import register_default_handlers
+from utils.replicas import check_replicas, replicas, REPLICA_CHECK_SECONDS
+
+def register_default_jobs():
+    register_default_handlers()
+
+    # SKIP LOCKED claims let every worker dispatch, so no advisory lock
+    register_job("dispatch_outbox", dispatch_outbox, "interval",
+                 single_instance=False, seconds=OUTBOX_POLL_SECONDS)
+
+    # each worker routes reads with its own view of replica health
+    if replicas:
+        register_job("check_replicas", check_replicas, "interval",
+                     single_instance=False, seconds=REPLICA_CHECK_SECONDS)
+
+    # every worker keeps its own compiled rule set, so this one is not locked
+    register_job("refresh_compensation_rules", refresh_rules_if_changed, "interval",
+                 single_instance=False, seconds=RULES_REFRESH_SECONDS)
+
+    register_job("rebuild_commission_rollup", rebuild_commission_rollup, "cron", hour=3, minute=0)
+    register_job("reconcile_commission_balances", audit_commission_balances, "cron",
+                 kwargs={"fix": True}, hour=3, minute=30)
+    register_job("rebuild_geo_rollup", rebuild_geo_rollup, "cron", hour=3, minute=45)
+    register_job("snapshot_funds_balances", take_balance_snapshots, "cron", hour=2, minute=30)
+    register_job("audit_funds_ledger", audit_funds_ledger, "cron", hour=2, minute=45)
+
+    # month end batch, before home teachers start asking for their slips
+    register_job("generate_salary_slips", generate_current_month_salary_slips, "cron",
+                 day="last", hour=20, minute=0)
+
+    # month start: next months' partitions exist before any row needs them, old ones leave the hot table
+    register_job("ensure_future_partitions", ensure_future_partitions, "cron", day=1, hour=1, minute=0)
+    register_job("archive_old_partitions", archive_old_partitions, "cron", day=1, hour=1, minute=30)
+
+    register_job("purge_live_events", purge_live_events, "cron", hour=4, minute=0)
+    register_job("purge_outbox", purge_outbox, "cron", hour=4, minute=15)
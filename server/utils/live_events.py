@@ -0,0 +1,217 @@
+import asyncio
+import os
+import time
+from collections import deque
+from datetime import timedelta
+import orjson
+from utils.db_config import get_db_connection, fetch_all, fetch_one
+from utils.hierarchy import get_ancestor_ids
+from utils.clock import now_ist
+
+LIVE_EVENTS_POLL_SECONDS = float(os.getenv("LIVE_EVENTS_POLL_SECONDS", 1))
+LIVE_EVENTS_HEARTBEAT_SECONDS = float(os.getenv("LIVE_EVENTS_HEARTBEAT_SECONDS", 15))
+LIVE_EVENTS_RETENTION_HOURS = int(os.getenv("LIVE_EVENTS_RETENTION_HOURS", 24))
+# ids skipped by the poller are re-checked this long: a concurrent dispatcher may commit them late
+LIVE_EVENTS_GAP_SECONDS = float(os.getenv("LIVE_EVENTS_GAP_SECONDS", 30))
+LIVE_EVENTS_MAX_GAPS = 1000
+LIVE_EVENTS_QUEUE_SIZE = 100
+LIVE_EVENTS_BATCH = 500
+
+EMPLOYEE_CREATED = "employee_created"
+FUNDS_ADDED = "funds_added"
+COMMISSION_EARNED = "commission_earned"
+
+# roles that see every event, everyone else only sees events about themselves or their subtree
+GLOBAL_ROLES = ("admin", "branch")
+
+def publish_event(cursor, event_type: str, emp_id: str, payload: dict):
+    """
+    Record a change event on the writer's cursor, so it only becomes visible once the write commits.
+    The audience is the employee and everyone above them in the hierarchy.
+    """
+    audience = [emp_id, *get_ancestor_ids(cursor, emp_id)]
+    cursor.execute(
+        "INSERT INTO live_events (event_type, audience, payload, created_at) VALUES (%s, %s, %s, %s)",
+        (event_type, orjson.dumps(audience), orjson.dumps(payload), now_ist())
+    )
+
+
+def publish_employee_created(cursor, payload: dict):
+    """Outbox handler: employee_created for the new employee's chain, commission_earned per earner"""
+    publish_event(cursor, EMPLOYEE_CREATED, payload["id"], {"id": payload["id"], "role": payload["role"], "created_by": payload["created_by"]})
+    for commission in payload["commissions"]:
+        publish_event(cursor, COMMISSION_EARNED, commission["earner_id"], {"employee_id": commission["earner_id"], "amount": commission["amount"]})
+
+
+def publish_funds_added(cursor, payload: dict):
+    publish_event(cursor, FUNDS_ADDED, payload["employee_id"], payload)
+
+
+def fetch_events_after(last_id: int, gap_ids: tuple = (), limit: int = LIVE_EVENTS_BATCH) -> list:
+    """Events above last_id, plus any of gap_ids that have committed since the last poll"""
+    gap_filter = f" OR id IN ({', '.join(['%s'] * len(gap_ids))})" if gap_ids else ""
+    return fetch_all(
+        f"SELECT id, event_type, audience, payload FROM live_events WHERE id > %s{gap_filter} ORDER BY id LIMIT %s",
+        (last_id, *gap_ids, limit)
+    )
+
+
+def get_latest_event_id() -> int:
+    return fetch_one("SELECT COALESCE(MAX(id), 0) AS id FROM live_events")["id"]
+
+
+def purge_live_events():
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            "DELETE FROM live_events WHERE created_at < %s",
+            (now_ist() - timedelta(hours=LIVE_EVENTS_RETENTION_HOURS),)
+        )
+        conn.commit()
+        print(f"[INFO]: {cursor.rowcount} LIVE EVENTS PURGED")
+    finally:
+        conn.close()
+
+
+class Subscriber:
+    def __init__(self, role: str, emp_id: str):
+        self.role = role
+        self.emp_id = emp_id
+        self.queue = asyncio.Queue(maxsize=LIVE_EVENTS_QUEUE_SIZE)
+
+    def wants(self, audience: list) -> bool:
+        return self.role in GLOBAL_ROLES or self.emp_id in audience
+
+    def offer(self, event: dict):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # a stalled client gets a single resync instead of an unbounded backlog
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"id": event["id"], "type": "resync", "data": {}})
+
+
+# per worker: one poller reads new events for every connected dashboard on this worker
+_subscribers = set()
+_pump_task = None
+_last_event_id = None
+# ids below _last_event_id not seen yet -> monotonic time they were skipped. Dispatchers on other
+# workers insert concurrently, so a lower id can commit after a higher one was read; rolled back
+# inserts leave ids that never fill, they are dropped after LIVE_EVENTS_GAP_SECONDS.
+_gaps = {}
+
+def _to_event(row: dict) -> tuple:
+    audience = orjson.loads(row["audience"])
+    return audience, {"id": row["id"], "type": row["event_type"], "data": orjson.loads(row["payload"])}
+
+
+def _track_gaps(row_id: int) -> bool:
+    """Advance past row_id, remembering the ids skipped on the way. False for rows already delivered."""
+    global _last_event_id
+    if _gaps.pop(row_id, None) is not None:
+        return True
+    if row_id <= _last_event_id:
+        return False
+
+    now = time.monotonic()
+    for missing in range(max(_last_event_id + 1, row_id - LIVE_EVENTS_MAX_GAPS), row_id):
+        _gaps[missing] = now
+    _last_event_id = row_id
+    return True
+
+
+def _expire_gaps():
+    now = time.monotonic()
+    for row_id in [row_id for row_id, skipped_at in _gaps.items() if now - skipped_at > LIVE_EVENTS_GAP_SECONDS]:
+        del _gaps[row_id]
+    # oldest first, dicts keep insertion order
+    while len(_gaps) > LIVE_EVENTS_MAX_GAPS:
+        del _gaps[next(iter(_gaps))]
+
+
+async def _pump():
+    global _pump_task, _last_event_id
+    try:
+        if _last_event_id is None:
+            _last_event_id = await asyncio.to_thread(get_latest_event_id)
+
+        while _subscribers:
+            try:
+                rows = await asyncio.to_thread(fetch_events_after, _last_event_id, tuple(_gaps))
+            except Exception as err:
+                print("[INFO]: CANNOT READ LIVE EVENTS")
+                print(err)
+                rows = []
+
+            for row in rows:
+                if not _track_gaps(row["id"]):
+                    continue
+                audience, event = _to_event(row)
+                for subscriber in list(_subscribers):
+                    if subscriber.wants(audience):
+                        subscriber.offer(event)
+            _expire_gaps()
+
+            if len(rows) < LIVE_EVENTS_BATCH:
+                await asyncio.sleep(LIVE_EVENTS_POLL_SECONDS)
+    finally:
+        # idle workers stop polling; the next subscriber starts from the newest event
+        _pump_task = None
+        _last_event_id = None
+        _gaps.clear()
+
+
+def subscribe(role: str, emp_id: str) -> Subscriber:
+    global _pump_task
+    subscriber = Subscriber(role, emp_id)
+    _subscribers.add(subscriber)
+    if _pump_task is None:
+        _pump_task = asyncio.create_task(_pump())
+    return subscriber
+
+
+def unsubscribe(subscriber: Subscriber):
+    _subscribers.discard(subscriber)
+
+
+def format_sse(event: dict) -> bytes:
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (event["id"], event["type"].encode(), orjson.dumps(event["data"]))
+
+
+async def stream_events(request, subscriber: Subscriber, last_event_id: str = None):
+    """
+    SSE body for one dashboard: events it missed since Last-Event-ID, then live events,
+    with a comment line as heartbeat so proxies keep the connection open.
+    """
+    # ids already sent, the replay and the live queue overlap and late gap events arrive out of order
+    sent_ids = set()
+    sent_order = deque()
+
+    def first_send(event_id: int) -> bool:
+        if event_id in sent_ids:
+            return False
+        sent_ids.add(event_id)
+        sent_order.append(event_id)
+        if len(sent_order) > LIVE_EVENTS_MAX_GAPS:
+            sent_ids.discard(sent_order.popleft())
+        return True
+
+    try:
+        if last_event_id and last_event_id.isdigit():
+            for row in await asyncio.to_thread(fetch_events_after, int(last_event_id)):
+                audience, event = _to_event(row)
+                if subscriber.wants(audience) and first_send(event["id"]):
+                    yield format_sse(event)
+
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(subscriber.queue.get(), LIVE_EVENTS_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield b": ping\n\n"
+                continue
+            if event["type"] == "resync" or first_send(event["id"]):
+                yield format_sse(event)
+    finally:
+        unsubscribe(subscriber)
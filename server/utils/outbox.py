@@ -0,0 +1,184 @@
+import argparse
+import os
+from datetime import timedelta
+import orjson
+from utils.db_config import get_db_connection
+from utils.clock import now_ist
+
+OUTBOX_POLL_SECONDS = int(os.getenv("OUTBOX_POLL_SECONDS", 1))
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", 200))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", 8))
+OUTBOX_RETENTION_DAYS = int(os.getenv("OUTBOX_RETENTION_DAYS", 7))
+
+EMPLOYEE_CREATED = "employee_created"
+FUNDS_ADDED = "funds_added"
+
+# event type -> handlers, each called as handler(cursor, payload)
+_handlers = {}
+
+def register_handler(event_type: str, handler):
+    """
+    Add a side effect for event_type. Handlers run on the dispatcher's cursor,
+    so their writes commit together with the event being marked processed.
+    """
+    handlers = _handlers.setdefault(event_type, [])
+    if handler not in handlers:
+        handlers.append(handler)
+
+
+def enqueue_event(cursor, event_type: str, payload: dict):
+    """
+    Write the event on the caller's cursor, so it commits or rolls back with the write itself.
+    Handlers run later in dispatch_outbox, off the request path.
+    """
+    cursor.execute(
+        "INSERT INTO outbox (event_type, payload, created_at, next_attempt_at) VALUES (%s, %s, %s, %s)",
+        (event_type, orjson.dumps(payload), now_ist(), now_ist())
+    )
+
+
+def dispatch_outbox(batch_size: int = OUTBOX_BATCH_SIZE) -> int:
+    """
+    Claim a batch of due events (SKIP LOCKED, so every worker can dispatch without overlap)
+    and run their handlers in the claiming transaction. Each event gets a savepoint:
+    a failing handler rolls back only its own event, which is retried with exponential backoff.
+    After OUTBOX_MAX_ATTEMPTS it is dead-lettered: kept with its last_error and no longer
+    claimed until requeue_dead_letters puts it back in line.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    processed = 0
+
+    try:
+        now = now_ist()
+        cursor.execute(
+            """
+            SELECT id, event_type, payload, attempts
+            FROM outbox
+            WHERE processed_at IS NULL AND dead_lettered_at IS NULL AND next_attempt_at <= %s
+            ORDER BY id
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+            """,
+            (now, batch_size)
+        )
+        events = cursor.fetchall()
+
+        for event_id, event_type, payload, attempts in events:
+            cursor.execute("SAVEPOINT outbox_event")
+            try:
+                data = orjson.loads(payload)
+                for handler in _handlers.get(event_type, []):
+                    handler(cursor, data)
+                cursor.execute("UPDATE outbox SET processed_at = %s WHERE id = %s", (now, event_id))
+                processed += 1
+
+            except Exception as err:
+                cursor.execute("ROLLBACK TO SAVEPOINT outbox_event")
+                dead_lettered_at = now if attempts + 1 >= OUTBOX_MAX_ATTEMPTS else None
+                if dead_lettered_at:
+                    print(f"[ERROR]: OUTBOX EVENT {event_id} ({event_type}) DEAD-LETTERED AFTER {attempts + 1} ATTEMPTS")
+                else:
+                    print(f"[INFO]: OUTBOX EVENT {event_id} ({event_type}) FAILED")
+                print(err)
+                cursor.execute(
+                    """
+                    UPDATE outbox
+                    SET attempts = attempts + 1, next_attempt_at = %s, last_error = %s, dead_lettered_at = %s
+                    WHERE id = %s
+                    """,
+                    (now + timedelta(seconds=2 ** attempts), str(err)[:1000], dead_lettered_at, event_id)
+                )
+
+        conn.commit()
+        return processed
+
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def list_dead_letters() -> list:
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            """
+            SELECT id, event_type, attempts, dead_lettered_at, last_error
+            FROM outbox
+            WHERE processed_at IS NULL AND dead_lettered_at IS NOT NULL
+            ORDER BY id
+            """
+        )
+        return cursor.fetchall()
+    finally:
+        conn.close()
+
+
+def report_dead_letters(cursor) -> int:
+    """
+    Rebuilds leave dead-lettered events out, like every other event not applied yet,
+    so they log how many are waiting for requeue_dead_letters instead of drifting quietly.
+    """
+    cursor.execute("SELECT COUNT(*) AS dead_letters FROM outbox WHERE processed_at IS NULL AND dead_lettered_at IS NOT NULL")
+    row = cursor.fetchone()
+    count = row["dead_letters"] if isinstance(row, dict) else row[0]
+    if count:
+        print(f"[ERROR]: {count} DEAD-LETTERED OUTBOX EVENTS NOT APPLIED, SEE python -m utils.outbox dead-letters")
+    return count
+
+
+def requeue_dead_letters(event_ids: list = None) -> int:
+    """
+    Put dead-lettered events (all, or just event_ids) back in line with a fresh set of attempts,
+    once whatever made their handlers fail is fixed. Until then the rollup rebuilds keep
+    treating them as pending, so replaying them does not count anything twice.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        query = """
+            UPDATE outbox SET attempts = 0, next_attempt_at = %s, dead_lettered_at = NULL
+            WHERE processed_at IS NULL AND dead_lettered_at IS NOT NULL
+        """
+        params = [now_ist()]
+        if event_ids:
+            query += f" AND id IN ({', '.join(['%s'] * len(event_ids))})"
+            params.extend(event_ids)
+        cursor.execute(query, tuple(params))
+        conn.commit()
+        print(f"[INFO]: {cursor.rowcount} DEAD-LETTERED OUTBOX EVENTS REQUEUED")
+        return cursor.rowcount
+    finally:
+        conn.close()
+
+
+def purge_outbox():
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            "DELETE FROM outbox WHERE processed_at < %s",
+            (now_ist() - timedelta(days=OUTBOX_RETENTION_DAYS),)
+        )
+        conn.commit()
+        print(f"[INFO]: {cursor.rowcount} OUTBOX EVENTS PURGED")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    # python -m utils.outbox dead-letters
+    # python -m utils.outbox requeue [EVENT_ID ...]     (every dead-lettered event without ids)
+    parser = argparse.ArgumentParser(description="Inspect and replay dead-lettered outbox events")
+    parser.add_argument("command", choices=["dead-letters", "requeue"])
+    parser.add_argument("event_ids", nargs="*", type=int)
+    args = parser.parse_args()
+
+    if args.command == "dead-letters":
+        for event_id, event_type, attempts, dead_lettered_at, last_error in list_dead_letters():
+            print(f"{event_id}  {event_type}  {attempts} attempts  {dead_lettered_at}  {last_error}")
+    else:
+        requeue_dead_letters(args.event_ids)
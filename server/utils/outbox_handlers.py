@@ -0,0 +1,10 @@
+from utils.outbox import register_handler, EMPLOYEE_CREATED, FUNDS_ADDED
+from utils.live_events import publish_employee_created, publish_funds_added
+from utils.geo_rollup import apply_employee_created, apply_funds_added
+
+def register_default_handlers():
+    # derived views of a write; new consumers go here instead of into the request's transaction
+    register_handler(EMPLOYEE_CREATED, apply_employee_created)
+    register_handler(EMPLOYEE_CREATED, publish_employee_created)
+    register_handler(FUNDS_ADDED, apply_funds_added)
+    register_handler(FUNDS_ADDED, publish_funds_added)
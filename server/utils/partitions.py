@@ -0,0 +1,208 @@
+import argparse
+import os
+import re
+from datetime import date
+from utils.db_config import get_db_connection, DATABASE
+from utils.clock import today_ist
+
+# time-series table -> partitioning column
+PARTITIONED_TABLES = {
+    "funds_transfer_history": "transferred_at",
+    "commisions": "registered_at",
+}
+ARCHIVE_SUFFIX = "_archive"
+
+PARTITION_MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", 3))
+ARCHIVE_AFTER_YEARS = int(os.getenv("ARCHIVE_AFTER_YEARS", 3))
+
+MONTH_PARTITION = re.compile(r"^p(\d{4})(\d{2})$")
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _month_partition(month: date) -> str:
+    # pYYYYMM holds rows of that month: everything below the first day of the next one
+    return f"PARTITION p{month:%Y%m} VALUES LESS THAN (TO_DAYS('{_add_months(month, 1).isoformat()}'))"
+
+
+def get_month_partitions(cursor, table: str) -> list:
+    """First days of the months that have their own partition, oldest first"""
+    cursor.execute(
+        """
+        SELECT partition_name FROM information_schema.partitions
+        WHERE table_schema = %s AND table_name = %s AND partition_name IS NOT NULL
+        ORDER BY partition_ordinal_position
+        """,
+        (DATABASE, table)
+    )
+    months = []
+    for (name,) in cursor.fetchall():
+        match = MONTH_PARTITION.match(name)
+        if match:
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return months
+
+
+def is_partitioned(cursor, table: str) -> bool:
+    cursor.execute(
+        """
+        SELECT EXISTS(
+            SELECT 1 FROM information_schema.partitions
+            WHERE table_schema = %s AND table_name = %s AND partition_name IS NOT NULL
+        )
+        """,
+        (DATABASE, table)
+    )
+    return bool(cursor.fetchone()[0])
+
+
+def ensure_future_partitions(months_ahead: int = PARTITION_MONTHS_AHEAD):
+    """
+    Split p_future so every month up to months_ahead has its own partition.
+    p_future is normally empty, which keeps the reorganize a metadata change.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        current = today_ist().replace(day=1)
+        target = _add_months(current, months_ahead)
+
+        for table in PARTITIONED_TABLES:
+            if not is_partitioned(cursor, table):
+                continue
+
+            existing = get_month_partitions(cursor, table)
+            month = _add_months(existing[-1], 1) if existing else current
+            new_months = []
+            while month <= target:
+                new_months.append(month)
+                month = _add_months(month, 1)
+
+            if not new_months:
+                continue
+
+            partitions = ", ".join(_month_partition(month) for month in new_months)
+            cursor.execute(
+                f"ALTER TABLE {table} REORGANIZE PARTITION p_future INTO "
+                f"({partitions}, PARTITION p_future VALUES LESS THAN MAXVALUE)"
+            )
+            print(f"[INFO]: {len(new_months)} PARTITIONS ADDED TO {table}")
+
+    except Exception as err:
+        print("[INFO]: CANNOT CREATE FUTURE PARTITIONS")
+        print(err)
+        raise
+    finally:
+        conn.close()
+
+
+def archive_old_partitions(years: int = ARCHIVE_AFTER_YEARS) -> int:
+    """
+    Copy month partitions older than `years` into the compressed <table>_archive tables,
+    then drop them. INSERT IGNORE keeps a re-run after a failed drop from duplicating rows.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    archived = 0
+
+    try:
+        cutoff = _add_months(today_ist().replace(day=1), -12 * years)
+
+        for table in PARTITIONED_TABLES:
+            for month in get_month_partitions(cursor, table):
+                if month >= cutoff:
+                    break
+
+                partition = f"p{month:%Y%m}"
+                cursor.execute(f"INSERT IGNORE INTO {table}{ARCHIVE_SUFFIX} SELECT * FROM {table} PARTITION ({partition})")
+                conn.commit()
+                cursor.execute(f"ALTER TABLE {table} DROP PARTITION {partition}")
+                archived += 1
+                print(f"[INFO]: {table} PARTITION {partition} ARCHIVED")
+
+        return archived
+
+    except Exception as err:
+        conn.rollback()
+        print("[INFO]: CANNOT ARCHIVE PARTITIONS")
+        print(err)
+        raise
+    finally:
+        conn.close()
+
+
+def migrate_to_partitions(table: str):
+    """
+    One-off conversion of a table created before partitioning. Rebuilds the whole table,
+    so run it from the CLI in a quiet window, not at startup.
+    """
+    column = PARTITIONED_TABLES[table]
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        if is_partitioned(cursor, table):
+            print(f"[INFO]: {table} IS ALREADY PARTITIONED")
+            return
+
+        # partitioned InnoDB tables cannot have foreign keys
+        cursor.execute(
+            """
+            SELECT constraint_name FROM information_schema.table_constraints
+            WHERE table_schema = %s AND table_name = %s AND constraint_type = 'FOREIGN KEY'
+            """,
+            (DATABASE, table)
+        )
+        for (constraint,) in cursor.fetchall():
+            cursor.execute(f"ALTER TABLE {table} DROP FOREIGN KEY {constraint}")
+
+        cursor.execute(f"SELECT MIN({column}) FROM {table}")
+        oldest = cursor.fetchone()[0]
+        first = (oldest.date() if oldest else today_ist()).replace(day=1)
+        last = _add_months(today_ist().replace(day=1), PARTITION_MONTHS_AHEAD)
+
+        months = []
+        month = first
+        while month <= last:
+            months.append(month)
+            month = _add_months(month, 1)
+
+        print(f"[INFO]: PARTITIONING {table} INTO {len(months)} MONTHS")
+        cursor.execute(
+            f"ALTER TABLE {table} MODIFY {column} DATETIME NOT NULL, "
+            f"DROP PRIMARY KEY, ADD PRIMARY KEY (id, {column})"
+        )
+        partitions = ", ".join(_month_partition(month) for month in months)
+        cursor.execute(
+            f"ALTER TABLE {table} PARTITION BY RANGE (TO_DAYS({column})) "
+            f"({partitions}, PARTITION p_future VALUES LESS THAN MAXVALUE)"
+        )
+        print(f"[INFO]: {table} PARTITIONED")
+
+    except Exception as err:
+        print(f"[INFO]: CANNOT PARTITION {table}")
+        print(err)
+        raise
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    # python -m utils.partitions migrate     (once, for databases created before partitioning)
+    # python -m utils.partitions maintain
+    # python -m utils.partitions archive [--years 3]
+    parser = argparse.ArgumentParser(description="Monthly partitions of the time-series tables")
+    parser.add_argument("command", choices=["migrate", "maintain", "archive"])
+    parser.add_argument("--years", type=int, default=ARCHIVE_AFTER_YEARS)
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        for table in PARTITIONED_TABLES:
+            migrate_to_partitions(table)
+    elif args.command == "maintain":
+        ensure_future_partitions()
+    else:
+        archive_old_partitions(args.years)
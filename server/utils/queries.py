@@ -0,0 +1,129 @@
+import argparse
+import time
+import tracemalloc
+from dataclasses import make_dataclass
+from utils.db_config import get_db_connection
+from utils.statements import execute_cached
+
+def _field_name(column: str) -> str:
+    # "e.name AS created_employee_name" -> created_employee_name, "c.id" -> id
+    parts = column.split()
+    return parts[-1] if len(parts) > 1 else column.rsplit(".", 1)[-1]
+
+
+def row_type(name: str, columns: list):
+    """
+    Slots dataclass with one field per projected column, in SELECT order, so rows are
+    built straight from the driver's tuples. orjson serializes it like a dict.
+    The SQL projection is kept on the class as `projection`.
+    """
+    cls = make_dataclass(name, [_field_name(column) for column in columns], slots=True)
+    cls.projection = ", ".join(columns)
+    return cls
+
+
+class Query:
+    """
+    One query shape, built once at import: the SQL with {columns} filled in from the
+    row type's projection and any other {placeholder} from fragments (fixed WHERE clauses).
+    Runs as a cached prepared statement on the given connection.
+    """
+    __slots__ = ("row_type", "sql")
+
+    def __init__(self, row_type, sql: str, **fragments):
+        self.row_type = row_type
+        self.sql = sql.format(columns=row_type.projection, **fragments)
+
+    def all(self, conn, params=()) -> list:
+        row_type = self.row_type
+        return [row_type(*row) for row in execute_cached(conn, self.sql, params).fetchall()]
+
+    def one(self, conn, params=()):
+        row = execute_cached(conn, self.sql, params).fetchone()
+        return self.row_type(*row) if row else None
+
+
+def fetch_rows(query: Query, params=(), connect_with=get_db_connection) -> list:
+    """Query.all on its own connection, for handlers that run queries concurrently in threads"""
+    conn = connect_with()
+    try:
+        return query.all(conn, params)
+    finally:
+        conn.close()
+
+
+# commission rows as the dashboards read them, c is commisions
+COMMISSION_COLUMNS = [
+    "c.id", "c.manager_id", "c.field_manager_id", "c.manager_commision", "c.field_manager_commision",
+    "c.created_role", "c.created_id", "c.registered_at"
+]
+
+Commission = row_type("Commission", COMMISSION_COLUMNS)
+# e is the created employee, m the manager and fm the field manager
+CommissionWithCreator = row_type("CommissionWithCreator", COMMISSION_COLUMNS + ["e.name AS created_employee_name"])
+CommissionWithManager = row_type(
+    "CommissionWithManager",
+    COMMISSION_COLUMNS + ["e.name AS created_employee_name", "m.name AS manager_name"]
+)
+CommissionWithNames = row_type(
+    "CommissionWithNames",
+    COMMISSION_COLUMNS + ["m.name AS manager_name", "fm.name AS field_manager_name", "e.name AS created_employee_name"]
+)
+
+# the field manager dashboard and the bootstrap endpoint list the same rows
+FIELD_MANAGER_COMMISSION_HISTORY = Query(CommissionWithCreator, """
+    SELECT {columns}
+    FROM commisions c
+    LEFT JOIN employees e ON c.created_id = e.id
+    WHERE c.field_manager_id = %s
+    ORDER BY c.registered_at DESC
+""")
+
+
+if __name__ == "__main__":
+    # python -m utils.queries [--rows 100000]
+    import orjson
+    from collections import namedtuple
+    from datetime import datetime
+
+    parser = argparse.ArgumentParser(description="Row building cost and memory: dict per row vs row types")
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    names = [_field_name(column) for column in COMMISSION_COLUMNS]
+    registered_at = datetime(2025, 1, 1, 10, 30)
+    rows = [
+        (i, "MGR0001", "FM0001", 100, 50, "home-teacher", f"HT{i:06}", registered_at)
+        for i in range(args.rows)
+    ]
+    CommissionTuple = namedtuple("CommissionTuple", names)
+
+    builders = (
+        # what the dictionary cursor does for every row
+        ("dict per row", lambda: [dict(zip(names, row)) for row in rows]),
+        ("namedtuple", lambda: [CommissionTuple(*row) for row in rows]),
+        ("slots dataclass", lambda: [Commission(*row) for row in rows]),
+    )
+
+    for name, build in builders:
+        started = time.perf_counter()
+        built = build()
+        build_ms = (time.perf_counter() - started) * 1000
+
+        try:
+            started = time.perf_counter()
+            orjson.dumps(built)
+            dump = f"{(time.perf_counter() - started) * 1000:7.1f} ms"
+        except TypeError:
+            # tuple subclasses are rejected by orjson
+            dump = "not serializable"
+        del built
+
+        # measured separately, tracing allocations slows the build down
+        tracemalloc.start()
+        built = build()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del built
+
+        print(f"{name:<16} build {build_ms:7.1f} ms  peak {peak / 2**20:6.1f} MiB  orjson {dump}")
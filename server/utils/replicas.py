@@ -0,0 +1,246 @@
+import os
+import hashlib
+import itertools
+import threading
+import time
+from contextvars import ContextVar
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Receive, Scope, Send
+from utils.db_config import connect, create_pool, get_db_connection, USER, PWD, DATABASE, POOL_SIZE
+
+# REPLICA_HOSTS=db-replica-1,db-replica-2:3307, same user, password and database as the primary
+REPLICA_HOSTS = [host.strip() for host in os.getenv("REPLICA_HOSTS", "").split(",") if host.strip()]
+REPLICA_POOL_SIZE = int(os.getenv("REPLICA_POOL_SIZE", POOL_SIZE))
+# round_robin or least_latency
+REPLICA_SELECTION = os.getenv("REPLICA_SELECTION", "round_robin")
+REPLICA_MAX_LAG_SECONDS = int(os.getenv("REPLICA_MAX_LAG_SECONDS", 5))
+REPLICA_CHECK_SECONDS = int(os.getenv("REPLICA_CHECK_SECONDS", 10))
+# reads of a session that wrote within this window go to the primary
+READ_YOUR_WRITES_SECONDS = int(os.getenv("READ_YOUR_WRITES_SECONDS", 10))
+
+# time of the session's last write, set on responses of requests that called mark_write.
+# The dashboards call the API cross-origin without credentials, so a cookie would never come
+# back; they echo this header on their next requests instead (exposed through CORS in main.py)
+WRITE_HEADER = "X-Last-Write"
+
+# set per request by ReadYourWritesMiddleware: {"wrote": bool, "last_write_at": epoch seconds or None}
+_session = ContextVar("db_session", default=None)
+
+# session key -> time of its last write seen by this worker
+_last_writes = {}
+_writes_lock = threading.Lock()
+
+
+class Replica:
+    def __init__(self, index: int, address: str):
+        host, _, port = address.partition(":")
+        self.index = index
+        self.host = host
+        self.port = int(port) if port else 3306
+        self.pool = None
+        self.pool_lock = threading.Lock()
+        # unhealthy until the first check passes
+        self.healthy = False
+        self.lag_seconds = None
+        self.latency_ms = None
+        self.error = None
+        self.checked_at = None
+
+    @property
+    def name(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    def get_pool(self):
+        if self.pool is None:
+            with self.pool_lock:
+                if self.pool is None:
+                    self.pool = create_pool(
+                        f"sbc_replica_{self.index}",
+                        REPLICA_POOL_SIZE,
+                        host=self.host,
+                        port=self.port,
+                        user=USER,
+                        password=PWD,
+                        database=DATABASE
+                    )
+        return self.pool
+
+    def get_connection(self):
+        from mysql.connector.errors import PoolError
+
+        try:
+            return self.get_pool().get_connection()
+        except PoolError:
+            return connect(host=self.host, port=self.port, user=USER, password=PWD, database=DATABASE)
+
+    def mark_unhealthy(self, err):
+        self.healthy = False
+        self.error = str(err)
+
+    def status(self) -> dict:
+        return {
+            "host": self.name,
+            "healthy": self.healthy,
+            "lag_seconds": self.lag_seconds,
+            "latency_ms": self.latency_ms,
+            "error": self.error,
+            "checked_at": self.checked_at
+        }
+
+
+replicas = [Replica(index, address) for index, address in enumerate(REPLICA_HOSTS)]
+_round_robin = itertools.count()
+
+
+def check_replica(replica: Replica):
+    """
+    Replication lag from SHOW REPLICA STATUS and the round trip time of that query.
+    A stopped SQL thread reports NULL lag and counts as unhealthy.
+    """
+    started = time.perf_counter()
+    try:
+        conn = replica.get_connection()
+        try:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute("SHOW REPLICA STATUS")
+            status = cursor.fetchone()
+        finally:
+            conn.close()
+
+        replica.latency_ms = round((time.perf_counter() - started) * 1000, 2)
+        replica.lag_seconds = status.get("Seconds_Behind_Source") if status else None
+        replica.checked_at = time.time()
+
+        if replica.lag_seconds is None:
+            replica.mark_unhealthy("replication not running")
+        elif replica.lag_seconds > REPLICA_MAX_LAG_SECONDS:
+            replica.mark_unhealthy(f"lagging {replica.lag_seconds}s")
+        else:
+            replica.healthy = True
+            replica.error = None
+
+    except Exception as err:
+        replica.checked_at = time.time()
+        replica.mark_unhealthy(err)
+
+
+def check_replicas():
+    for replica in replicas:
+        was_healthy = replica.healthy
+        check_replica(replica)
+        if was_healthy != replica.healthy:
+            state = "HEALTHY" if replica.healthy else f"OUT OF ROTATION ({replica.error})"
+            print(f"[INFO]: REPLICA {replica.name} {state}")
+
+
+def get_replica_status() -> list:
+    return [replica.status() for replica in replicas]
+
+
+def _choose_replica():
+    healthy = [replica for replica in replicas if replica.healthy]
+    if not healthy:
+        return None
+    if REPLICA_SELECTION == "least_latency":
+        return min(healthy, key=lambda replica: replica.latency_ms)
+    return healthy[next(_round_robin) % len(healthy)]
+
+
+def session_wrote_recently() -> bool:
+    session = _session.get()
+    if session is None or session["last_write_at"] is None:
+        return False
+    return time.time() - session["last_write_at"] < READ_YOUR_WRITES_SECONDS
+
+
+def mark_write():
+    """
+    Called by write handlers after their commit: the rest of this request and the session's
+    reads for READ_YOUR_WRITES_SECONDS go to the primary, on every worker.
+    """
+    session = _session.get()
+    if session is not None:
+        session["wrote"] = True
+        session["last_write_at"] = time.time()
+
+
+def _remember_write(key: str, wrote_at: float):
+    with _writes_lock:
+        _last_writes[key] = wrote_at
+        # drop sessions whose window has passed so the map stays small
+        if len(_last_writes) > 10000:
+            for stale in [k for k, t in _last_writes.items() if wrote_at - t >= READ_YOUR_WRITES_SECONDS]:
+                del _last_writes[stale]
+
+
+def _last_write_at(headers: Headers, key: str):
+    """Latest write of the session: the header echoed from whichever worker took it, or this worker's map"""
+    wrote_at = None
+    try:
+        wrote_at = float(headers.get(WRITE_HEADER, ""))
+    except ValueError:
+        pass
+
+    if key is not None:
+        with _writes_lock:
+            remembered = _last_writes.get(key)
+        if remembered is not None and (wrote_at is None or remembered > wrote_at):
+            wrote_at = remembered
+    return wrote_at
+
+
+def get_read_connection():
+    """
+    Connection for read-only handlers: a healthy replica, or the primary when no replica
+    is configured or healthy, or when this session wrote in the last READ_YOUR_WRITES_SECONDS.
+    """
+    if not replicas or session_wrote_recently():
+        return get_db_connection()
+
+    replica = _choose_replica()
+    if replica is None:
+        return get_db_connection()
+
+    try:
+        return replica.get_connection()
+    except Exception as err:
+        # out of rotation until the next health check brings it back
+        replica.mark_unhealthy(err)
+        print(f"[INFO]: REPLICA {replica.name} FAILED, READING FROM PRIMARY")
+        return get_db_connection()
+
+
+class ReadYourWritesMiddleware:
+    """
+    Tracks each session's last write so get_read_connection keeps it on the primary until
+    the replicas have caught up. Handlers flag their writes with mark_write; the time goes
+    back in the X-Last-Write header, which the client echoes so any worker sees it, and into
+    this worker's map keyed by the bearer token for clients that do not echo it.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not replicas:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        authorization = headers.get("authorization")
+        key = hashlib.sha256(authorization.encode()).hexdigest()[:32] if authorization else None
+        session = {"wrote": False, "last_write_at": _last_write_at(headers, key)}
+        token = _session.set(session)
+
+        async def send_and_record(message):
+            if message["type"] == "http.response.start" and session["wrote"] and message["status"] < 400:
+                wrote_at = session["last_write_at"]
+                if key is not None:
+                    _remember_write(key, wrote_at)
+                MutableHeaders(scope=message)[WRITE_HEADER] = f"{wrote_at:.3f}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_record)
+        finally:
+            _session.reset(token)
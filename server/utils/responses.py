@@ -0,0 +1,65 @@
+import argparse
+import json
+import random
+import timeit
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+import orjson
+from fastapi.responses import JSONResponse
+
+def _orjson_default(value):
+    # SUM()/AVG() columns come back as Decimal; encode them like jsonable_encoder does
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    App wide default response class. orjson encodes datetime and date natively,
+    so handlers returning large lists of DB rows can return ORJSONResponse(...)
+    directly and skip FastAPI's recursive jsonable_encoder pass.
+    """
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+if __name__ == "__main__":
+    # python -m utils.responses [--rows 50000]
+    from fastapi.encoders import jsonable_encoder
+
+    parser = argparse.ArgumentParser(description="Benchmark employee list serialization")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--number", type=int, default=5)
+    args = parser.parse_args()
+
+    joined = datetime(2024, 1, 1, 9, 30)
+    employees = [
+        {
+            "id": f"HT-{i:07d}",
+            "name": f"Employee {i}",
+            "email": f"employee{i}@example.com",
+            "phn": f"98{i:08d}",
+            "role": random.choice(["manager", "field-manager", "home-teacher"]),
+            "DOB": date(1990, 1, 1) + timedelta(days=i % 3650),
+            "funds": Decimal(i % 10000),
+            "manager_id": f"FM-{i // 20:07d}",
+            "created_at": joined + timedelta(minutes=i)
+        }
+        for i in range(args.rows)
+    ]
+    content = {"status": "success", "employees": employees}
+
+    def stdlib():
+        return json.dumps(jsonable_encoder(content)).encode()
+
+    def fast():
+        return ORJSONResponse(content).body
+
+    for name, func in (("jsonable_encoder + json", stdlib), ("ORJSONResponse", fast)):
+        seconds = timeit.timeit(func, number=args.number) / args.number
+        print(f"{name:<24} {seconds * 1000:.1f} ms for {args.rows} rows")
@@ -0,0 +1,119 @@
+import bisect
+import os
+from datetime import date
+from typing import NamedTuple
+from utils.db_config import get_db_connection
+from utils.clock import today_ist
+from utils.data_version import get_data_versions, RULES
+
+RULES_REFRESH_SECONDS = int(os.getenv("RULES_REFRESH_SECONDS", 60))
+
+class CompensationRule(NamedTuple):
+    role: str
+    region: str
+    effective_from: date
+    cost: int
+    manager_commission: int
+    field_manager_commission: int
+    basic_salary: int
+    allowances: int
+    deductions: int
+
+    @property
+    def net_salary(self) -> int:
+        return self.basic_salary + self.allowances - self.deductions
+
+
+# seeded into an empty compensation_rules table, and used until the table is first loaded
+DEFAULT_RULES = [
+    CompensationRule("field-manager", "", date(2020, 1, 1), 950, 50, 0, 0, 0, 0),
+    CompensationRule("home-teacher", "", date(2020, 1, 1), 4950, 50, 150, 1000, 50, 0),
+]
+
+RULE_COLUMNS = "role, region, effective_from, cost, manager_commission, field_manager_commission, basic_salary, allowances, deductions"
+
+
+class RuleSet:
+    """
+    Rules compiled into (role, region) -> rules ordered by effective_from,
+    so a lookup is a dict hit plus a bisect over a handful of dates.
+    An empty region is the fallback for every region.
+    """
+
+    def __init__(self, rules, version=None):
+        self.version = version
+        self._rules = {}
+        for rule in sorted(rules, key=lambda r: r.effective_from):
+            self._rules.setdefault((rule.role, rule.region), []).append(rule)
+        self._dates = {key: [r.effective_from for r in rules] for key, rules in self._rules.items()}
+
+    def get(self, role: str, region: str = None, on: date = None) -> CompensationRule:
+        on = on or today_ist()
+        for key in ((role, region or ""), (role, "")):
+            dates = self._dates.get(key)
+            if not dates:
+                continue
+            index = bisect.bisect_right(dates, on)
+            if index:
+                return self._rules[key][index - 1]
+        raise ValueError(f"No compensation rule for {role}")
+
+
+_rule_set = RuleSet(DEFAULT_RULES)
+
+def get_rule(role: str, region: str = None, on: date = None) -> CompensationRule:
+    return _rule_set.get(role, region, on)
+
+
+def loaded_rules_version() -> int:
+    """RULES version of the rule set this worker is using"""
+    return _rule_set.version or 0
+
+
+def get_rules_version(cursor) -> int:
+    """The RULES data_version counter, bumped by every compensation rule write"""
+    return get_data_versions(cursor, RULES)[0]
+
+
+def load_rules():
+    """Compile compensation_rules into a new RuleSet, seeding the defaults into an empty table"""
+    global _rule_set
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        # read first: a write landing after it bumps the counter again and triggers the next reload
+        version = get_rules_version(cursor)
+        cursor.execute(f"SELECT {RULE_COLUMNS} FROM compensation_rules")
+        rows = cursor.fetchall()
+
+        if not rows:
+            cursor.executemany(
+                f"INSERT INTO compensation_rules ({RULE_COLUMNS}) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)",
+                [tuple(rule) for rule in DEFAULT_RULES]
+            )
+            conn.commit()
+            rows = [tuple(rule) for rule in DEFAULT_RULES]
+
+        _rule_set = RuleSet([CompensationRule(*row) for row in rows], version)
+        print(f"[INFO]: {len(rows)} COMPENSATION RULES LOADED")
+
+    except Exception as err:
+        print("[ERROR]: CANNOT LOAD COMPENSATION RULES")
+        print(err)
+        raise
+    finally:
+        conn.close()
+
+
+def refresh_rules_if_changed():
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        version = get_rules_version(cursor)
+    finally:
+        conn.close()
+
+    if version != _rule_set.version:
+        load_rules()
+
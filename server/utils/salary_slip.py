@@ -0,0 +1,193 @@
+import argparse
+import os
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+from utils.db_config import get_db_connection
+from utils.data_version import bump_data_version, salary_slips_scope
+from utils.clock import now_ist, today_ist
+from utils.rules import get_rule, load_rules, loaded_rules_version
+from pydantic_models.models import HomeTeacherSalaryInfo
+
+SERVER_DIR = Path(__file__).parent.parent
+SALARY_SLIP_DIR = Path(os.getenv("SALARY_SLIP_DIR", SERVER_DIR / "salary_slips"))
+SALARY_SLIP_CHUNK_SIZE = int(os.getenv("SALARY_SLIP_CHUNK_SIZE", 500))
+SALARY_SLIP_WORKERS = int(os.getenv("SALARY_SLIP_WORKERS", os.cpu_count() or 1))
+
+MONTH_NAMES = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December"
+]
+
+def salary_slip_path(emp_id: str, year: int, month: int, rules_version: int = None) -> Path:
+    """
+    Keyed by the RULES version the slip was rendered with, so a compensation rule change
+    makes every worker render a fresh file instead of serving the old amounts
+    """
+    if rules_version is None:
+        rules_version = loaded_rules_version()
+    return SALARY_SLIP_DIR / f"{year}-{month:02d}" / f"{emp_id}.v{rules_version}.pdf"
+
+
+def build_salary_slip(emp_id: str, emp_name: str, year: int, month: int, region: str = None) -> dict:
+    rule = get_rule("home-teacher", region, datetime(year, month, 1).date())
+    slip = HomeTeacherSalaryInfo(
+        employee_id=emp_id,
+        employee_name=emp_name,
+        basic_salary=rule.basic_salary,
+        allowances=rule.allowances,
+        deductions=rule.deductions,
+        net_salary=rule.net_salary
+    ).model_dump()
+    slip["year"] = year
+    slip["month"] = month
+    slip["rules_version"] = loaded_rules_version()
+    return slip
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def render_salary_slip_pdf(slip: dict) -> bytes:
+    """Single page PDF using the built-in Helvetica font, no third party renderer needed"""
+    lines = [
+        "SBC Education - Salary Slip",
+        f"{MONTH_NAMES[slip['month'] - 1]} {slip['year']}",
+        "",
+        f"Employee ID: {slip['employee_id']}",
+        f"Employee Name: {slip['employee_name']}",
+        f"Designation: {slip['designation']}",
+        f"Department: {slip['department']}",
+        "",
+        f"Basic Salary: Rs. {slip['basic_salary']:.2f}",
+        f"Allowances: Rs. {slip['allowances']:.2f}",
+        f"Deductions: Rs. {slip['deductions']:.2f}",
+        f"Net Salary: Rs. {slip['net_salary']:.2f}",
+    ]
+
+    text = "\n".join(f"({_pdf_escape(line)}) Tj T*" for line in lines)
+    stream = f"BT\n/F1 12 Tf\n18 TL\n72 770 Td\n{text}\nET".encode("latin-1", errors="replace")
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream",
+    ]
+
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+
+    xref_offset = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        pdf += f"{offset:010d} 00000 n \n".encode()
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+
+    return bytes(pdf)
+
+
+def write_salary_slip_pdf(slip: dict) -> str:
+    """Render and store one slip; the rename keeps readers from seeing half written files"""
+    path = salary_slip_path(slip["employee_id"], slip["year"], slip["month"], slip["rules_version"])
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_bytes(render_salary_slip_pdf(slip))
+    os.replace(tmp_path, path)
+
+    return str(path)
+
+
+def generate_monthly_salary_slips(year: int, month: int, chunk_size: int = SALARY_SLIP_CHUNK_SIZE) -> int:
+    """
+    Pre-generate slips for every home teacher who joined on or before the first of the month.
+    Teachers are read in id ordered chunks, logged with one multi-row insert per chunk
+    and rendered to disk in a process pool. The pool's workers start from the calling
+    process, so this runs in its own process (the CLI below), never inside a server worker.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    month_start = datetime(year, month, 1)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    generated = 0
+    last_id = ""
+
+    try:
+        print(f"[INFO]: GENERATING SALARY SLIPS FOR {month}/{year}")
+
+        with ProcessPoolExecutor(max_workers=SALARY_SLIP_WORKERS) as pool:
+            while True:
+                cursor.execute(
+                    """
+                    SELECT id, name, state
+                    FROM employees
+                    WHERE role = 'home-teacher' AND created_at <= %s AND id > %s
+                    ORDER BY id
+                    LIMIT %s
+                    """,
+                    (month_start, last_id, chunk_size)
+                )
+                teachers = cursor.fetchall()
+                if not teachers:
+                    break
+
+                today_datetime = now_ist()
+                cursor.executemany(
+                    """
+                    INSERT INTO salary_slip_history (employee_id, month, year, generated_at)
+                    VALUES (%s, %s, %s, %s)
+                    ON DUPLICATE KEY UPDATE generated_at = VALUES(generated_at)
+                    """,
+                    [(emp_id, month, year, today_datetime) for emp_id, _, _ in teachers]
+                )
+                conn.commit()
+                bump_data_version(conn, *(salary_slips_scope(emp_id) for emp_id, _, _ in teachers))
+
+                slips = [build_salary_slip(emp_id, emp_name, year, month, state) for emp_id, emp_name, state in teachers]
+                list(pool.map(write_salary_slip_pdf, slips, chunksize=50))
+
+                generated += len(teachers)
+                last_id = teachers[-1][0]
+
+        print(f"[INFO]: {generated} SALARY SLIPS GENERATED")
+        return generated
+
+    except Exception as err:
+        conn.rollback()
+        print("[INFO]: CANNOT GENERATE SALARY SLIPS")
+        print(err)
+        raise
+    finally:
+        conn.close()
+
+
+def generate_current_month_salary_slips():
+    """
+    Scheduled job: runs the batch as `python -m utils.salary_slip` in a fresh process instead of
+    forking a process pool from the uvicorn worker's scheduler thread
+    """
+    today = today_ist()
+    subprocess.run(
+        [sys.executable, "-m", "utils.salary_slip", "--year", str(today.year), "--month", str(today.month)],
+        cwd=SERVER_DIR, check=True
+    )
+
+
+if __name__ == "__main__":
+    # python -m utils.salary_slip [--year 2025 --month 9]
+    today = today_ist()
+    parser = argparse.ArgumentParser(description="Pre-generate monthly salary slips")
+    parser.add_argument("--year", type=int, default=today.year)
+    parser.add_argument("--month", type=int, default=today.month)
+    args = parser.parse_args()
+
+    load_rules()
+    generate_monthly_salary_slips(args.year, args.month)
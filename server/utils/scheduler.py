@@ -0,0 +1,186 @@
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+from utils.db_config import get_db_connection, acquire_lock, release_lock
+from utils.clock import now_ist
+
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "true").lower() == "true"
+MISFIRE_GRACE_SECONDS = int(os.getenv("SCHEDULER_MISFIRE_GRACE_SECONDS", 300))
+
+# created on first use so apscheduler is not imported with the app
+scheduler = None
+
+def get_scheduler():
+    global scheduler
+    if scheduler is None:
+        from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+        scheduler = AsyncIOScheduler(
+            timezone="Asia/Kolkata",
+            job_defaults={
+                # a late or piled up job runs once, not once per missed slot
+                "coalesce": True,
+                "max_instances": 1,
+                "misfire_grace_time": MISFIRE_GRACE_SECONDS
+            }
+        )
+    return scheduler
+
+# job id -> last run info, exposed through /scheduler/jobs
+job_status = {}
+
+def _acquire_job_lock(job_id: str):
+    """
+    Advisory lock so only one uvicorn worker runs the job.
+    Returns the connection holding the lock, or None if another worker has it.
+    """
+    conn = get_db_connection()
+    if acquire_lock(conn, f"job.{job_id}"):
+        return conn
+    conn.close()
+    return None
+
+
+def _release_job_lock(conn, job_id: str):
+    try:
+        release_lock(conn, f"job.{job_id}")
+    finally:
+        conn.close()
+
+
+def _current_slot(trigger):
+    """
+    Latest fire time of a cron trigger up to now, the same on every worker, as naive local
+    time like the DATETIME columns. None for other triggers, their fire times are per worker.
+    """
+    from apscheduler.triggers.cron import CronTrigger
+
+    if not isinstance(trigger, CronTrigger):
+        return None
+
+    now = datetime.now(trigger.timezone)
+    slot = None
+    fire_time = trigger.get_next_fire_time(None, now - timedelta(seconds=MISFIRE_GRACE_SECONDS + 60))
+    while fire_time is not None and fire_time <= now:
+        slot = fire_time
+        fire_time = trigger.get_next_fire_time(fire_time, fire_time + timedelta(seconds=1))
+    return slot.replace(tzinfo=None) if slot else None
+
+
+def _slot_done(conn, job_id: str, slot: datetime) -> bool:
+    cursor = conn.cursor()
+    cursor.execute("SELECT last_slot FROM job_runs WHERE job_id = %s", (job_id,))
+    row = cursor.fetchone()
+    return row is not None and row[0] >= slot
+
+
+def _record_slot(conn, job_id: str, slot: datetime, run_status: str):
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        INSERT INTO job_runs (job_id, last_slot, status, finished_at) VALUES (%s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE last_slot = VALUES(last_slot), status = VALUES(status), finished_at = VALUES(finished_at)
+        """,
+        (job_id, slot, run_status, now_ist())
+    )
+    conn.commit()
+
+
+def _run_job(job_id: str, func, single_instance: bool, slot, args, kwargs):
+    status = job_status.setdefault(job_id, {"runs": 0})
+    lock_conn = None
+
+    if single_instance:
+        lock_conn = _acquire_job_lock(job_id)
+        if lock_conn is None:
+            status.update({"status": "skipped", "last_run_at": datetime.now().isoformat()})
+            return
+
+        # the trigger fires on every worker, one that gets the lock after the run finished skips the slot
+        try:
+            done = slot is not None and _slot_done(lock_conn, job_id, slot)
+        except Exception:
+            _release_job_lock(lock_conn, job_id)
+            raise
+        if done:
+            _release_job_lock(lock_conn, job_id)
+            status.update({"status": "skipped", "last_run_at": datetime.now().isoformat()})
+            return
+
+    started = time.perf_counter()
+    status.update({"status": "running", "last_run_at": datetime.now().isoformat()})
+    try:
+        func(*args, **kwargs)
+        status.update({"status": "success", "error": None})
+    except Exception as err:
+        print(f"[INFO]: JOB {job_id} FAILED")
+        print(err)
+        status.update({"status": "failed", "error": str(err)})
+    finally:
+        status["duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        status["runs"] += 1
+        if lock_conn is not None:
+            try:
+                # failed runs count as done too, a retry waits for the next slot or the job's CLI
+                if slot is not None:
+                    _record_slot(lock_conn, job_id, slot, status["status"])
+            finally:
+                _release_job_lock(lock_conn, job_id)
+
+
+def register_job(job_id: str, func, trigger: str, single_instance: bool = True, args=(), kwargs=None, **trigger_args):
+    """
+    Schedule a blocking func on a worker thread.
+    single_instance jobs are guarded by a DB advisory lock across all workers and,
+    for cron triggers, run once per scheduled slot (job_runs);
+    per-process jobs (cache refreshes) should pass single_instance=False.
+    """
+    async def runner():
+        slot = _current_slot(get_scheduler().get_job(job_id).trigger) if single_instance else None
+        await asyncio.to_thread(_run_job, job_id, func, single_instance, slot, args, kwargs or {})
+
+    job_status.setdefault(job_id, {"runs": 0, "status": "scheduled"})
+    get_scheduler().add_job(runner, trigger, id=job_id, name=job_id, replace_existing=True, **trigger_args)
+
+
+def _on_job_missed(event):
+    job_status.setdefault(event.job_id, {"runs": 0}).update({
+        "status": "missed",
+        "missed_run_time": event.scheduled_run_time.isoformat()
+    })
+
+
+def get_job_status() -> list:
+    jobs = []
+    if scheduler is None:
+        return jobs
+    for job in scheduler.get_jobs():
+        status = dict(job_status.get(job.id, {}))
+        status["id"] = job.id
+        status["next_run_at"] = job.next_run_time.isoformat() if job.next_run_time else None
+        jobs.append(status)
+    return jobs
+
+
+def get_scheduler_state() -> str:
+    if not SCHEDULER_ENABLED:
+        return "disabled"
+    return "running" if scheduler is not None and scheduler.running else "stopped"
+
+
+def start_scheduler():
+    if not SCHEDULER_ENABLED:
+        print("[INFO]:  SCHEDULER DISABLED")
+        return
+    from apscheduler.events import EVENT_JOB_MISSED
+
+    sched = get_scheduler()
+    sched.add_listener(_on_job_missed, EVENT_JOB_MISSED)
+    sched.start()
+    print(f"[INFO]:  SCHEDULER STARTED WITH {len(sched.get_jobs())} JOBS")
+
+
+def shutdown_scheduler():
+    if scheduler is not None and scheduler.running:
+        scheduler.shutdown(wait=False)
@@ -0,0 +1,148 @@
+import os
+import threading
+import time
+from datetime import datetime
+from utils.db_config import connect, HOST, USER, PWD, DATABASE, POOL_MIN_WARM, POOL_SIZE, initialize_db, warm_pool, acquire_lock, release_lock
+from utils.hierarchy import backfill_hierarchy_if_empty
+from utils.funds_ledger import backfill_funds_ledger_if_empty
+from utils.geo_rollup import backfill_geo_rollup_if_empty
+from utils.partitions import ensure_future_partitions
+from utils.rules import load_rules
+from utils.replicas import check_replicas
+
+SCHEMA_LOCK = "schema_init"
+STARTUP_LOCK_TIMEOUT = int(os.getenv("STARTUP_LOCK_TIMEOUT", 60))
+STARTUP_RETRY_MIN_SECONDS = float(os.getenv("STARTUP_RETRY_MIN_SECONDS", 1))
+STARTUP_RETRY_MAX_SECONDS = float(os.getenv("STARTUP_RETRY_MAX_SECONDS", 30))
+# data_version row holding the UNIX_TIMESTAMP of the last successful initialize_schema
+SCHEMA_SCOPE = "schema"
+
+READY_MAX_PING_MS = float(os.getenv("READY_MAX_PING_MS", 250))
+
+# reported by /readyz
+startup_state = {
+    "ready": False,
+    "schema_ready": False,
+    "pool_ready": False,
+    "pool_warmed": 0,
+    "pool_min_warm": POOL_MIN_WARM,
+    "attempts": 0,
+    "started_at": None,
+    "ready_at": None,
+    "startup_ms": None,
+    "error": None
+}
+
+_stop_startup = threading.Event()
+
+def _schema_initialized_since(conn, since: int) -> bool:
+    """Whether a worker finished initialize_schema at or after since (UNIX_TIMESTAMP on the server)"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT version FROM {DATABASE}.data_version WHERE scope = %s", (SCHEMA_SCOPE,))
+        row = cursor.fetchone()
+    except Exception:
+        # the database or the table is not there yet
+        return False
+    return row is not None and row[0] >= since
+
+
+def _mark_schema_initialized(conn):
+    cursor = conn.cursor()
+    cursor.execute(
+        f"""
+        INSERT INTO {DATABASE}.data_version (scope, version) VALUES (%s, UNIX_TIMESTAMP())
+        ON DUPLICATE KEY UPDATE version = VALUES(version)
+        """,
+        (SCHEMA_SCOPE,)
+    )
+    conn.commit()
+
+
+def _initialize_schema_locked(conn):
+    initialize_db()
+    backfill_hierarchy_if_empty()
+    backfill_funds_ledger_if_empty()
+    backfill_geo_rollup_if_empty()
+    ensure_future_partitions()
+    _mark_schema_initialized(conn)
+
+
+def initialize_schema():
+    """
+    Only the worker that wins the advisory lock checks and creates the schema.
+    The others wait for it to release the lock and skip the work if it succeeded,
+    otherwise the next one to get the lock tries again. Failures are raised.
+    """
+    # no database selected, it may not exist yet
+    conn = connect(host=HOST, user=USER, password=PWD)
+
+    try:
+        if acquire_lock(conn, SCHEMA_LOCK):
+            try:
+                _initialize_schema_locked(conn)
+            finally:
+                release_lock(conn, SCHEMA_LOCK)
+            return
+
+        cursor = conn.cursor()
+        cursor.execute("SELECT UNIX_TIMESTAMP()")
+        waiting_since = cursor.fetchone()[0]
+
+        print("[INFO]:  WAITING FOR ANOTHER WORKER TO INITIALIZE THE SCHEMA")
+        if not acquire_lock(conn, SCHEMA_LOCK, STARTUP_LOCK_TIMEOUT):
+            raise RuntimeError("schema lock timed out")
+
+        try:
+            if not _schema_initialized_since(conn, waiting_since):
+                print("[INFO]:  SCHEMA NOT INITIALIZED BY THE OTHER WORKER, RETRYING HERE")
+                _initialize_schema_locked(conn)
+        finally:
+            release_lock(conn, SCHEMA_LOCK)
+    finally:
+        conn.close()
+
+
+def stop_startup():
+    """Ends the retry loop of run_startup at shutdown"""
+    _stop_startup.set()
+
+
+def run_startup():
+    """
+    Runs off the event loop so the worker can answer /readyz while it warms up.
+    Retries with exponential backoff until it succeeds, the last error stays on /readyz meanwhile.
+    """
+    started = time.perf_counter()
+    startup_state["started_at"] = datetime.now().isoformat()
+    delay = STARTUP_RETRY_MIN_SECONDS
+
+    while not _stop_startup.is_set():
+        startup_state["attempts"] += 1
+        try:
+            if not startup_state["schema_ready"]:
+                initialize_schema()
+                startup_state["schema_ready"] = True
+
+            startup_state["pool_warmed"] = warm_pool(POOL_MIN_WARM)
+            startup_state["pool_ready"] = startup_state["pool_warmed"] >= min(POOL_MIN_WARM, POOL_SIZE)
+            if not startup_state["pool_ready"]:
+                raise RuntimeError(f"only {startup_state['pool_warmed']} pool connections answered")
+
+            load_rules()
+            # replicas take reads from the first passing check, not the first scheduled one
+            check_replicas()
+
+            startup_state["error"] = None
+            startup_state["ready"] = True
+            startup_state["ready_at"] = datetime.now().isoformat()
+            startup_state["startup_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            print(f"[INFO]:  WORKER READY IN {startup_state['startup_ms']} ms")
+            return
+
+        except Exception as err:
+            startup_state["error"] = str(err)
+            print(f"[INFO]:  STARTUP FAILED, RETRYING IN {delay}s")
+            print(err)
+            _stop_startup.wait(delay)
+            delay = min(delay * 2, STARTUP_RETRY_MAX_SECONDS)
@@ -0,0 +1,102 @@
+import argparse
+import time
+from collections import OrderedDict
+from utils.db_config import get_db_connection, STATEMENT_CACHE_SIZE
+
+def _statement_cache(conn):
+    """
+    LRU of SQL text -> prepared cursor, kept on the raw connection so it outlives the
+    PooledMySQLConnection wrapper. None for one-off connections, which close after use.
+    """
+    raw = getattr(conn, "_cnx", None)
+    if raw is None or STATEMENT_CACHE_SIZE <= 0:
+        return None
+
+    # a reconnect gets a new session id, the old session's statements are gone with it
+    connection_id = raw.connection_id
+    cached = getattr(raw, "_sbc_statements", None)
+    if cached is None or cached[0] != connection_id:
+        cached = (connection_id, OrderedDict())
+        raw._sbc_statements = cached
+    return cached[1]
+
+
+def execute_cached(conn, query: str, params=(), dictionary: bool = False):
+    """
+    Execute query as a server-side prepared statement cached on conn, so repeat calls
+    with the same SQL text skip parsing on the server. Returns the cursor to fetch from.
+    """
+    cache = _statement_cache(conn)
+    if cache is None:
+        cursor = conn.cursor(dictionary=dictionary)
+        cursor.execute(query, params)
+        return cursor
+
+    key = (query, dictionary)
+    entry = cache.get(key)
+    if entry is None:
+        entry = (query, conn.cursor(prepared=True, dictionary=dictionary))
+        cache[key] = entry
+        while len(cache) > STATEMENT_CACHE_SIZE:
+            _, (_, evicted) = cache.popitem(last=False)
+            try:
+                # deallocates the statement on the server
+                evicted.close()
+            except Exception:
+                pass
+    else:
+        cache.move_to_end(key)
+
+    # the C extension cursor re-prepares unless it is handed the exact string it prepared
+    cached_query, cursor = entry
+    try:
+        cursor.execute(cached_query, params)
+    except Exception:
+        # a failed statement may have left the cursor unusable, prepare it again next time
+        cache.pop(key, None)
+        raise
+    return cursor
+
+
+if __name__ == "__main__":
+    # python -m utils.statements --email someone@example.com --emp-id MGR0001 [--number 2000]
+    from routers.public import EMP_LOGIN_QUERY
+    from routers.common import EMP_DETAILS
+    from routers.manager import MANAGER_MONTHLY_COMMISSIONS
+    from utils.commission_rollup import MONTHLY_ROLLUP_QUERY
+    from utils.clock import month_range
+
+    parser = argparse.ArgumentParser(description="Text protocol vs cached prepared statements on one pooled connection")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--emp-id", required=True, help="a manager with commissions")
+    parser.add_argument("--year", type=int, default=time.localtime().tm_year)
+    parser.add_argument("--month", type=int, default=time.localtime().tm_mon)
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    cases = [
+        ("emp_login", EMP_LOGIN_QUERY, (args.email, "wrong-password", "manager"), False),
+        ("get_emp_details", EMP_DETAILS.sql, (args.emp_id,), False),
+        ("monthly rollup", MONTHLY_ROLLUP_QUERY, (args.emp_id, "manager", args.year, args.month), True),
+        ("monthly commissions", MANAGER_MONTHLY_COMMISSIONS.sql, (args.emp_id, *month_range(args.year, args.month)), False),
+    ]
+
+    conn = get_db_connection()
+    try:
+        plain = conn.cursor(dictionary=True)
+        for name, query, params, dictionary in cases:
+            started = time.perf_counter()
+            for _ in range(args.number):
+                plain.execute(query, params)
+                plain.fetchall()
+            text_us = (time.perf_counter() - started) / args.number * 1e6
+
+            execute_cached(conn, query, params, dictionary).fetchall()
+            started = time.perf_counter()
+            for _ in range(args.number):
+                execute_cached(conn, query, params, dictionary).fetchall()
+            prepared_us = (time.perf_counter() - started) / args.number * 1e6
+
+            print(f"{name:<20} text {text_us:8.1f} us  prepared {prepared_us:8.1f} us  {text_us / prepared_us:5.2f}x")
+    finally:
+        conn.close()
@@ -0,0 +1,103 @@
+import argparse
+import gzip
+import os
+import re
+from pathlib import Path
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from utils.compression import brotli, COMPRESSION_MIN_SIZE
+
+CLIENT_DIR = Path(os.getenv("CLIENT_DIR", Path(__file__).parent.parent.parent / "client"))
+
+# file types worth precompressing; images, woff/woff2 and PDFs are compressed already
+PRECOMPRESS_SUFFIXES = {".html", ".css", ".js", ".json", ".svg", ".txt", ".xml", ".otf", ".ttf", ".eot"}
+
+# a content hash in the file name (logo.3f9a1c2e.png, app-5d41402abc4b2a76.js): the name changes
+# whenever the bytes do, so such files can be cached for good
+FINGERPRINTED_NAME = re.compile(r"[.-][0-9a-f]{8,}\.[^/]+$", re.IGNORECASE)
+
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+# everything else can change in place with a deploy, revalidate with ETag / Last-Modified
+REVALIDATE_CACHE = "public, no-cache"
+
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+def _compressed_variants(path: Path) -> list:
+    variants = []
+    data = path.read_bytes()
+    if len(data) < COMPRESSION_MIN_SIZE:
+        return variants
+
+    variants.append((path.with_name(path.name + ".gz"), gzip.compress(data, compresslevel=9, mtime=0)))
+    if brotli is not None:
+        variants.append((path.with_name(path.name + ".br"), brotli.compress(data, quality=11)))
+    return variants
+
+
+def precompress_assets(directory: Path = CLIENT_DIR, force: bool = False) -> int:
+    """
+    Write .gz (and .br with the Brotli package) next to every compressible asset.
+    A variant is rewritten only when the source is newer, and kept only if it is smaller.
+    """
+    written = 0
+    for path in sorted(directory.rglob("*")):
+        if not path.is_file() or path.suffix.lower() not in PRECOMPRESS_SUFFIXES:
+            continue
+
+        source_mtime = path.stat().st_mtime
+        for variant, data in _compressed_variants(path):
+            if not force and variant.exists() and variant.stat().st_mtime >= source_mtime:
+                continue
+            if len(data) >= path.stat().st_size:
+                variant.unlink(missing_ok=True)
+                continue
+            variant.write_bytes(data)
+            written += 1
+
+    print(f"[INFO]: {written} PRECOMPRESSED ASSETS WRITTEN")
+    return written
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    Serves foo.css.br / foo.css.gz in place of foo.css when the client accepts the encoding
+    and the build step produced the variant, so nothing is compressed per request.
+    """
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        accept_encoding = request_headers.get("accept-encoding", "")
+
+        headers = {
+            "Cache-Control": IMMUTABLE_CACHE if FINGERPRINTED_NAME.search(Path(full_path).name) else REVALIDATE_CACHE,
+            "Vary": "Accept-Encoding"
+        }
+        response = None
+        for encoding, suffix in ENCODINGS:
+            variant = f"{full_path}{suffix}"
+            if encoding in accept_encoding and os.path.isfile(variant):
+                # media type comes from the original name, not the .br/.gz suffix
+                response = FileResponse(
+                    variant, status_code=status_code, stat_result=os.stat(variant),
+                    media_type=FileResponse(full_path).media_type,
+                    headers={**headers, "Content-Encoding": encoding}
+                )
+                break
+
+        if response is None:
+            response = FileResponse(full_path, status_code=status_code, stat_result=stat_result, headers=headers)
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+if __name__ == "__main__":
+    # python -m utils.static_assets [--dir ../client] [--force]
+    parser = argparse.ArgumentParser(description="Precompress client assets to .gz / .br")
+    parser.add_argument("--dir", type=Path, default=CLIENT_DIR)
+    parser.add_argument("--force", action="store_true")
+    args = parser.parse_args()
+
+    precompress_assets(args.dir, args.force)